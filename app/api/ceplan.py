@@ -1,32 +1,80 @@
 """
 Endpoints de CEPLAN para Monitor PPR v2
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.session import get_db
-from app.models.ceplan import CEPLAN, CEPLANCreate, CEPLANUpdate
-from app.database.models import CEPLAN as DBCEPLAN
+from app.models.ceplan import (
+    CEPLAN, CEPLANCreate, CEPLANUpdate, ComparacionCEPLANPPR, PPRCeplanMap,
+    PPRCeplanMapCreate
+)
+from app.database.models import CEPLAN as DBCEPLAN, PPRCeplanMap as DBPPRCeplanMap
+from app.models.bulk import ResultadoBulk
+from app.database.bulk import upsert_rows
+from app.utils.helpers import comparar_datos_ceplan_ppr
+from app.utils.cache import incrementar_version_datos
+from app.utils.http_cache import agregado_validacion, respuesta_condicional
 from app.utils.logger import log_error, log_info
+from app.utils.pagination import paginar
+from app.utils.projection import (
+    CEPLAN_CAMPOS_CALCULADOS, campos_solicitados, columnas_proyeccion, fila_a_dict,
+    respuesta_proyectada
+)
+from app.utils.validators import (
+    validate_year, validate_codigo_ppr, validate_codigo_sub_producto
+)
 from app.utils.auth import get_current_active_user_db  # Importar la dependencia de autenticación
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[CEPLAN])
-def get_ceplans(skip: int = 0, limit: int = 100, ano_ejecucion: int = None, db: Session = Depends(get_db), current_user = Depends(get_current_active_user_db)):
+def get_ceplans(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                after: Optional[str] = None, ano_ejecucion: int = None,
+                fields: Optional[str] = None, db: Session = Depends(get_db),
+                current_user = Depends(get_current_active_user_db)):
     """
     Obtener lista de CEPLAN (requiere autenticación)
+    
+    Las páginas se ordenan por (ano_ejecucion, codigo_sub_producto). Para
+    paginar por cursor se envía en after el valor de la cabecera
+    X-Next-Cursor de la página anterior; skip se mantiene por compatibilidad.
+    
+    Con fields (p. ej. codigo_sub_producto,subproducto,total_ejecutado) solo
+    se consultan y devuelven esas columnas; fields=* devuelve todas por la
+    vía rápida (orjson, MessagePack con Accept: application/msgpack,
+    gzip/brotli). Responde 304 si
+    If-None-Match / If-Modified-Since coinciden con los datos vigentes.
     """
     try:
-        query = db.query(DBCEPLAN)
+        claves = [DBCEPLAN.ano_ejecucion, DBCEPLAN.codigo_sub_producto]
+        campos = campos_solicitados(request, fields, CEPLAN, CEPLAN_CAMPOS_CALCULADOS)
+        filtros = [DBCEPLAN.ano_ejecucion == ano_ejecucion] if ano_ejecucion else []
+        
+        agregado = agregado_validacion(db.query(DBCEPLAN).filter(*filtros), DBCEPLAN)
+        no_modificado = respuesta_condicional(
+            request, response, db, [agregado], request.url.query
+        )
+        if no_modificado:
+            return no_modificado
         
-        if ano_ejecucion:
-            query = query.filter(DBCEPLAN.ano_ejecucion == ano_ejecucion)
+        if campos:
+            query = db.query(*columnas_proyeccion(
+                DBCEPLAN, campos, claves, CEPLAN_CAMPOS_CALCULADOS
+            ))
+        else:
+            query = db.query(DBCEPLAN)
         
-        ceplans = query.offset(skip).limit(limit).all()
+        ceplans = paginar(query.filter(*filtros), claves, response, skip, limit, after)
         log_info(f"Obtenidos {len(ceplans)} CEPLAN")
+        if campos:
+            filas = [fila_a_dict(fila, campos) for fila in ceplans]
+            return respuesta_proyectada(filas, response, request)
         return ceplans
+    except HTTPException:
+        raise
     except Exception as e:
         log_error(e, "get_ceplans")
         raise HTTPException(
@@ -35,18 +83,153 @@ def get_ceplans(skip: int = 0, limit: int = 100, ano_ejecucion: int = None, db:
         )
 
 
+@router.get("/comparacion", response_model=ComparacionCEPLANPPR)
+def get_comparacion_ceplan_ppr(ano_ejecucion: int, db: Session = Depends(get_db),
+                               current_user = Depends(get_current_active_user_db)):
+    """
+    Comparar lo programado y ejecutado de los PPR contra CEPLAN (requiere autenticación)
+    
+    Solo se incluyen los PPR asociados a subproductos en la tabla de mapeo.
+    """
+    try:
+        if not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+        
+        resultado = comparar_datos_ceplan_ppr(ano_ejecucion, db)
+        if not resultado["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error interno del servidor"
+            )
+        return resultado
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"get_comparacion_ceplan_ppr - Año: {ano_ejecucion}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/mapeo", response_model=List[PPRCeplanMap])
+def get_mapeo_ppr(ppr_codigo: str = None, codigo_sub_producto: str = None,
+                  db: Session = Depends(get_db),
+                  current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener las asociaciones entre códigos PPR y subproductos CEPLAN
+    (requiere autenticación)
+    """
+    try:
+        query = db.query(DBPPRCeplanMap)
+        
+        if ppr_codigo:
+            query = query.filter(DBPPRCeplanMap.ppr_codigo == ppr_codigo)
+        if codigo_sub_producto:
+            query = query.filter(
+                DBPPRCeplanMap.codigo_sub_producto == codigo_sub_producto
+            )
+        
+        return query.order_by(DBPPRCeplanMap.id).all()
+    except Exception as e:
+        log_error(e, "get_mapeo_ppr")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.post("/mapeo")
+def create_mapeo_ppr(mapeos: List[PPRCeplanMapCreate], db: Session = Depends(get_db),
+                     current_user = Depends(get_current_active_user_db)):
+    """
+    Asociar códigos PPR con subproductos CEPLAN (requiere autenticación)
+    
+    Las asociaciones ya existentes se mantienen sin duplicarse.
+    """
+    try:
+        invalidos = [
+            mapeo.dict() for mapeo in mapeos
+            if not validate_codigo_ppr(mapeo.ppr_codigo)
+            or not validate_codigo_sub_producto(mapeo.codigo_sub_producto)
+        ]
+        if invalidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Códigos con formato no válido: {invalidos}"
+            )
+        
+        unicos = {(m.ppr_codigo, m.codigo_sub_producto): m.dict() for m in mapeos}
+        filas = list(unicos.values())
+        upsert_rows(
+            db,
+            DBPPRCeplanMap.__table__,
+            filas,
+            key_columns=['ppr_codigo', 'codigo_sub_producto'],
+            update_columns=['ppr_codigo']
+        )
+        db.commit()
+        incrementar_version_datos()
+        
+        log_info(f"Mapeo PPR-CEPLAN actualizado: {len(filas)} asociaciones")
+        return {"message": "Asociaciones registradas exitosamente", "total": len(filas)}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, "create_mapeo_ppr")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 @router.get("/{ceplan_id}", response_model=CEPLAN)
-def get_ceplan(ceplan_id: int, db: Session = Depends(get_db)):
+def get_ceplan(ceplan_id: int, request: Request, response: Response,
+               fields: Optional[str] = None, db: Session = Depends(get_db)):
     """
     Obtener CEPLAN por ID
+    
+    Con fields solo se consultan y devuelven esas columnas. Responde 304 si
+    el cliente ya tiene la versión vigente.
     """
     try:
-        ceplan = db.query(DBCEPLAN).filter(DBCEPLAN.id == ceplan_id).first()
+        campos = campos_solicitados(request, fields, CEPLAN, CEPLAN_CAMPOS_CALCULADOS)
+        
+        # Un id inexistente responde 404 aunque el cliente envíe If-None-Match
+        if not db.query(exists().where(DBCEPLAN.id == ceplan_id)).scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="CEPLAN no encontrado"
+            )
+        
+        query = db.query(DBCEPLAN).filter(DBCEPLAN.id == ceplan_id)
+        no_modificado = respuesta_condicional(
+            request, response, db, [agregado_validacion(query, DBCEPLAN)],
+            request.url.query
+        )
+        if no_modificado:
+            return no_modificado
+        
+        if campos:
+            query = db.query(*columnas_proyeccion(
+                DBCEPLAN, campos, calculados=CEPLAN_CAMPOS_CALCULADOS
+            ))
+        else:
+            query = db.query(DBCEPLAN)
+        
+        ceplan = query.filter(DBCEPLAN.id == ceplan_id).first()
         if not ceplan:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="CEPLAN no encontrado"
             )
+        if campos:
+            return respuesta_proyectada(fila_a_dict(ceplan, campos), response, request)
         return ceplan
     except HTTPException:
         raise
@@ -109,6 +292,7 @@ def create_ceplan(ceplan: CEPLANCreate, db: Session = Depends(get_db)):
         
         db.add(db_ceplan)
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_ceplan)
         
         log_info(f"CEPLAN creado: {db_ceplan.codigo_sub_producto}")
@@ -125,6 +309,91 @@ def create_ceplan(ceplan: CEPLANCreate, db: Session = Depends(get_db)):
         )
 
 
+@router.post("/bulk", response_model=ResultadoBulk)
+def create_ceplans_bulk(ceplans: List[CEPLANCreate], db: Session = Depends(get_db),
+                        current_user = Depends(get_current_active_user_db)):
+    """
+    Crear o actualizar varios CEPLAN en una sola transacción (requiere autenticación)
+    
+    Los registros existentes (mismo código de subproducto y año) se
+    actualizan. La existencia se verifica con una sola consulta y la
+    escritura usa upsert multi-fila. Los elementos no válidos o repetidos en
+    la petición se informan en el resultado y no se escriben.
+    """
+    try:
+        claves = {(c.codigo_sub_producto, c.ano_ejecucion) for c in ceplans}
+        existentes = set()
+        if claves:
+            consulta = db.query(
+                DBCEPLAN.codigo_sub_producto, DBCEPLAN.ano_ejecucion
+            ).filter(
+                DBCEPLAN.codigo_sub_producto.in_({codigo for codigo, _ in claves}),
+                DBCEPLAN.ano_ejecucion.in_({ano for _, ano in claves})
+            )
+            existentes = {(codigo, ano) for codigo, ano in consulta}
+        
+        resultados = []
+        filas = []
+        vistos = set()
+        for indice, ceplan in enumerate(ceplans):
+            clave = (ceplan.codigo_sub_producto, ceplan.ano_ejecucion)
+            if not validate_codigo_sub_producto(ceplan.codigo_sub_producto):
+                error = f"Código de subproducto no válido: {ceplan.codigo_sub_producto}"
+            elif not validate_year(ceplan.ano_ejecucion):
+                error = "Año de ejecución no válido"
+            elif clave in vistos:
+                error = (
+                    "Código de subproducto repetido para el mismo año en la petición"
+                )
+            else:
+                error = None
+                vistos.add(clave)
+                # Sin huella: la próxima importación vuelve a escribir la fila
+                filas.append({**ceplan.dict(), 'content_hash': None})
+            resultados.append({
+                "indice": indice,
+                "success": error is None,
+                "accion": (
+                    None if error
+                    else "actualizado" if clave in existentes
+                    else "creado"
+                ),
+                "error": error
+            })
+        
+        if filas:
+            upsert_rows(
+                db,
+                DBCEPLAN.__table__,
+                filas,
+                key_columns=['codigo_sub_producto', 'ano_ejecucion'],
+                update_columns=[
+                    col for col in CEPLANCreate.model_fields
+                    if col not in ('codigo_sub_producto', 'ano_ejecucion')
+                ] + ['content_hash']
+            )
+            db.commit()
+            incrementar_version_datos()
+        
+        log_info(f"CEPLAN escritos en lote: {len(filas)} de {len(ceplans)}")
+        return {
+            "total": len(ceplans),
+            "procesados": len(filas),
+            "errores": len(ceplans) - len(filas),
+            "resultados": resultados
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, "create_ceplans_bulk")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 @router.put("/{ceplan_id}", response_model=CEPLAN)
 def update_ceplan(ceplan_id: int, ceplan: CEPLANUpdate, db: Session = Depends(get_db)):
     """
@@ -142,8 +411,11 @@ def update_ceplan(ceplan_id: int, ceplan: CEPLANUpdate, db: Session = Depends(ge
         update_data = ceplan.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_ceplan, field, value)
+        # Sin huella: la próxima importación vuelve a escribir la fila
+        db_ceplan.content_hash = None
         
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_ceplan)
         
         log_info(f"CEPLAN actualizado: {db_ceplan.codigo_sub_producto}")
@@ -175,6 +447,7 @@ def delete_ceplan(ceplan_id: int, db: Session = Depends(get_db)):
         
         db.delete(db_ceplan)
         db.commit()
+        incrementar_version_datos()
         
         log_info(f"CEPLAN eliminado: {db_ceplan.codigo_sub_producto}")
         return {"message": "CEPLAN eliminado exitosamente"}
@@ -0,0 +1,136 @@
+"""
+Endpoints del dashboard para Monitor PPR v2
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from typing import Any, Dict
+from app.database.session import get_db
+from app.models.dashboard import DashboardSummary
+from app.database.models import (
+    PPR as DBPPR, CEPLAN as DBCEPLAN, PPRProgressSummary as DBPPRProgressSummary
+)
+from app.utils.cache import CacheVersionada, obtener_version_datos
+from app.utils.helpers import MESES, calcular_porcentaje
+from app.utils.logger import log_error, log_info
+from app.utils.snapshots import obtener_snapshot_ceplan
+# Importar la dependencia de autenticación
+from app.utils.auth import get_current_active_user_db
+
+router = APIRouter()
+
+# Resúmenes por año y mes en curso; se invalidan cuando cambia la versión de datos
+_cache_resumen = CacheVersionada("dashboard_summary")
+
+
+def _calcular_resumen(db: Session, ano_ejecucion: int = None,
+                      hoy: datetime = None) -> Dict[str, Any]:
+    """
+    Calcula los indicadores del dashboard con consultas agregadas
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución; None para todos los años
+        hoy: Fecha que define el mes en curso; por defecto la actual
+
+    Returns:
+        Dict con los indicadores del dashboard
+    """
+    version = obtener_version_datos()
+
+    # PPR por estado
+    query_estados = db.query(DBPPR.estado, func.count(DBPPR.id))
+    if ano_ejecucion:
+        query_estados = query_estados.filter(DBPPR.ano_ejecucion == ano_ejecucion)
+    pprs_por_estado = {
+        estado or "sin_estado": total
+        for estado, total in query_estados.group_by(DBPPR.estado).all()
+    }
+
+    # Avance global y PPR atrasados al mes en curso (diciembre para años anteriores)
+    hoy = hoy or datetime.utcnow()
+    resumen = DBPPRProgressSummary
+    mes_limite = case((resumen.ano_ejecucion < hoy.year, 12), else_=hoy.month)
+    en_limite = resumen.mes_numero == mes_limite
+    query_avance = db.query(
+        resumen.ppr_id,
+        func.sum(resumen.programado).label("programado"),
+        func.sum(resumen.ejecutado).label("ejecutado"),
+        func.sum(
+            case((en_limite, resumen.programado_acumulado), else_=0.0)
+        ).label("programado_acumulado"),
+        func.sum(
+            case((en_limite, resumen.ejecutado_acumulado), else_=0.0)
+        ).label("ejecutado_acumulado")
+    )
+    if ano_ejecucion:
+        query_avance = query_avance.filter(resumen.ano_ejecucion == ano_ejecucion)
+    avance = query_avance.group_by(resumen.ppr_id, resumen.ano_ejecucion).subquery()
+
+    programado, ejecutado, atrasados = db.query(
+        func.coalesce(func.sum(avance.c.programado), 0.0),
+        func.coalesce(func.sum(avance.c.ejecutado), 0.0),
+        func.coalesce(func.sum(case(
+            (avance.c.ejecutado_acumulado < avance.c.programado_acumulado, 1), else_=0
+        )), 0)
+    ).one()
+
+    # Totales CEPLAN: desde la instantánea del año o agregando todos los años en SQL
+    if ano_ejecucion:
+        ceplan = obtener_snapshot_ceplan(db, ano_ejecucion)
+        total_ceplan = len(ceplan)
+        ceplan_programado, ceplan_ejecutado = ceplan.valores.sum(axis=(0, 1))
+    else:
+        ceplan_prog = sum(getattr(DBCEPLAN, f'{mes}_prog') for mes in MESES)
+        ceplan_eje = sum(getattr(DBCEPLAN, f'{mes}_eje') for mes in MESES)
+        total_ceplan, ceplan_programado, ceplan_ejecutado = db.query(
+            func.count(DBCEPLAN.id),
+            func.coalesce(func.sum(ceplan_prog), 0.0),
+            func.coalesce(func.sum(ceplan_eje), 0.0)
+        ).one()
+
+    return {
+        "ano_ejecucion": ano_ejecucion,
+        "total_pprs": sum(pprs_por_estado.values()),
+        "pprs_por_estado": pprs_por_estado,
+        "programado": float(programado),
+        "ejecutado": float(ejecutado),
+        "porcentaje_ejecucion": calcular_porcentaje(
+            float(ejecutado), float(programado)
+        ),
+        "pprs_atrasados": int(atrasados),
+        "total_ceplan": total_ceplan,
+        "ceplan_programado": float(ceplan_programado),
+        "ceplan_ejecutado": float(ceplan_ejecutado),
+        "ceplan_porcentaje_ejecucion": calcular_porcentaje(
+            float(ceplan_ejecutado), float(ceplan_programado)
+        ),
+        "version_datos": version
+    }
+
+
+@router.get("/summary", response_model=DashboardSummary)
+def get_dashboard_summary(ano_ejecucion: int = None, db: Session = Depends(get_db),
+                          current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener los indicadores principales del dashboard (requiere autenticación)
+
+    El resultado se guarda en memoria por año y mes en curso, y se recalcula
+    cuando una escritura o importación cambia la versión de datos o cuando
+    cambia el mes que define los PPR atrasados.
+    """
+    try:
+        hoy = datetime.utcnow()
+        resumen = _cache_resumen.obtener(
+            (ano_ejecucion, hoy.year, hoy.month),
+            lambda: _calcular_resumen(db, ano_ejecucion, hoy)
+        )
+        log_info(f"Resumen del dashboard obtenido para el año {ano_ejecucion}")
+        return resumen
+    except Exception as e:
+        log_error(e, f"get_dashboard_summary - Año: {ano_ejecucion}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
@@ -0,0 +1,114 @@
+"""
+Endpoints de importación de archivos para Monitor PPR v2
+"""
+import os
+import shutil
+import uuid
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+from app.database.session import get_db
+from app.models.import_job import ImportJob
+from app.database.models import ImportJob as DBImportJob
+from app.utils.jobs import enviar_importacion
+from app.utils.logger import log_error, log_info
+from app.utils.validators import validate_year
+# Importar la dependencia de autenticación
+from app.utils.auth import get_current_active_user_db
+
+router = APIRouter()
+
+# Directorio donde se guardan los archivos subidos (fuera de app/static)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+
+TIPOS_IMPORTACION = ("ceplan", "ppr")
+
+
+@router.post("/{tipo}", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+def create_import_job(tipo: str, ano_ejecucion: int = Form(...),
+                      file: UploadFile = File(...), db: Session = Depends(get_db),
+                      current_user = Depends(get_current_active_user_db)):
+    """
+    Subir un archivo y encolar su importación (requiere autenticación)
+
+    El archivo se guarda en disco y la importación corre en un proceso
+    aparte; el avance se consulta con GET /imports/{job_id}. El archivo se
+    elimina cuando el trabajo termina (completado o error).
+    """
+    try:
+        if tipo not in TIPOS_IMPORTACION:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tipo de importación no válido"
+            )
+
+        if not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+
+        # Guardar el archivo en disco por bloques
+        directorio = os.path.join(UPLOAD_DIR, tipo)
+        os.makedirs(directorio, exist_ok=True)
+        nombre_original = os.path.basename(file.filename or "archivo")
+        file_path = os.path.join(directorio, f"{uuid.uuid4().hex}_{nombre_original}")
+        with open(file_path, "wb") as destino:
+            shutil.copyfileobj(file.file, destino)
+
+        db_job = DBImportJob(
+            tipo=tipo,
+            estado="pendiente",
+            file_name=nombre_original,
+            file_path=file_path,
+            ano_ejecucion=ano_ejecucion,
+            user_id=current_user.id
+        )
+
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+
+        enviar_importacion(db_job.id)
+
+        log_info(
+            f"Importación {tipo} encolada: job {db_job.id}, archivo {nombre_original}"
+        )
+        return db_job
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, f"create_import_job - Tipo: {tipo}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/{job_id}", response_model=ImportJob)
+def get_import_job(job_id: int, db: Session = Depends(get_db),
+                   current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener el estado y avance de un trabajo de importación
+
+    Mientras el trabajo corre, processed, ignored y row_errors (los primeros
+    errores por fila: fila, campo, valor y motivo) se actualizan después de
+    cada bloque confirmado.
+    """
+    try:
+        job = db.query(DBImportJob).filter(DBImportJob.id == job_id).first()
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Trabajo de importación no encontrado"
+            )
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"get_import_job - ID: {job_id}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
@@ -1,32 +1,175 @@
 """
 Endpoints de PPR para Monitor PPR v2
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, bindparam, case, exists, func, literal, or_
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, Dict, List, Optional
 from app.database.session import get_db
-from app.models.ppr import PPR, PPRCreate, PPRUpdate, PPRMeta, PPRMetaCreate, PPRAvance, PPRAvanceCreate, PPRAvanceUpdate
-from app.database.models import PPR as DBPPR, PPRMeta as DBPPRMeta, PPRAvance as DBPPRAvance
+from app.models.ppr import (
+    PPR, PPRCreate, PPRUpdate, PPRMeta, PPRMetaCreate, PPRMetaBulkItem, PPRAvance,
+    PPRAvanceCreate, PPRAvanceBulkItem, PPRAvanceUpdate, PPRProgressSummary,
+    PPRProgress, PPRProgressRebuild, PPRAnomaliasResultado, PPRResponsable
+)
+from app.models.bulk import ResultadoBulk
+from app.database.models import (
+    PPR as DBPPR, PPRMeta as DBPPRMeta, PPRAvance as DBPPRAvance,
+    PPRProgressSummary as DBPPRProgressSummary, User as DBUser, ppr_responsables
+)
+from app.database.bulk import insert_rows
+from app.utils.anomalies import UMBRAL_DESVIACION, FACTOR_SALTO, obtener_anomalias
+from app.utils.helpers import actualizar_resumen_progreso, reconstruir_resumen_progreso
+from app.utils.cache import incrementar_version_datos
+from app.utils.exports import (
+    EXPORT_XLSX_MAX_FILAS, contar_filas_reporte_ppr, generar_csv_reporte_ppr,
+    generar_xlsx_reporte_ppr
+)
+from app.utils.http_cache import agregado_validacion, respuesta_condicional
 from app.utils.logger import log_error, log_info
+from app.utils.pagination import paginar
+from app.utils.projection import (
+    campos_solicitados, columnas_proyeccion, fila_a_dict, parsear_incluidos,
+    respuesta_proyectada
+)
+from app.utils.validators import validate_month, validate_positive_number, validate_year
 from app.utils.auth import get_current_active_user_db  # Importar la dependencia de autenticación
 
 router = APIRouter()
 
+# Formato de exportación -> (generador, tipo de contenido)
+FORMATOS_EXPORTACION = {
+    "csv": (generar_csv_reporte_ppr, "text/csv; charset=utf-8"),
+    "xlsx": (
+        generar_xlsx_reporte_ppr,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+}
+
+# Relaciones disponibles en include -> (relación, modelo de respuesta)
+INCLUDES_PPR = {
+    "metas": (DBPPR.metas, PPRMeta),
+    "avances": (DBPPR.avances, PPRAvance),
+    "responsables": (DBPPR.responsables_ppr, PPRResponsable)
+}
+
+
+def _ppr_con_incluidos(ppr: DBPPR, incluidos: List[str],
+                       campos: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Serializa un PPR junto con las relaciones solicitadas
+    
+    Args:
+        ppr: PPR con las relaciones ya cargadas
+        incluidos: Relaciones a agregar
+        campos: Campos del PPR a devolver (todos si es None)
+    
+    Returns:
+        Dict serializable del PPR y sus relaciones
+    """
+    datos = PPR.model_validate(ppr).model_dump(mode='json')
+    if campos:
+        datos = {campo: datos[campo] for campo in campos}
+    for nombre in incluidos:
+        relacion, modelo = INCLUDES_PPR[nombre]
+        datos[nombre] = [
+            modelo.model_validate(hijo).model_dump(mode='json')
+            for hijo in getattr(ppr, relacion.key)
+        ]
+    return datos
+
+
+def _agregados_ppr(db: Session, filtros: List[Any], incluidos: List[str]) -> List[Any]:
+    """
+    Agregados de validación (ETag) de una lectura de PPR y sus relaciones incluidas
+    
+    Las relaciones se consideran aparte porque agregar un avance o una meta
+    no modifica el updated_at del PPR.
+    
+    Args:
+        db: Sesión de base de datos
+        filtros: Filtros de la lectura sobre DBPPR
+        incluidos: Relaciones solicitadas con include
+    
+    Returns:
+        Lista de consultas de agregado_validacion
+    """
+    agregados = [agregado_validacion(db.query(DBPPR).filter(*filtros), DBPPR)]
+    ids = db.query(DBPPR.id).filter(*filtros)
+    if "metas" in incluidos:
+        agregados.append(agregado_validacion(
+            db.query(DBPPRMeta).filter(DBPPRMeta.ppr_id.in_(ids)), DBPPRMeta
+        ))
+    if "avances" in incluidos:
+        agregados.append(agregado_validacion(
+            db.query(DBPPRAvance).filter(DBPPRAvance.ppr_id.in_(ids)), DBPPRAvance
+        ))
+    if "responsables" in incluidos:
+        agregados.append(agregado_validacion(
+            db.query(DBUser)
+            .join(ppr_responsables, ppr_responsables.c.user_id == DBUser.id)
+            .filter(ppr_responsables.c.ppr_id.in_(ids)),
+            DBUser
+        ))
+    return agregados
+
 
 @router.get("/", response_model=List[PPR])
-def get_pprs(skip: int = 0, limit: int = 100, ano_ejecucion: int = None, db: Session = Depends(get_db), current_user = Depends(get_current_active_user_db)):
+def get_pprs(request: Request, response: Response, skip: int = 0, limit: int = 100,
+             after: Optional[str] = None, ano_ejecucion: int = None,
+             fields: Optional[str] = None, include: Optional[str] = None,
+             db: Session = Depends(get_db),
+             current_user = Depends(get_current_active_user_db)):
     """
     Obtener lista de PPRs (requiere autenticación)
+    
+    Las páginas se ordenan por id. Para paginar por cursor se envía en
+    after el valor de la cabecera X-Next-Cursor de la página anterior;
+    skip se mantiene por compatibilidad.
+    
+    Con fields (p. ej. codigo,nombre,estado) solo se consultan y devuelven
+    esas columnas; fields=* devuelve todas por la vía rápida (orjson,
+    MessagePack con Accept: application/msgpack, gzip/brotli). Con include
+    (metas, avances, responsables) cada relación se carga con una consulta
+    adicional para toda la página (selectinload).
+    
+    Responde 304 si If-None-Match / If-Modified-Since coinciden con los datos
+    vigentes.
     """
     try:
-        query = db.query(DBPPR)
+        claves = [DBPPR.id]
+        campos = campos_solicitados(request, fields, PPR)
+        incluidos = parsear_incluidos(include, INCLUDES_PPR)
+        filtros = [DBPPR.ano_ejecucion == ano_ejecucion] if ano_ejecucion else []
         
-        if ano_ejecucion:
-            query = query.filter(DBPPR.ano_ejecucion == ano_ejecucion)
+        no_modificado = respuesta_condicional(
+            request, response, db, _agregados_ppr(db, filtros, incluidos),
+            request.url.query
+        )
+        if no_modificado:
+            return no_modificado
+        
+        if incluidos:
+            query = db.query(DBPPR).options(
+                *[selectinload(INCLUDES_PPR[nombre][0]) for nombre in incluidos]
+            )
+        elif campos:
+            query = db.query(*columnas_proyeccion(DBPPR, campos, claves))
+        else:
+            query = db.query(DBPPR)
         
-        pprs = query.offset(skip).limit(limit).all()
+        pprs = paginar(query.filter(*filtros), claves, response, skip, limit, after)
         log_info(f"Obtenidos {len(pprs)} PPRs")
+        if incluidos:
+            filas = [_ppr_con_incluidos(ppr, incluidos, campos) for ppr in pprs]
+            return respuesta_proyectada(filas, response, request)
+        if campos:
+            filas = [fila_a_dict(fila, campos) for fila in pprs]
+            return respuesta_proyectada(filas, response, request)
         return pprs
+    except HTTPException:
+        raise
     except Exception as e:
         log_error(e, "get_pprs")
         raise HTTPException(
@@ -35,18 +178,299 @@ def get_pprs(skip: int = 0, limit: int = 100, ano_ejecucion: int = None, db: Ses
         )
 
 
+def _porcentaje_sql(ejecutado, programado, sin_programado):
+    """
+    Expresión SQL del porcentaje de avance redondeado a dos decimales
+    
+    Args:
+        ejecutado: Expresión con el valor ejecutado
+        programado: Expresión con el valor programado
+        sin_programado: Expresión devuelta cuando no hay nada programado
+    
+    Returns:
+        Expresión CASE equivalente a calcular_porcentaje: solo un programado
+        igual a 0 usa sin_programado; los negativos se dividen igual que en Python
+    """
+    return case(
+        (programado == 0, sin_programado),
+        else_=func.round(ejecutado * 100.0 / programado, 2)
+    )
+
+
+@router.get("/progress", response_model=List[PPRProgress])
+def get_pprs_progress(skip: int = 0, limit: int = 100, ano_ejecucion: int = None,
+                      estado: str = None, responsable_id: int = None,
+                      hasta_mes: int = None, db: Session = Depends(get_db),
+                      current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener el avance anual y acumulado de los PPR (requiere autenticación)
+    
+    Las sumas y porcentajes se calculan en la base de datos con un GROUP BY
+    sobre ppr_progress_summary, devolviendo una fila por PPR y año. Los
+    acumulados llegan hasta ``hasta_mes``; si no se indica, se usa el mes en
+    curso para el año actual y diciembre para los años anteriores.
+    """
+    try:
+        if hasta_mes is not None and not 1 <= hasta_mes <= 12:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mes no válido"
+            )
+        
+        resumen = DBPPRProgressSummary
+        if hasta_mes is not None:
+            limite = literal(hasta_mes)
+        else:
+            hoy = datetime.utcnow()
+            limite = case((resumen.ano_ejecucion < hoy.year, 12), else_=hoy.month)
+        
+        programado = func.sum(resumen.programado)
+        ejecutado = func.sum(resumen.ejecutado)
+        en_limite = resumen.mes_numero == limite
+        programado_acumulado = func.sum(
+            case((en_limite, resumen.programado_acumulado), else_=0.0)
+        )
+        ejecutado_acumulado = func.sum(
+            case((en_limite, resumen.ejecutado_acumulado), else_=0.0)
+        )
+        
+        query = db.query(
+            resumen.ppr_id,
+            DBPPR.codigo,
+            DBPPR.nombre,
+            DBPPR.estado,
+            resumen.ano_ejecucion,
+            programado.label("programado"),
+            ejecutado.label("ejecutado"),
+            _porcentaje_sql(ejecutado, programado, 0.0).label("porcentaje"),
+            func.max(limite).label("hasta_mes"),
+            programado_acumulado.label("programado_acumulado"),
+            ejecutado_acumulado.label("ejecutado_acumulado"),
+            _porcentaje_sql(
+                ejecutado_acumulado, programado_acumulado,
+                case((ejecutado_acumulado == 0, 0.0), else_=100.0)
+            ).label("porcentaje_acumulado")
+        ).join(DBPPR, DBPPR.id == resumen.ppr_id)
+        
+        if ano_ejecucion:
+            query = query.filter(resumen.ano_ejecucion == ano_ejecucion)
+        if estado:
+            query = query.filter(DBPPR.estado == estado)
+        if responsable_id:
+            query = query.filter(or_(
+                DBPPR.responsable_planificacion_id == responsable_id,
+                exists().where(and_(
+                    ppr_responsables.c.ppr_id == DBPPR.id,
+                    ppr_responsables.c.user_id == responsable_id
+                ))
+            ))
+        
+        filas = query.group_by(
+            resumen.ppr_id, resumen.ano_ejecucion, DBPPR.codigo, DBPPR.nombre,
+            DBPPR.estado
+        ).order_by(
+            resumen.ppr_id, resumen.ano_ejecucion
+        ).offset(skip).limit(limit).all()
+        
+        log_info(f"Obtenido avance de {len(filas)} PPRs")
+        return [fila._asdict() for fila in filas]
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, "get_pprs_progress")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.post("/progress/rebuild", response_model=PPRProgressRebuild)
+def rebuild_pprs_progress(ano_ejecucion: Optional[int] = None,
+                          db: Session = Depends(get_db),
+                          current_user = Depends(get_current_active_user_db)):
+    """
+    Reconstruir el resumen de avance desde metas y avances (requiere autenticación)
+    
+    Recalcula ppr_progress_summary del año indicado (o de todos) a partir
+    de ppr_metas y ppr_avances. Necesario si esas tablas se modificaron
+    fuera de la API; en una base sin resumen se puebla al iniciar.
+    """
+    try:
+        if ano_ejecucion is not None and not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+        
+        resultado = reconstruir_resumen_progreso(db, ano_ejecucion)
+        db.commit()
+        incrementar_version_datos()
+        
+        log_info(
+            f"Resumen de avance reconstruido: {resultado['pprs']} PPR "
+            f"- Año: {ano_ejecucion}"
+        )
+        return resultado
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, f"rebuild_pprs_progress - Año: {ano_ejecucion}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/anomalias", response_model=PPRAnomaliasResultado)
+def get_pprs_anomalias(ano_ejecucion: int, umbral_desviacion: float = UMBRAL_DESVIACION,
+                       factor_salto: float = FACTOR_SALTO,
+                       db: Session = Depends(get_db),
+                       current_user = Depends(get_current_active_user_db)):
+    """
+    Detectar desviaciones y anomalías en los avances de un año (requiere autenticación)
+    
+    El análisis recorre la matriz PPR x mes completa con operaciones
+    vectorizadas y se reutiliza hasta la siguiente escritura.
+    """
+    try:
+        if not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+        
+        if umbral_desviacion <= 0 or factor_salto <= 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parámetros de análisis no válidos"
+            )
+        
+        resultado = obtener_anomalias(
+            db, ano_ejecucion, umbral_desviacion, factor_salto
+        )
+        log_info(
+            f"Análisis de anomalías {ano_ejecucion}: "
+            f"{len(resultado['anomalias'])} anomalías"
+        )
+        return resultado
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"get_pprs_anomalias - Año: {ano_ejecucion}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/export")
+def export_pprs_progress(formato: str = "csv", ano_ejecucion: Optional[int] = None,
+                         estado: Optional[str] = None, db: Session = Depends(get_db),
+                         current_user = Depends(get_current_active_user_db)):
+    """
+    Exportar el progreso de los PPR a CSV o Excel (requiere autenticación)
+    
+    Las filas se leen por lotes con un cursor del lado del servidor, sin
+    cargar el reporte en memoria. El CSV se envía a medida que se escribe;
+    el Excel recién al terminar de guardarse, por lo que se rechaza con 400
+    si supera EXPORT_XLSX_MAX_FILAS filas.
+    """
+    try:
+        if formato not in FORMATOS_EXPORTACION:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    "Formato no válido. Debe ser uno de: "
+                    f"{', '.join(FORMATOS_EXPORTACION)}"
+                )
+            )
+        
+        if ano_ejecucion is not None and not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+        
+        if formato == "xlsx":
+            filas = contar_filas_reporte_ppr(db, ano_ejecucion, estado)
+            if filas > EXPORT_XLSX_MAX_FILAS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"El reporte tiene {filas} filas y el formato xlsx admite "
+                        f"hasta {EXPORT_XLSX_MAX_FILAS}; use formato=csv"
+                    )
+                )
+        
+        generar, media_type = FORMATOS_EXPORTACION[formato]
+        nombre = f"progreso_ppr_{ano_ejecucion or 'todos'}.{formato}"
+        log_info(f"Exportación de progreso PPR ({formato}) - Año: {ano_ejecucion}")
+        return StreamingResponse(
+            generar(ano_ejecucion, estado),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{nombre}"'}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"export_pprs_progress - Formato: {formato}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 @router.get("/{ppr_id}", response_model=PPR)
-def get_ppr(ppr_id: int, db: Session = Depends(get_db)):
+def get_ppr(ppr_id: int, request: Request, response: Response,
+            fields: Optional[str] = None, include: Optional[str] = None,
+            db: Session = Depends(get_db)):
     """
     Obtener PPR por ID
+    
+    Con fields solo se consultan y devuelven esas columnas. Con include
+    (metas, avances, responsables) se agregan esas relaciones en la misma
+    respuesta. Responde 304 si el cliente ya tiene la versión vigente.
     """
     try:
-        ppr = db.query(DBPPR).filter(DBPPR.id == ppr_id).first()
+        campos = campos_solicitados(request, fields, PPR)
+        incluidos = parsear_incluidos(include, INCLUDES_PPR)
+        
+        # Un id inexistente responde 404 aunque el cliente envíe If-None-Match
+        if not db.query(exists().where(DBPPR.id == ppr_id)).scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="PPR no encontrado"
+            )
+        
+        no_modificado = respuesta_condicional(
+            request, response, db, _agregados_ppr(db, [DBPPR.id == ppr_id], incluidos),
+            request.url.query
+        )
+        if no_modificado:
+            return no_modificado
+        
+        if incluidos:
+            query = db.query(DBPPR).options(
+                *[selectinload(INCLUDES_PPR[nombre][0]) for nombre in incluidos]
+            )
+        elif campos:
+            query = db.query(*columnas_proyeccion(DBPPR, campos))
+        else:
+            query = db.query(DBPPR)
+        
+        ppr = query.filter(DBPPR.id == ppr_id).first()
         if not ppr:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="PPR no encontrado"
             )
+        if incluidos:
+            return respuesta_proyectada(
+                _ppr_con_incluidos(ppr, incluidos, campos), response, request
+            )
+        if campos:
+            return respuesta_proyectada(fila_a_dict(ppr, campos), response, request)
         return ppr
     except HTTPException:
         raise
@@ -116,6 +540,7 @@ def create_ppr(ppr: PPRCreate, db: Session = Depends(get_db)):
                 )
         
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_ppr)
         
         log_info(f"PPR creado: {db_ppr.codigo}")
@@ -149,8 +574,11 @@ def update_ppr(ppr_id: int, ppr: PPRUpdate, db: Session = Depends(get_db)):
         update_data = ppr.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_ppr, field, value)
+        # Sin huella: la próxima importación vuelve a escribir la fila
+        db_ppr.content_hash = None
         
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_ppr)
         
         log_info(f"PPR actualizado: {db_ppr.codigo}")
@@ -182,6 +610,7 @@ def delete_ppr(ppr_id: int, db: Session = Depends(get_db)):
         
         db.delete(db_ppr)
         db.commit()
+        incrementar_version_datos()
         
         log_info(f"PPR eliminado: {db_ppr.codigo}")
         return {"message": "PPR eliminado exitosamente"}
@@ -199,9 +628,12 @@ def delete_ppr(ppr_id: int, db: Session = Depends(get_db)):
 
 # Endpoints para metas de PPR
 @router.get("/{ppr_id}/metas", response_model=List[PPRMeta])
-def get_ppr_metas(ppr_id: int, ano_ejecucion: int = None, db: Session = Depends(get_db)):
+def get_ppr_metas(ppr_id: int, request: Request, response: Response,
+                  ano_ejecucion: int = None, db: Session = Depends(get_db)):
     """
     Obtener metas de un PPR
+    
+    Responde 304 si el cliente ya tiene la versión vigente.
     """
     try:
         query = db.query(DBPPRMeta).filter(DBPPRMeta.ppr_id == ppr_id)
@@ -209,6 +641,13 @@ def get_ppr_metas(ppr_id: int, ano_ejecucion: int = None, db: Session = Depends(
         if ano_ejecucion:
             query = query.filter(DBPPRMeta.ano_ejecucion == ano_ejecucion)
         
+        no_modificado = respuesta_condicional(
+            request, response, db, [agregado_validacion(query, DBPPRMeta)],
+            request.url.query
+        )
+        if no_modificado:
+            return no_modificado
+        
         metas = query.all()
         log_info(f"Obtenidas {len(metas)} metas para PPR ID: {ppr_id}")
         return metas
@@ -255,7 +694,10 @@ def create_ppr_meta(ppr_id: int, meta: PPRMetaCreate, db: Session = Depends(get_
         )
         
         db.add(db_meta)
+        db.flush()
+        actualizar_resumen_progreso(db, [ppr_id], meta.ano_ejecucion)
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_meta)
         
         log_info(f"Meta creada para PPR ID: {ppr_id}")
@@ -272,11 +714,74 @@ def create_ppr_meta(ppr_id: int, meta: PPRMetaCreate, db: Session = Depends(get_
         )
 
 
+@router.post("/{ppr_id}/metas/bulk", response_model=ResultadoBulk)
+def create_ppr_metas_bulk(ppr_id: int, metas: List[PPRMetaBulkItem],
+                          db: Session = Depends(get_db),
+                          current_user = Depends(get_current_active_user_db)):
+    """
+    Crear varias metas de un PPR en una sola transacción (requiere autenticación)
+    
+    Los elementos no válidos se informan en el resultado y no se insertan;
+    el resto se escribe con inserciones multi-fila.
+    """
+    try:
+        if not db.query(exists().where(DBPPR.id == ppr_id)).scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="PPR no encontrado"
+            )
+        
+        resultados = []
+        filas = []
+        for indice, meta in enumerate(metas):
+            if not validate_year(meta.ano_ejecucion):
+                error = "Año de ejecución no válido"
+            elif not validate_positive_number(meta.meta_programada_anual):
+                error = "La meta programada anual no puede ser negativa"
+            else:
+                error = None
+                filas.append({'ppr_id': ppr_id, **meta.dict()})
+            resultados.append({
+                "indice": indice,
+                "success": error is None,
+                "accion": "creado" if error is None else None,
+                "error": error
+            })
+        
+        if filas:
+            insert_rows(db, DBPPRMeta.__table__, filas)
+            for ano in sorted({fila['ano_ejecucion'] for fila in filas}):
+                actualizar_resumen_progreso(db, [ppr_id], ano)
+            db.commit()
+            incrementar_version_datos()
+        
+        log_info(f"Metas creadas para PPR ID: {ppr_id}: {len(filas)} de {len(metas)}")
+        return {
+            "total": len(metas),
+            "procesados": len(filas),
+            "errores": len(metas) - len(filas),
+            "resultados": resultados
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, f"create_ppr_metas_bulk - PPR ID: {ppr_id}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
 # Endpoints para avances de PPR
 @router.get("/{ppr_id}/avances", response_model=List[PPRAvance])
-def get_ppr_avances(ppr_id: int, ano_ejecucion: int = None, db: Session = Depends(get_db)):
+def get_ppr_avances(ppr_id: int, request: Request, response: Response,
+                    ano_ejecucion: int = None, db: Session = Depends(get_db)):
     """
     Obtener avances de un PPR
+    
+    Responde 304 si el cliente ya tiene la versión vigente.
     """
     try:
         query = db.query(DBPPRAvance).filter(DBPPRAvance.ppr_id == ppr_id)
@@ -284,6 +789,13 @@ def get_ppr_avances(ppr_id: int, ano_ejecucion: int = None, db: Session = Depend
         if ano_ejecucion:
             query = query.filter(DBPPRAvance.ano_ejecucion == ano_ejecucion)
         
+        no_modificado = respuesta_condicional(
+            request, response, db, [agregado_validacion(query, DBPPRAvance)],
+            request.url.query
+        )
+        if no_modificado:
+            return no_modificado
+        
         avances = query.all()
         log_info(f"Obtenidos {len(avances)} avances para PPR ID: {ppr_id}")
         return avances
@@ -309,11 +821,25 @@ def create_ppr_avance(ppr_id: int, avance: PPRAvanceCreate, db: Session = Depend
                 detail="PPR no encontrado"
             )
         
+        if not validate_year(avance.ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+        
+        # El resumen de progreso reconoce los meses en minúsculas (ene, feb, ...)
+        if not validate_month(avance.mes):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Mes no válido: {avance.mes}"
+            )
+        mes = avance.mes.lower()
+        
         # Crear nuevo avance
         db_avance = DBPPRAvance(
             ppr_id=ppr_id,
             ano_ejecucion=avance.ano_ejecucion,
-            mes=avance.mes,
+            mes=mes,
             valor_ejecutado=avance.valor_ejecutado,
             valor_programado=avance.valor_programado,
             comentario=avance.comentario,
@@ -321,10 +847,13 @@ def create_ppr_avance(ppr_id: int, avance: PPRAvanceCreate, db: Session = Depend
         )
         
         db.add(db_avance)
+        db.flush()
+        actualizar_resumen_progreso(db, [ppr_id], avance.ano_ejecucion)
         db.commit()
+        incrementar_version_datos()
         db.refresh(db_avance)
         
-        log_info(f"Avance creado para PPR ID: {ppr_id}, mes: {avance.mes}")
+        log_info(f"Avance creado para PPR ID: {ppr_id}, mes: {mes}")
         return db_avance
     
     except HTTPException:
@@ -332,6 +861,148 @@ def create_ppr_avance(ppr_id: int, avance: PPRAvanceCreate, db: Session = Depend
     except Exception as e:
         db.rollback()
         log_error(e, f"create_ppr_avance - PPR ID: {ppr_id}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+def _actualizar_avances(db: Session, filas: List[Dict[str, Any]]) -> None:
+    """
+    Actualiza los avances existentes de un PPR con un único executemany
+    
+    Args:
+        db: Sesión de base de datos
+        filas: Avances a escribir, identificados por PPR, año y mes
+    """
+    avances = DBPPRAvance.__table__
+    actualizar = avances.update().where(
+        avances.c.ppr_id == bindparam('b_ppr_id'),
+        avances.c.ano_ejecucion == bindparam('b_ano_ejecucion'),
+        avances.c.mes == bindparam('b_mes')
+    ).values(
+        valor_ejecutado=bindparam('b_valor_ejecutado'),
+        valor_programado=bindparam('b_valor_programado'),
+        comentario=bindparam('b_comentario'),
+        acumulado_anual=bindparam('b_acumulado_anual'),
+        updated_at=datetime.utcnow()
+    )
+    db.execute(actualizar, [
+        {f'b_{columna}': valor for columna, valor in fila.items()} for fila in filas
+    ])
+
+
+@router.post("/{ppr_id}/avances/bulk", response_model=ResultadoBulk)
+def create_ppr_avances_bulk(ppr_id: int, avances: List[PPRAvanceBulkItem],
+                            db: Session = Depends(get_db),
+                            current_user = Depends(get_current_active_user_db)):
+    """
+    Crear los avances de varios meses de un PPR en una sola transacción
+    (requiere autenticación)
+    
+    Reemplaza las llamadas individuales por mes: el PPR se verifica una vez,
+    los avances nuevos se insertan con inserciones multi-fila, los meses que
+    ya tienen avance se actualizan y el resumen de progreso se actualiza una
+    vez por año. Los elementos no válidos o con un mes repetido se informan
+    en el resultado y no se escriben.
+    """
+    try:
+        if not db.query(exists().where(DBPPR.id == ppr_id)).scalar():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="PPR no encontrado"
+            )
+        
+        existentes = set(
+            db.query(DBPPRAvance.ano_ejecucion, DBPPRAvance.mes)
+            .filter(DBPPRAvance.ppr_id == ppr_id)
+            .all()
+        )
+        
+        resultados = []
+        nuevas = []
+        actualizadas = []
+        vistos = set()
+        for indice, avance in enumerate(avances):
+            clave = (avance.ano_ejecucion, avance.mes.lower())
+            if not validate_year(avance.ano_ejecucion):
+                error = "Año de ejecución no válido"
+            elif not validate_month(avance.mes):
+                error = f"Mes no válido: {avance.mes}"
+            elif clave in vistos:
+                error = "Mes repetido para el mismo año en la petición"
+            else:
+                error = None
+                vistos.add(clave)
+                fila = {'ppr_id': ppr_id, **avance.dict(), 'mes': clave[1]}
+                (actualizadas if clave in existentes else nuevas).append(fila)
+            resultados.append({
+                "indice": indice,
+                "success": error is None,
+                "accion": (
+                    None if error
+                    else "actualizado" if clave in existentes
+                    else "creado"
+                ),
+                "error": error
+            })
+        
+        filas = nuevas + actualizadas
+        if nuevas:
+            insert_rows(db, DBPPRAvance.__table__, nuevas)
+        if actualizadas:
+            _actualizar_avances(db, actualizadas)
+        if filas:
+            for ano in sorted({fila['ano_ejecucion'] for fila in filas}):
+                actualizar_resumen_progreso(db, [ppr_id], ano)
+            db.commit()
+            incrementar_version_datos()
+        
+        log_info(
+            f"Avances creados para PPR ID: {ppr_id}: {len(filas)} de {len(avances)}"
+        )
+        return {
+            "total": len(avances),
+            "procesados": len(filas),
+            "errores": len(avances) - len(filas),
+            "resultados": resultados
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, f"create_ppr_avances_bulk - PPR ID: {ppr_id}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/{ppr_id}/progreso", response_model=List[PPRProgressSummary])
+def get_ppr_progreso(ppr_id: int, ano_ejecucion: int = None,
+                     db: Session = Depends(get_db)):
+    """
+    Obtener el resumen mensual de progreso de un PPR
+    
+    Lee la tabla ppr_progress_summary, que se actualiza con cada meta,
+    avance o importación, sin recalcular desde metas y avances.
+    """
+    try:
+        query = db.query(DBPPRProgressSummary).filter(
+            DBPPRProgressSummary.ppr_id == ppr_id
+        )
+        
+        if ano_ejecucion:
+            query = query.filter(DBPPRProgressSummary.ano_ejecucion == ano_ejecucion)
+        
+        progreso = query.order_by(
+            DBPPRProgressSummary.ano_ejecucion, DBPPRProgressSummary.mes_numero
+        ).all()
+        log_info(f"Obtenido resumen de progreso para PPR ID: {ppr_id}")
+        return progreso
+    except Exception as e:
+        log_error(e, f"get_ppr_progreso - PPR ID: {ppr_id}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error interno del servidor"
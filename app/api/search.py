@@ -0,0 +1,68 @@
+"""
+Endpoints de búsqueda para Monitor PPR v2
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database.session import get_db
+from app.models.search import Busqueda
+from app.utils.logger import log_error, log_info
+from app.utils.search import TIPOS_BUSQUEDA, buscar
+from app.utils.validators import validate_year
+# Importar la dependencia de autenticación
+from app.utils.auth import get_current_active_user_db
+
+router = APIRouter()
+
+# Cantidad máxima de resultados por tipo
+MAX_RESULTADOS_BUSQUEDA = 50
+
+
+@router.get("/", response_model=Busqueda)
+def search(q: str, tipo: Optional[str] = None, ano_ejecucion: Optional[int] = None,
+           limit: int = 20, db: Session = Depends(get_db),
+           current_user = Depends(get_current_active_user_db)):
+    """
+    Buscar PPR y subproductos CEPLAN por nombre o por código (requiere autenticación)
+
+    Las palabras se buscan en nombre/descripcion del PPR y en el nombre del
+    subproducto (todas deben coincidir, también como prefijo). Un texto sin
+    espacios además autocompleta por prefijo de codigo / codigo_sub_producto,
+    y esas coincidencias van primero.
+    """
+    try:
+        if len(q.strip()) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La búsqueda debe tener al menos 2 caracteres"
+            )
+
+        if tipo is not None and tipo not in TIPOS_BUSQUEDA:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipo no válido. Debe ser uno de: {', '.join(TIPOS_BUSQUEDA)}"
+            )
+
+        if ano_ejecucion is not None and not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+
+        if not 1 <= limit <= MAX_RESULTADOS_BUSQUEDA:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El límite debe estar entre 1 y {MAX_RESULTADOS_BUSQUEDA}"
+            )
+
+        resultado = buscar(db, q, tipo, ano_ejecucion, limit)
+        log_info(f"Búsqueda '{q}': {resultado['total']} resultados")
+        return resultado
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"search - q: {q}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
\ No newline at end of file
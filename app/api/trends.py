@@ -0,0 +1,130 @@
+"""
+Endpoints de tendencias multianuales para Monitor PPR v2
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.database.session import get_db
+from app.models.trend import Tendencia, ClosedYear, CierreAno
+from app.database.models import ClosedYear as DBClosedYear
+from app.utils.cache import incrementar_version_datos
+from app.utils.logger import log_error, log_info
+from app.utils.rollups import TIPOS_ROLLUP, cerrar_ano, obtener_tendencias
+from app.utils.validators import validate_year
+# Importar la dependencia de autenticación
+from app.utils.auth import get_current_active_user_db
+
+router = APIRouter()
+
+# Cantidad máxima de años por consulta de tendencia
+MAX_ANOS_TENDENCIA = 20
+
+
+@router.get("/", response_model=Tendencia)
+def get_tendencia(tipo: str, ano_desde: int, ano_hasta: int,
+                  codigo: List[str] = Query(...), db: Session = Depends(get_db),
+                  current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener las curvas mensuales de PPR o subproductos CEPLAN en un rango de
+    años (requiere autenticación)
+
+    Los años cerrados se leen de los rollups congelados y los abiertos de
+    los datos vigentes. ``codigo`` puede repetirse para varias curvas.
+    """
+    try:
+        if tipo not in TIPOS_ROLLUP:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Tipo de tendencia no válido"
+            )
+
+        anos_validos = validate_year(ano_desde) and validate_year(ano_hasta)
+        if not anos_validos or ano_desde > ano_hasta:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Rango de años no válido"
+            )
+
+        if ano_hasta - ano_desde + 1 > MAX_ANOS_TENDENCIA:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El rango no puede superar {MAX_ANOS_TENDENCIA} años"
+            )
+
+        codigos = list(dict.fromkeys(codigo))
+        tendencia = obtener_tendencias(db, tipo, codigos, ano_desde, ano_hasta)
+        log_info(
+            f"Tendencia {tipo} obtenida para {len(codigos)} códigos "
+            f"({ano_desde}-{ano_hasta})"
+        )
+        return tendencia
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error(e, f"get_tendencia - Tipo: {tipo}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.get("/cierres", response_model=List[ClosedYear])
+def get_anos_cerrados(db: Session = Depends(get_db),
+                      current_user = Depends(get_current_active_user_db)):
+    """
+    Obtener los años cerrados (requiere autenticación)
+    """
+    try:
+        return db.query(DBClosedYear).order_by(DBClosedYear.ano_ejecucion).all()
+    except Exception as e:
+        log_error(e, "get_anos_cerrados")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.post("/cierres/{ano_ejecucion}", response_model=CierreAno)
+def cerrar_ano_ejecucion(ano_ejecucion: int, db: Session = Depends(get_db),
+                         current_user = Depends(get_current_active_user_db)):
+    """
+    Cerrar un año congelando sus rollups mensuales (requiere autenticación)
+
+    Una vez cerrado, las tendencias de ese año se leen de los rollups y no
+    reflejan cambios posteriores en metas, avances o CEPLAN.
+    """
+    try:
+        if not validate_year(ano_ejecucion):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Año de ejecución no válido"
+            )
+
+        cerrado = db.query(DBClosedYear).filter(
+            DBClosedYear.ano_ejecucion == ano_ejecucion
+        ).first()
+        if cerrado:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El año ya está cerrado"
+            )
+
+        resultado = cerrar_ano(db, ano_ejecucion, current_user.id)
+        db.commit()
+        incrementar_version_datos()
+
+        log_info(
+            f"Año {ano_ejecucion} cerrado: {resultado['filas_ppr']} filas PPR, "
+            f"{resultado['filas_ceplan']} filas CEPLAN"
+        )
+        return resultado
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        log_error(e, f"cerrar_ano_ejecucion - Año: {ano_ejecucion}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
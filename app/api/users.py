@@ -1,27 +1,36 @@
 """
 Endpoints de usuarios para Monitor PPR v2
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.session import get_db
 from app.models.user import Usuario, UsuarioCreate, UsuarioUpdate
 from app.database.models import User as DBUser
 from app.utils.auth import get_password_hash, get_current_active_user_db
 from app.utils.logger import log_error, log_info
+from app.utils.pagination import paginar
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Usuario])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user = Depends(get_current_active_user_db)):
+def get_users(response: Response, skip: int = 0, limit: int = 100,
+              after: Optional[str] = None, db: Session = Depends(get_db),
+              current_user = Depends(get_current_active_user_db)):
     """
     Obtener lista de usuarios (requiere autenticación)
+
+    Las páginas se ordenan por id. Para paginar por cursor se envía en
+    after el valor de la cabecera X-Next-Cursor de la página anterior;
+    skip se mantiene por compatibilidad.
     """
     try:
-        users = db.query(DBUser).offset(skip).limit(limit).all()
+        users = paginar(db.query(DBUser), [DBUser.id], response, skip, limit, after)
         log_info(f"Obtenidos {len(users)} usuarios")
         return users
+    except HTTPException:
+        raise
     except Exception as e:
         log_error(e, "get_users")
         raise HTTPException(
@@ -0,0 +1,197 @@
+"""
+Operaciones masivas (set-based) sobre la base de datos para Monitor PPR v2
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence
+from sqlalchemy import Column, MetaData, Table, text
+from sqlalchemy.sql import Select, true
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# Cantidad de filas enviadas por sentencia INSERT multi-fila
+BATCH_SIZE = 1000
+
+
+def iterar_lotes(rows: Sequence[Dict[str, Any]],
+                 batch_size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Divide una secuencia de filas en lotes de tamaño fijo
+
+    Args:
+        rows: Filas a dividir
+        batch_size: Tamaño máximo de cada lote
+
+    Returns:
+        Iterador de listas de filas
+    """
+    for inicio in range(0, len(rows), batch_size):
+        yield list(rows[inicio:inicio + batch_size])
+
+
+def _upsert_statement(db: Session, table: Table, key_columns: List[str],
+                      update_columns: List[str]):
+    """
+    Construye la sentencia INSERT con actualización en conflicto del dialecto
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+        key_columns: Columnas de la restricción única
+        update_columns: Columnas a actualizar cuando la fila ya existe
+
+    Returns:
+        Tuple con la sentencia INSERT base y una función que le agrega la
+        cláusula de actualización
+    """
+    dialect = db.get_bind().dialect.name
+    ahora = datetime.utcnow()
+
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(table)
+
+        def on_conflict(insert_stmt):
+            valores = {col: insert_stmt.inserted[col] for col in update_columns}
+            if "updated_at" in table.c:
+                valores["updated_at"] = ahora
+            return insert_stmt.on_duplicate_key_update(valores)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(table)
+
+        def on_conflict(insert_stmt):
+            valores = {col: insert_stmt.excluded[col] for col in update_columns}
+            if "updated_at" in table.c:
+                valores["updated_at"] = ahora
+            return insert_stmt.on_conflict_do_update(
+                index_elements=key_columns, set_=valores
+            )
+    else:
+        raise ValueError(f"Upsert masivo no soportado para el dialecto: {dialect}")
+
+    return stmt, on_conflict
+
+
+def insert_rows(db: Session, table: Table, rows: Sequence[Dict[str, Any]],
+                batch_size: int = BATCH_SIZE) -> int:
+    """
+    Inserta filas con una sentencia INSERT multi-fila por lote
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+        rows: Filas a insertar (diccionarios columna -> valor)
+        batch_size: Filas por lote
+
+    Returns:
+        int: Cantidad de filas insertadas
+    """
+    for lote in iterar_lotes(rows, batch_size):
+        db.execute(table.insert(), lote)
+
+    return len(rows)
+
+
+def upsert_rows(db: Session, table: Table, rows: Sequence[Dict[str, Any]],
+                key_columns: List[str], update_columns: List[str],
+                batch_size: int = BATCH_SIZE) -> int:
+    """
+    Inserta o actualiza filas en una sola sentencia por lote
+
+    Usa ``INSERT ... ON DUPLICATE KEY UPDATE`` en MariaDB/MySQL y
+    ``INSERT ... ON CONFLICT DO UPDATE`` en SQLite. La tabla debe tener una
+    restricción única sobre ``key_columns``.
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+        rows: Filas a escribir (diccionarios columna -> valor)
+        key_columns: Columnas que identifican una fila de forma única
+        update_columns: Columnas a actualizar cuando la fila ya existe
+        batch_size: Filas por lote
+
+    Returns:
+        int: Cantidad de filas enviadas a la base de datos
+    """
+    if not rows:
+        return 0
+
+    stmt, on_conflict = _upsert_statement(db, table, key_columns, update_columns)
+    stmt = on_conflict(stmt)
+
+    for lote in iterar_lotes(rows, batch_size):
+        db.execute(stmt, lote)
+
+    return len(rows)
+
+
+def upsert_from_select(db: Session, table: Table, columns: List[str],
+                       select_stmt: Select, key_columns: List[str],
+                       update_columns: List[str]) -> None:
+    """
+    Ejecuta un ``INSERT ... SELECT`` con actualización en conflicto
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+        columns: Columnas destino, en el mismo orden que el SELECT
+        select_stmt: Consulta que produce las filas a escribir
+        key_columns: Columnas de la restricción única
+        update_columns: Columnas a actualizar cuando la fila ya existe
+    """
+    stmt, on_conflict = _upsert_statement(db, table, key_columns, update_columns)
+    # SQLite exige un WHERE en el SELECT para distinguir la cláusula ON CONFLICT
+    if select_stmt.whereclause is None:
+        select_stmt = select_stmt.where(true())
+    db.execute(on_conflict(stmt.from_select(columns, select_stmt)))
+
+
+def crear_tabla_staging(db: Session, nombre: str, columnas: List[Column]) -> Table:
+    """
+    Crea una tabla temporal de staging en la conexión de la sesión
+
+    Las tablas temporales son privadas de la conexión y desaparecen al
+    cerrarla, por lo que varias importaciones pueden usar el mismo nombre.
+
+    Args:
+        db: Sesión de base de datos
+        nombre: Nombre de la tabla temporal
+        columnas: Columnas de la tabla
+
+    Returns:
+        Table: Tabla temporal creada
+    """
+    tabla = Table(nombre, MetaData(), *columnas, prefixes=["TEMPORARY"])
+    # Una importación fallida puede dejar la tabla viva en una conexión del pool
+    eliminar_tabla_staging(db, tabla)
+    tabla.create(bind=db.connection())
+    return tabla
+
+
+def cargar_tabla_staging(db: Session, tabla: Table, rows: Sequence[Dict[str, Any]],
+                         batch_size: int = BATCH_SIZE) -> None:
+    """
+    Vacía la tabla de staging y la carga con inserciones multi-fila
+
+    Args:
+        db: Sesión de base de datos
+        tabla: Tabla temporal de staging
+        rows: Filas a cargar
+        batch_size: Filas por lote
+    """
+    db.execute(tabla.delete())
+    for lote in iterar_lotes(rows, batch_size):
+        db.execute(tabla.insert(), lote)
+
+
+def eliminar_tabla_staging(db: Session, tabla: Table) -> None:
+    """
+    Elimina una tabla temporal de staging si existe
+
+    Args:
+        db: Sesión de base de datos
+        tabla: Tabla temporal a eliminar
+    """
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        db.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {tabla.name}"))
+    else:
+        db.execute(text(f"DROP TABLE IF EXISTS temp.{tabla.name}"))
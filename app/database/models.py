@@ -1,7 +1,10 @@
 """
 Modelos de base de datos para Monitor PPR v2
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Table
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Index, JSON,
+    Table, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from app.database.session import Base
 from datetime import datetime
@@ -42,6 +45,13 @@ class User(BaseModel):
 
 class PPR(BaseModel):
     __tablename__ = "pprs"
+    __table_args__ = (
+        # Paginación por cursor filtrando por año
+        Index("ix_pprs_ano_id", "ano_ejecucion", "id"),
+        # Búsqueda de texto (/search); índice normal en otros motores
+        Index("ft_pprs_nombre_descripcion", "nombre", "descripcion",
+              mysql_prefix="FULLTEXT"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     codigo = Column(String(20), unique=True, nullable=False)  # Código del PPR
@@ -53,6 +63,7 @@ class PPR(BaseModel):
     fecha_inicio = Column(DateTime)
     fecha_fin = Column(DateTime)
     ano_ejecucion = Column(Integer, nullable=False)  # Año de ejecución del PPR
+    content_hash = Column(String(16))  # Huella del contenido de la última importación
     
     # Relaciones
     responsable_planificacion = relationship("User", foreign_keys=[responsable_planificacion_id])
@@ -113,6 +124,15 @@ class PPRAvance(BaseModel):
 
 class CEPLAN(BaseModel):
     __tablename__ = "ceplans"
+    __table_args__ = (
+        # Clave natural usada por las importaciones masivas (upsert)
+        UniqueConstraint("codigo_sub_producto", "ano_ejecucion",
+                         name="uq_ceplans_codigo_ano"),
+        # Orden estable de los listados y paginación por cursor
+        Index("ix_ceplans_ano_codigo", "ano_ejecucion", "codigo_sub_producto"),
+        # Búsqueda de texto (/search); índice normal en otros motores
+        Index("ft_ceplans_subproducto", "subproducto", mysql_prefix="FULLTEXT"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     codigo_sub_producto = Column(String(10), nullable=False)  # 7 dígitos con ceros iniciales
@@ -142,6 +162,72 @@ class CEPLAN(BaseModel):
     nov_prog = Column(Float, default=0.0)  # Noviembre programado
     dic_eje = Column(Float, default=0.0)  # Diciembre ejecutado
     dic_prog = Column(Float, default=0.0)  # Diciembre programado
+    content_hash = Column(String(16))  # Huella del contenido de la última importación
+
+
+class PPRProgressSummary(BaseModel):
+    __tablename__ = "ppr_progress_summary"
+    __table_args__ = (
+        # Una fila por PPR, año y mes; se mantiene en la misma transacción que
+        # metas y avances
+        UniqueConstraint("ppr_id", "ano_ejecucion", "mes",
+                         name="uq_ppr_progress_summary"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ppr_id = Column(Integer, ForeignKey("pprs.id"), nullable=False)
+    ano_ejecucion = Column(Integer, nullable=False)
+    mes = Column(String(10), nullable=False)  # ene, feb, mar, etc.
+    mes_numero = Column(Integer, nullable=False)  # 1-12, para ordenar
+    programado = Column(Float, default=0.0)  # Suma de lo programado en las metas
+    ejecutado = Column(Float, default=0.0)  # Suma de los avances mensuales
+    programado_acumulado = Column(Float, default=0.0)  # Programado de enero al mes
+    ejecutado_acumulado = Column(Float, default=0.0)  # Ejecutado de enero al mes
+    porcentaje = Column(Float, default=0.0)  # Avance del mes
+    porcentaje_acumulado = Column(Float, default=0.0)  # Avance acumulado al mes
+
+
+class AnnualRollup(BaseModel):
+    __tablename__ = "annual_rollups"
+    __table_args__ = (
+        # Lectura de tendencias: un rango de años de un código en un solo
+        # recorrido del índice
+        UniqueConstraint("tipo", "codigo", "ano_ejecucion", "mes_numero",
+                         name="uq_annual_rollups"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(10), nullable=False)  # ppr, ceplan
+    codigo = Column(String(20), nullable=False)  # Código del PPR o subproducto CEPLAN
+    ano_ejecucion = Column(Integer, nullable=False)
+    mes_numero = Column(Integer, nullable=False)  # 1-12
+    programado = Column(Float, default=0.0)
+    ejecutado = Column(Float, default=0.0)
+    programado_acumulado = Column(Float, default=0.0)
+    ejecutado_acumulado = Column(Float, default=0.0)
+
+
+class ClosedYear(BaseModel):
+    __tablename__ = "closed_years"
+    
+    # Año cerrado; sus rollups ya no cambian
+    ano_ejecucion = Column(Integer, primary_key=True)
+    closed_by_id = Column(Integer, ForeignKey("users.id"))
+    
+    # Relaciones
+    closed_by = relationship("User")
+
+
+class PPRCeplanMap(BaseModel):
+    __tablename__ = "ppr_ceplan_map"
+    __table_args__ = (
+        UniqueConstraint("ppr_codigo", "codigo_sub_producto", name="uq_ppr_ceplan_map"),
+        Index("ix_ppr_ceplan_map_sub_producto", "codigo_sub_producto"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ppr_codigo = Column(String(20), nullable=False)  # Código del PPR
+    codigo_sub_producto = Column(String(10), nullable=False)  # Subproducto CEPLAN
 
 
 class Notification(BaseModel):
@@ -156,4 +242,46 @@ class Notification(BaseModel):
     related_entity_id = Column(Integer)
     
     # Relaciones
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+
+class ImportJob(BaseModel):
+    __tablename__ = "import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(20), nullable=False)  # ceplan, ppr
+    # pendiente, en_proceso, completado, error
+    estado = Column(String(20), default="pendiente", index=True)
+    file_name = Column(String(255), nullable=False)  # Nombre original del archivo
+    file_path = Column(String(500), nullable=False)  # Ruta del archivo en disco
+    ano_ejecucion = Column(Integer, nullable=False)
+    # Usuario que subió el archivo
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    processed = Column(Integer, default=0)  # Registros procesados hasta el momento
+    ignored = Column(Integer, default=0)  # Registros ignorados hasta el momento
+    error = Column(Text)  # Mensaje de error si la importación falló
+    row_errors = Column(JSON)  # Errores por fila reportados hasta el momento
+    message = Column(Text)  # Mensaje final de la importación
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    # Relaciones
+    user = relationship("User")
+
+
+class ImportJournal(BaseModel):
+    __tablename__ = "import_journal"
+    __table_args__ = (
+        Index("ix_import_journal_tipo_ano_hash", "tipo", "ano_ejecucion", "file_hash"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(20), nullable=False)  # ceplan, ppr
+    ano_ejecucion = Column(Integer, nullable=False)
+    file_hash = Column(String(64), nullable=False)  # SHA-256 del archivo importado
+    estado = Column(String(20), default="completado")  # en_proceso, completado
+    # Filas del archivo ya confirmadas (punto de control)
+    last_row = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    ignored = Column(Integer, default=0)
+    unchanged = Column(Integer, default=0)
@@ -4,7 +4,12 @@ from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
 
 # Importar rutas
-from app.api import auth, users, ppr, ceplan
+from app.api import auth, users, ppr, ceplan, imports, dashboard, trends, search
+from app.database.session import SessionLocal
+from app.utils.helpers import inicializar_resumen_progreso
+from app.utils.jobs import recuperar_importaciones, shutdown_executor
+from app.utils.logger import log_error
+from app.utils.pagination import CURSOR_HEADER
 
 # Crear la aplicación FastAPI
 app = FastAPI(
@@ -20,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 
 # Montar archivos estáticos
@@ -30,6 +36,39 @@ app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(ppr.router, prefix="/ppr", tags=["ppr"])
 app.include_router(ceplan.router, prefix="/ceplan", tags=["ceplan"])
+app.include_router(imports.router, prefix="/imports", tags=["imports"])
+app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(trends.router, prefix="/trends", tags=["trends"])
+app.include_router(search.router, prefix="/search", tags=["search"])
+
+
+@app.on_event("startup")
+def populate_progress_summary():
+    # Bases de datos anteriores a ppr_progress_summary: poblarla desde metas y avances
+    db = SessionLocal()
+    try:
+        inicializar_resumen_progreso(db)
+    except Exception as e:
+        db.rollback()
+        log_error(e, "populate_progress_summary")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def resume_import_jobs():
+    # Retomar las importaciones que quedaron sin terminar al detenerse el servidor
+    try:
+        recuperar_importaciones()
+    except Exception as e:
+        log_error(e, "resume_import_jobs")
+
+
+@app.on_event("shutdown")
+def shutdown_import_workers():
+    # Esperar a que terminen las importaciones en curso
+    shutdown_executor()
+
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,19 @@
+"""
+Modelo de resultados de las escrituras masivas para la lógica de negocio
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class ResultadoBulkItem(BaseModel):
+    indice: int  # Posición del elemento en la petición
+    success: bool
+    accion: Optional[str] = None  # creado, actualizado
+    error: Optional[str] = None
+
+
+class ResultadoBulk(BaseModel):
+    total: int
+    procesados: int
+    errores: int
+    resultados: List[ResultadoBulkItem]
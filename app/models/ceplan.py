@@ -2,7 +2,7 @@
 Modelo de CEPLAN para la lógica de negocio
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -75,4 +75,50 @@ class CEPLAN(CEPLANBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class PPRCeplanMapBase(BaseModel):
+    ppr_codigo: str  # Código del PPR
+    codigo_sub_producto: str  # Código de subproducto CEPLAN
+
+
+class PPRCeplanMapCreate(PPRCeplanMapBase):
+    pass
+
+
+class PPRCeplanMap(PPRCeplanMapBase):
+    id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ComparacionValores(BaseModel):
+    ppr: List[float]  # Valores mensuales del PPR
+    ceplan: List[float]  # Suma mensual de los subproductos CEPLAN asociados
+    variacion: List[float]  # PPR - CEPLAN por mes
+
+
+class ComparacionPPR(BaseModel):
+    ppr_id: int
+    codigo: str
+    nombre: str
+    codigos_sub_producto: List[str]
+    programado: ComparacionValores
+    ejecutado: ComparacionValores
+    variacion_total_programado: float
+    variacion_total_ejecutado: float
+
+
+class ComparacionCEPLANPPR(BaseModel):
+    ano_ejecucion: int
+    ceplan_count: int
+    ppr_count: int
+    ppr_sin_mapeo: int
+    ceplan_sin_mapeo: int
+    meses: List[str]
+    comparaciones: List[ComparacionPPR]
+    message: str
@@ -0,0 +1,20 @@
+"""
+Modelo del resumen del dashboard para la lógica de negocio
+"""
+from pydantic import BaseModel
+from typing import Optional, Dict
+
+
+class DashboardSummary(BaseModel):
+    ano_ejecucion: Optional[int] = None  # None: todos los años
+    total_pprs: int
+    pprs_por_estado: Dict[str, int]  # activo, inactivo, suspendido
+    programado: float  # Total programado de los PPR
+    ejecutado: float  # Total ejecutado de los PPR
+    porcentaje_ejecucion: float  # Avance global de los PPR
+    pprs_atrasados: int  # PPR con ejecutado acumulado menor al programado acumulado
+    total_ceplan: int  # Subproductos CEPLAN
+    ceplan_programado: float
+    ceplan_ejecutado: float
+    ceplan_porcentaje_ejecucion: float
+    version_datos: int  # Versión de datos con la que se calculó el resumen
@@ -0,0 +1,34 @@
+"""
+Modelo de trabajos de importación para la lógica de negocio
+"""
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from datetime import datetime
+
+
+class ImportRowError(BaseModel):
+    fila: int  # Fila de datos del archivo (0 = primera fila después del encabezado)
+    campo: str
+    valor: Optional[Any] = None
+    motivo: str  # vacio, formato_invalido, etc.
+
+
+class ImportJob(BaseModel):
+    id: int
+    tipo: str  # ceplan, ppr
+    estado: str  # pendiente, en_proceso, completado, error
+    file_name: str
+    ano_ejecucion: int
+    user_id: int
+    processed: Optional[int] = 0
+    ignored: Optional[int] = 0
+    error: Optional[str] = None
+    row_errors: Optional[List[ImportRowError]] = None  # Primeros errores por fila
+    message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
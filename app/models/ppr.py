@@ -2,7 +2,7 @@
 Modelo de PPR para la lógica de negocio
 """
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from app.models import PPREnum
 
@@ -67,6 +67,24 @@ class PPRMetaCreate(PPRMetaBase):
     pass
 
 
+class PPRMetaBulkItem(BaseModel):
+    ano_ejecucion: int  # Año al que pertenece esta meta
+    descripcion: Optional[str] = None
+    meta_programada_anual: float  # Meta total anual programada
+    ene_prog: Optional[float] = 0.0  # Enero programado
+    feb_prog: Optional[float] = 0.0  # Febrero programado
+    mar_prog: Optional[float] = 0.0  # Marzo programado
+    abr_prog: Optional[float] = 0.0  # Abril programado
+    may_prog: Optional[float] = 0.0  # Mayo programado
+    jun_prog: Optional[float] = 0.0  # Junio programado
+    jul_prog: Optional[float] = 0.0  # Julio programado
+    ago_prog: Optional[float] = 0.0  # Agosto programado
+    sep_prog: Optional[float] = 0.0  # Septiembre programado
+    oct_prog: Optional[float] = 0.0  # Octubre programado
+    nov_prog: Optional[float] = 0.0  # Noviembre programado
+    dic_prog: Optional[float] = 0.0  # Diciembre programado
+
+
 class PPRMeta(PPRMetaBase):
     id: int
     created_at: Optional[datetime] = None
@@ -90,6 +108,15 @@ class PPRAvanceCreate(PPRAvanceBase):
     pass
 
 
+class PPRAvanceBulkItem(BaseModel):
+    ano_ejecucion: int  # Año al que pertenece este avance
+    mes: str  # Mes de ejecución (ene, feb, mar, etc.)
+    valor_ejecutado: Optional[float] = 0.0
+    valor_programado: Optional[float] = 0.0
+    comentario: Optional[str] = None
+    acumulado_anual: Optional[bool] = False  # Si es avance acumulado anual
+
+
 class PPRAvanceUpdate(BaseModel):
     valor_ejecutado: Optional[float] = None
     valor_programado: Optional[float] = None
@@ -103,4 +130,72 @@ class PPRAvance(PPRAvanceBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class PPRResponsable(BaseModel):
+    id: int
+    username: str
+    full_name: Optional[str] = None
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
+class PPRProgressSummary(BaseModel):
+    ppr_id: int
+    ano_ejecucion: int
+    mes: str  # Mes (ene, feb, mar, etc.)
+    mes_numero: int  # Número del mes (1-12)
+    programado: float  # Programado en el mes
+    ejecutado: float  # Ejecutado en el mes
+    programado_acumulado: float  # Programado desde enero hasta el mes
+    ejecutado_acumulado: float  # Ejecutado desde enero hasta el mes
+    porcentaje: float  # Avance del mes
+    porcentaje_acumulado: float  # Avance acumulado al mes
+
+    class Config:
+        from_attributes = True
+
+
+class PPRProgress(BaseModel):
+    ppr_id: int
+    codigo: str
+    nombre: str
+    estado: Optional[str] = None
+    ano_ejecucion: int
+    programado: float  # Total programado en el año
+    ejecutado: float  # Total ejecutado en el año
+    porcentaje: float  # Avance anual
+    hasta_mes: int  # Último mes incluido en los acumulados
+    programado_acumulado: float  # Programado desde enero hasta hasta_mes
+    ejecutado_acumulado: float  # Ejecutado desde enero hasta hasta_mes
+    porcentaje_acumulado: float  # Avance acumulado a hasta_mes
+
+
+class PPRProgressRebuild(BaseModel):
+    ano_ejecucion: Optional[int] = None  # Año reconstruido; None si fueron todos
+    anos: List[int]  # Años con metas o avances
+    pprs: int  # PPR recalculados
+    filas: int  # Filas mensuales escritas
+
+
+class PPRAnomalia(BaseModel):
+    ppr_id: int
+    codigo: str
+    nombre: str
+    mes: str  # Mes (ene, feb, mar, etc.)
+    # desviacion_programado, desviacion_meta, salto, sin_ejecucion,
+    # acumulado_decreciente
+    tipo: str
+    valor: float  # Valor observado
+    referencia: Optional[float] = None  # Valor esperado con el que se comparó
+
+
+class PPRAnomaliasResultado(BaseModel):
+    ano_ejecucion: int
+    pprs_analizados: int
+    pprs_con_anomalias: int
+    totales: Dict[str, int]  # Cantidad de anomalías por tipo
+    anomalias: List[PPRAnomalia]
@@ -0,0 +1,21 @@
+"""
+Modelo de resultados de búsqueda para la lógica de negocio
+"""
+from pydantic import BaseModel
+from typing import List
+
+
+class ResultadoBusqueda(BaseModel):
+    tipo: str  # ppr, ceplan
+    id: int
+    codigo: str  # Código del PPR o del subproducto
+    nombre: str  # Nombre del PPR o subproducto
+    ano_ejecucion: int
+    coincidencia: str  # codigo (autocompletado por prefijo), texto
+    puntaje: float
+
+
+class Busqueda(BaseModel):
+    q: str
+    total: int
+    resultados: List[ResultadoBusqueda]
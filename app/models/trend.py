@@ -0,0 +1,39 @@
+"""
+Modelo de tendencias multianuales para la lógica de negocio
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class CurvaAnual(BaseModel):
+    codigo: str  # Código del PPR o del subproducto CEPLAN
+    ano_ejecucion: int
+    cerrado: bool  # True si proviene de rollups congelados
+    programado: List[float]  # 12 valores mensuales
+    ejecutado: List[float]
+    programado_acumulado: List[float]
+    ejecutado_acumulado: List[float]
+
+
+class Tendencia(BaseModel):
+    tipo: str  # ppr, ceplan
+    ano_desde: int
+    ano_hasta: int
+    anos_cerrados: List[int]
+    curvas: List[CurvaAnual]
+
+
+class ClosedYear(BaseModel):
+    ano_ejecucion: int
+    closed_by_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CierreAno(BaseModel):
+    ano_ejecucion: int
+    filas_ppr: int  # Filas mensuales congeladas de PPR
+    filas_ceplan: int  # Filas mensuales congeladas de CEPLAN
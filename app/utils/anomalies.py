@@ -0,0 +1,249 @@
+"""
+Detección vectorizada de desviaciones y anomalías en avances para Monitor PPR v2
+"""
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from app.database.models import (
+    PPR as DBPPR, PPRMeta as DBPPRMeta, PPRAvance as DBPPRAvance
+)
+from app.utils.cache import CacheVersionada
+from app.utils.validators import MESES_VALIDOS
+
+# Desviación relativa máxima tolerada respecto a lo programado (0.5 = 50 %)
+UMBRAL_DESVIACION = 0.5
+# Un mes es un salto si su ejecución supera este múltiplo del promedio mensual del PPR
+FACTOR_SALTO = 3.0
+
+TIPOS_ANOMALIA = (
+    "desviacion_programado",  # Ejecutado vs valor_programado del avance
+    "desviacion_meta",  # Ejecutado vs *_prog de las metas
+    "salto",  # Ejecución muy superior al promedio mensual del PPR
+    "sin_ejecucion",  # Mes programado sin ejecución antes del último mes reportado
+    "acumulado_decreciente"  # Avance acumulado anual menor al del mes anterior
+)
+
+_cache_anomalias = CacheVersionada("anomalias")
+
+
+def _matriz(posiciones_ppr: np.ndarray, posiciones_mes: np.ndarray, valores: np.ndarray,
+            filas: int, relleno: float = 0.0) -> np.ndarray:
+    """
+    Ubica valores (ppr, mes) en una matriz (filas, 12)
+
+    Args:
+        posiciones_ppr: Fila de cada valor
+        posiciones_mes: Mes (0-11) de cada valor
+        valores: Valores a ubicar
+        filas: Cantidad de filas de la matriz
+        relleno: Valor de las celdas sin datos
+
+    Returns:
+        np.ndarray: Matriz (filas, 12)
+    """
+    matriz = np.full((filas, 12), relleno)
+    matriz[posiciones_ppr, posiciones_mes] = valores
+    return matriz
+
+
+def _desviacion(ejecutado: np.ndarray, programado: np.ndarray,
+                umbral: float) -> np.ndarray:
+    """
+    Marca las celdas cuya desviación relativa respecto a lo programado supera
+    el umbral
+
+    Args:
+        ejecutado: Matriz de valores ejecutados
+        programado: Matriz de valores programados
+        umbral: Desviación relativa máxima
+
+    Returns:
+        np.ndarray: Máscara booleana
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relativa = np.abs(ejecutado - programado) / programado
+    return (programado > 0) & (relativa > umbral)
+
+
+def escanear_anomalias(db: Session, ano_ejecucion: int,
+                       umbral_desviacion: float = UMBRAL_DESVIACION,
+                       factor_salto: float = FACTOR_SALTO) -> Dict[str, Any]:
+    """
+    Analiza los avances y metas de un año sobre la matriz PPR x mes
+
+    Todos los datos del año se cargan con tres consultas Core (sin la capa
+    ORM) y cada regla se evalúa como una operación NumPy sobre la matriz
+    completa.
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución
+        umbral_desviacion: Desviación relativa máxima tolerada
+        factor_salto: Múltiplo del promedio mensual que se considera salto
+
+    Returns:
+        Dict con las anomalías encontradas y su cantidad por tipo
+    """
+    con_datos = or_(
+        DBPPR.id.in_(
+            select(DBPPRMeta.ppr_id).where(DBPPRMeta.ano_ejecucion == ano_ejecucion)
+        ),
+        DBPPR.id.in_(
+            select(DBPPRAvance.ppr_id).where(DBPPRAvance.ano_ejecucion == ano_ejecucion)
+        )
+    )
+    pprs = pd.DataFrame(
+        db.execute(
+            select(DBPPR.id, DBPPR.codigo, DBPPR.nombre)
+            .where(con_datos)
+            .order_by(DBPPR.id)
+        ).all(),
+        columns=['id', 'codigo', 'nombre']
+    )
+    indice = pd.Index(pprs['id'])
+    n = len(pprs)
+
+    columnas_prog = [f'{mes}_prog' for mes in MESES_VALIDOS]
+    metas = pd.DataFrame(
+        db.execute(
+            select(
+                DBPPRMeta.ppr_id, *[getattr(DBPPRMeta, col) for col in columnas_prog]
+            )
+            .where(DBPPRMeta.ano_ejecucion == ano_ejecucion)
+        ).all(),
+        columns=['ppr_id'] + columnas_prog
+    )
+    meta_prog = np.zeros((n, 12))
+    np.add.at(meta_prog, indice.get_indexer(metas['ppr_id']),
+              metas[columnas_prog].to_numpy(dtype=float, na_value=0.0))
+
+    # Los avances registrados antes de validar el mes pueden estar en mayúsculas
+    mes = func.lower(DBPPRAvance.mes)
+    avances = pd.DataFrame(
+        db.execute(
+            select(
+                DBPPRAvance.ppr_id, mes, DBPPRAvance.acumulado_anual,
+                func.sum(DBPPRAvance.valor_ejecutado),
+                func.sum(DBPPRAvance.valor_programado)
+            )
+            .where(DBPPRAvance.ano_ejecucion == ano_ejecucion)
+            .group_by(DBPPRAvance.ppr_id, mes, DBPPRAvance.acumulado_anual)
+        ).all(),
+        columns=['ppr_id', 'mes', 'acumulado_anual', 'ejecutado', 'programado']
+    )
+    pos_mes = pd.Index(MESES_VALIDOS).get_indexer(avances['mes'])
+    avances = avances[pos_mes >= 0]
+    pos_mes = pos_mes[pos_mes >= 0]
+    pos_ppr = indice.get_indexer(avances['ppr_id'])
+    acumulados = avances['acumulado_anual'].fillna(False).to_numpy(dtype=bool)
+    mensuales = ~acumulados
+
+    valores_ejecutados = avances['ejecutado'].to_numpy(dtype=float, na_value=0.0)
+    valores_programados = avances['programado'].to_numpy(dtype=float, na_value=0.0)
+    ejecutado = _matriz(pos_ppr[mensuales], pos_mes[mensuales],
+                        valores_ejecutados[mensuales], n)
+    programado = _matriz(pos_ppr[mensuales], pos_mes[mensuales],
+                         valores_programados[mensuales], n)
+    reportado = _matriz(pos_ppr[mensuales], pos_mes[mensuales], 1.0, n).astype(bool)
+    acumulado = _matriz(pos_ppr[acumulados], pos_mes[acumulados],
+                        valores_ejecutados[acumulados], n, np.nan)
+
+    # Último mes con avance reportado por PPR (-1 si no hay)
+    ultimo_mes = np.where(
+        reportado.any(axis=1), 11 - np.argmax(reportado[:, ::-1], axis=1), -1
+    )
+    hasta_ultimo = np.arange(12) <= ultimo_mes[:, None]
+
+    # Promedio de los meses reportados, para detectar saltos
+    meses_reportados = reportado.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        promedio = np.where(
+            meses_reportados > 0, ejecutado.sum(axis=1) / meses_reportados, 0.0
+        )
+
+    # Cambios del acumulado entre meses consecutivos con dato
+    acumulado_previo = pd.DataFrame(acumulado).ffill(axis=1).shift(1, axis=1).to_numpy()
+
+    reglas = {
+        "desviacion_programado": (
+            _desviacion(ejecutado, programado, umbral_desviacion) & reportado,
+            programado
+        ),
+        "desviacion_meta": (
+            _desviacion(ejecutado, meta_prog, umbral_desviacion) & reportado, meta_prog
+        ),
+        "salto": ((meses_reportados[:, None] > 1) & (promedio[:, None] > 0)
+                  & (ejecutado > factor_salto * promedio[:, None]) & reportado,
+                  np.broadcast_to(promedio[:, None], (n, 12))),
+        "sin_ejecucion": ((meta_prog > 0) & (ejecutado == 0) & hasta_ultimo, meta_prog),
+        "acumulado_decreciente": (
+            ~np.isnan(acumulado) & (acumulado < acumulado_previo), acumulado_previo
+        )
+    }
+
+    # Reunir todas las celdas marcadas y ordenarlas por PPR y mes
+    valores = {"acumulado_decreciente": acumulado}
+    partes = []
+    totales = {}
+    for numero_tipo, (tipo, (mascara, referencia)) in enumerate(reglas.items()):
+        filas, meses = np.nonzero(mascara)
+        totales[tipo] = len(filas)
+        partes.append((filas, meses, np.full(len(filas), numero_tipo),
+                       valores.get(tipo, ejecutado)[filas, meses],
+                       referencia[filas, meses]))
+    filas, meses, numeros_tipo, observados, esperados = (
+        np.concatenate(columna) for columna in zip(*partes)
+    )
+    orden = np.lexsort((numeros_tipo, meses, filas))
+    filas, meses, numeros_tipo = filas[orden], meses[orden], numeros_tipo[orden]
+
+    ids = pprs['id'].to_numpy()[filas].tolist()
+    codigos = pprs['codigo'].to_numpy()[filas].tolist()
+    nombres = pprs['nombre'].to_numpy()[filas].tolist()
+    tipos = list(reglas)
+    anomalias: List[Dict[str, Any]] = [
+        {
+            "ppr_id": ppr_id,
+            "codigo": codigo,
+            "nombre": nombre,
+            "mes": MESES_VALIDOS[mes],
+            "tipo": tipos[numero_tipo],
+            "valor": valor,
+            "referencia": referencia
+        }
+        for ppr_id, codigo, nombre, mes, numero_tipo, valor, referencia in zip(
+            ids, codigos, nombres, meses.tolist(), numeros_tipo.tolist(),
+            observados[orden].tolist(), esperados[orden].tolist()
+        )
+    ]
+
+    return {
+        "ano_ejecucion": ano_ejecucion,
+        "pprs_analizados": n,
+        "pprs_con_anomalias": len(np.unique(filas)),
+        "totales": totales,
+        "anomalias": anomalias
+    }
+
+
+def obtener_anomalias(db: Session, ano_ejecucion: int,
+                      umbral_desviacion: float = UMBRAL_DESVIACION,
+                      factor_salto: float = FACTOR_SALTO) -> Dict[str, Any]:
+    """
+    Obtiene el análisis de anomalías de un año desde la caché o lo ejecuta
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución
+        umbral_desviacion: Desviación relativa máxima tolerada
+        factor_salto: Múltiplo del promedio mensual que se considera salto
+
+    Returns:
+        Dict con las anomalías encontradas
+    """
+    return _cache_anomalias.obtener(
+        (ano_ejecucion, umbral_desviacion, factor_salto),
+        lambda: escanear_anomalias(db, ano_ejecucion, umbral_desviacion, factor_salto)
+    )
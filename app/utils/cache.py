@@ -0,0 +1,115 @@
+"""
+Caché en memoria invalidada por versión de datos para Monitor PPR v2
+
+La versión de datos es un contador del proceso de la API que cada escritura
+incrementa. Los procesos de importación (app.utils.jobs) comparten el mismo
+contador, de modo que cada bloque confirmado por una importación en curso
+invalida de inmediato las cachés de la API.
+
+El contador no se comparte entre varios procesos de API (uvicorn con
+--workers): una escritura atendida por un proceso no invalida las cachés
+de los demás, que pueden servir datos anteriores hasta su propia siguiente
+escritura.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Versión de los datos de negocio; cada escritura la incrementa
+_version_datos = 0
+_lock = threading.Lock()
+
+# Contador compartido con los procesos de importación (multiprocessing.Value)
+_version_compartida: Optional[Any] = None
+
+
+def usar_version_compartida(valor: Any) -> None:
+    """
+    Hace que la versión de datos se lea y escriba en un contador compartido
+
+    Se llama en el proceso de la API al crear el pool de importación y, como
+    inicializador, en cada proceso del pool.
+
+    Args:
+        valor: multiprocessing.Value entero creado por el proceso de la API
+    """
+    global _version_compartida
+    _version_compartida = valor
+
+
+def obtener_version_datos() -> int:
+    """
+    Obtiene la versión actual de los datos de negocio
+
+    Returns:
+        int: Versión de datos (compartida con las importaciones si corresponde)
+    """
+    if _version_compartida is not None:
+        return _version_compartida.value
+    return _version_datos
+
+
+def incrementar_version_datos() -> int:
+    """
+    Marca los datos como modificados, invalidando todas las cachés
+
+    Debe llamarse después de confirmar cualquier escritura sobre PPR,
+    metas, avances o CEPLAN.
+
+    Returns:
+        int: Nueva versión de datos
+    """
+    global _version_datos
+    if _version_compartida is not None:
+        with _version_compartida.get_lock():
+            _version_compartida.value += 1
+            return _version_compartida.value
+    with _lock:
+        _version_datos += 1
+        return _version_datos
+
+
+class CacheVersionada:
+    """
+    Caché de resultados por clave válida mientras no cambie la versión de datos
+
+    Los valores se guardan junto con la versión con la que se calcularon;
+    una lectura con otra versión se considera un fallo y se recalcula.
+    """
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self._entradas: Dict[Hashable, Tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor en caché para la clave o lo calcula y guarda
+
+        Args:
+            clave: Clave del valor (p. ej. el año de ejecución)
+            calcular: Función sin argumentos que calcula el valor
+
+        Returns:
+            Valor en caché o recién calculado
+        """
+        version = obtener_version_datos()
+        entrada = self._entradas.get(clave)
+        if entrada is not None and entrada[0] == version:
+            return entrada[1]
+
+        valor = calcular()
+        with self._lock:
+            # Descartar las entradas de versiones anteriores
+            if any(v != version for v, _ in self._entradas.values()):
+                self._entradas = {
+                    k: e for k, e in self._entradas.items() if e[0] == version
+                }
+            self._entradas[clave] = (version, valor)
+        return valor
+
+    def limpiar(self) -> None:
+        """
+        Elimina todas las entradas de la caché
+        """
+        with self._lock:
+            self._entradas = {}
@@ -0,0 +1,222 @@
+"""
+Exportación en streaming del reporte de progreso de PPR para Monitor PPR v2
+"""
+import csv
+import io
+import itertools
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.database.models import (
+    PPR as DBPPR, PPRMeta as DBPPRMeta, PPRProgressSummary as DBPPRProgressSummary
+)
+from app.database.session import SessionLocal
+from app.utils.helpers import MESES, calcular_avance_anual
+from app.utils.logger import log_error
+
+# Filas leídas de la base de datos por lote (cursor del lado del servidor)
+EXPORT_BATCH_SIZE = 1000
+# Tamaño de los bloques enviados al cliente
+EXPORT_CHUNK_BYTES = 64 * 1024
+# Filas máximas del reporte en Excel; los reportes más grandes se piden en CSV
+EXPORT_XLSX_MAX_FILAS = 20000
+
+COLUMNAS_REPORTE_PPR = (
+    ['codigo', 'nombre', 'unidad_medida', 'estado', 'ano_ejecucion',
+     'meta_programada_anual']
+    + [f'{mes}_{serie}' for mes in MESES for serie in ('prog', 'eje', 'porcentaje')]
+    + ['total_programado', 'total_ejecutado', 'porcentaje_anual']
+)
+
+
+def _filtrar_reporte_ppr(consulta, ano_ejecucion: Optional[int], estado: Optional[str]):
+    """
+    Aplica los filtros del reporte de progreso de PPR a una consulta
+
+    Args:
+        consulta: Consulta sobre ppr_progress_summary unida con ppr
+        ano_ejecucion: Año de ejecución (opcional)
+        estado: Estado del PPR (opcional)
+
+    Returns:
+        Consulta filtrada
+    """
+    if ano_ejecucion:
+        consulta = consulta.where(DBPPRProgressSummary.ano_ejecucion == ano_ejecucion)
+    if estado:
+        consulta = consulta.where(DBPPR.estado == estado)
+    return consulta
+
+
+def contar_filas_reporte_ppr(db: Session, ano_ejecucion: Optional[int] = None,
+                             estado: Optional[str] = None) -> int:
+    """
+    Cuenta las filas (PPR y año) que tendrá el reporte de progreso de PPR
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución (opcional)
+        estado: Estado del PPR (opcional)
+
+    Returns:
+        int: Cantidad de filas del reporte
+    """
+    resumen = DBPPRProgressSummary
+    pares = _filtrar_reporte_ppr(
+        select(resumen.ppr_id, resumen.ano_ejecucion)
+        .join(DBPPR, DBPPR.id == resumen.ppr_id)
+        .distinct(),
+        ano_ejecucion, estado
+    ).subquery()
+    return db.execute(select(func.count()).select_from(pares)).scalar()
+
+
+def iterar_reporte_ppr(db: Session, ano_ejecucion: Optional[int] = None,
+                       estado: Optional[str] = None) -> Iterator[List[Any]]:
+    """
+    Genera las filas del reporte de progreso de PPR, una por PPR y año
+
+    Las filas mensuales de ppr_progress_summary se leen con un cursor del
+    lado del servidor en lotes de EXPORT_BATCH_SIZE y se agrupan de a doce,
+    por lo que la memoria no depende de la cantidad de PPR.
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución (opcional)
+        estado: Estado del PPR (opcional)
+
+    Returns:
+        Iterador de filas en el orden de COLUMNAS_REPORTE_PPR
+    """
+    resumen = DBPPRProgressSummary
+    metas = (
+        select(
+            DBPPRMeta.ppr_id,
+            DBPPRMeta.ano_ejecucion,
+            func.sum(DBPPRMeta.meta_programada_anual).label('meta_programada_anual')
+        )
+        .group_by(DBPPRMeta.ppr_id, DBPPRMeta.ano_ejecucion)
+        .subquery()
+    )
+
+    consulta = (
+        select(
+            resumen.ppr_id, resumen.ano_ejecucion, DBPPR.codigo, DBPPR.nombre,
+            DBPPR.unidad_medida, DBPPR.estado, metas.c.meta_programada_anual,
+            resumen.mes_numero, resumen.programado, resumen.ejecutado,
+            resumen.porcentaje
+        )
+        .join(DBPPR, DBPPR.id == resumen.ppr_id)
+        .outerjoin(metas, (metas.c.ppr_id == resumen.ppr_id)
+                   & (metas.c.ano_ejecucion == resumen.ano_ejecucion))
+        .order_by(resumen.ppr_id, resumen.ano_ejecucion, resumen.mes_numero)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    consulta = _filtrar_reporte_ppr(consulta, ano_ejecucion, estado)
+
+    filas = itertools.chain.from_iterable(db.execute(consulta).partitions())
+    for _, meses in itertools.groupby(
+            filas, key=lambda fila: (fila.ppr_id, fila.ano_ejecucion)):
+        meses = list(meses)
+        primera = meses[0]
+        valores: Dict[int, Any] = {fila.mes_numero: fila for fila in meses}
+
+        mensual = []
+        datos_mensuales = {}
+        for numero, mes in enumerate(MESES, start=1):
+            fila = valores.get(numero)
+            programado = fila.programado if fila else 0.0
+            ejecutado = fila.ejecutado if fila else 0.0
+            mensual += [programado, ejecutado, fila.porcentaje if fila else 0.0]
+            datos_mensuales[mes] = {'programado': programado, 'ejecutado': ejecutado}
+
+        anual = calcular_avance_anual(datos_mensuales)
+        yield [
+            primera.codigo, primera.nombre, primera.unidad_medida, primera.estado,
+            primera.ano_ejecucion, primera.meta_programada_anual or 0.0,
+            *mensual,
+            anual['programado'], anual['ejecutado'], anual['porcentaje']
+        ]
+
+
+def generar_csv_reporte_ppr(ano_ejecucion: Optional[int] = None,
+                           estado: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Genera el reporte de progreso de PPR como CSV por bloques
+
+    Usa su propia sesión, ya que la respuesta se envía después de que
+    termina la petición.
+
+    Args:
+        ano_ejecucion: Año de ejecución (opcional)
+        estado: Estado del PPR (opcional)
+
+    Returns:
+        Iterador de bloques de bytes UTF-8 (con BOM para Excel)
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        buffer.write('﻿')
+        escritor.writerow(COLUMNAS_REPORTE_PPR)
+        # El encabezado sale de inmediato, antes de la primera consulta
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+        for fila in iterar_reporte_ppr(db, ano_ejecucion, estado):
+            escritor.writerow(fila)
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    except Exception as e:
+        log_error(e, "generar_csv_reporte_ppr")
+        raise
+    finally:
+        db.close()
+
+
+def generar_xlsx_reporte_ppr(ano_ejecucion: Optional[int] = None,
+                            estado: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Genera el reporte de progreso de PPR como Excel por bloques
+
+    El libro se escribe en modo write-only (las filas van a disco a medida
+    que se agregan) y se guarda en un archivo temporal en disco que luego se
+    envía por bloques, así que la memoria no depende del tamaño del reporte.
+    Un .xlsx es un zip que solo queda completo al guardarlo: el primer byte
+    sale cuando termina la escritura, por eso el endpoint limita este
+    formato a EXPORT_XLSX_MAX_FILAS filas y los reportes grandes van en CSV.
+
+    Args:
+        ano_ejecucion: Año de ejecución (opcional)
+        estado: Estado del PPR (opcional)
+
+    Returns:
+        Iterador de bloques de bytes del archivo .xlsx
+    """
+    db = SessionLocal()
+    try:
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet(title="Progreso PPR")
+        hoja.append(COLUMNAS_REPORTE_PPR)
+        for fila in iterar_reporte_ppr(db, ano_ejecucion, estado):
+            hoja.append(fila)
+    except Exception as e:
+        log_error(e, "generar_xlsx_reporte_ppr")
+        raise
+    finally:
+        db.close()
+
+    with tempfile.TemporaryFile() as archivo:
+        libro.save(archivo)
+        archivo.seek(0)
+        for bloque in iter(lambda: archivo.read(EXPORT_CHUNK_BYTES), b''):
+            yield bloque
@@ -1,22 +1,637 @@
 """
 Funciones de utilidad para Monitor PPR v2
 """
+import hashlib
+import os
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
-from app.database.models import CEPLAN as DBCEPLAN, PPR as DBPPR
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterator, List, Optional, Set, Tuple
+from openpyxl import load_workbook
+from app.database.models import (
+    CEPLAN as DBCEPLAN, PPR as DBPPR, PPRMeta as DBPPRMeta, PPRAvance as DBPPRAvance,
+    PPRCeplanMap as DBPPRCeplanMap, PPRProgressSummary as DBPPRProgressSummary,
+    ImportJournal as DBImportJournal
+)
+from app.database.bulk import (
+    iterar_lotes, upsert_rows, upsert_from_select, crear_tabla_staging,
+    cargar_tabla_staging, eliminar_tabla_staging
+)
+from sqlalchemy import Column, and_, bindparam, func, literal, select
 from sqlalchemy.orm import Session
-from app.utils.validators import validate_codigo_sub_producto, validate_year, validate_codigo_ppr
+from app.utils.validators import (
+    validate_year, validate_codigo_sub_producto_series, validate_codigo_ppr_series,
+    generar_reporte_errores
+)
+from app.utils.cache import incrementar_version_datos
+from app.utils.snapshots import obtener_snapshot_ceplan
 from app.utils.logger import log_error, log_info
 
+# Meses en el orden en que aparecen en los archivos y en los modelos
+MESES = ['ene', 'feb', 'mar', 'abr', 'may', 'jun',
+         'jul', 'ago', 'sep', 'oct', 'nov', 'dic']
 
-def cargar_datos_ceplan_desde_excel(file_path: str, ano_ejecucion: int, db: Session) -> Dict[str, Any]:
+# Columnas mensuales del archivo CEPLAN -> columnas de la tabla ceplans
+CEPLAN_COLUMNAS_MENSUALES = {
+    f'{prefijo}_{mes.upper()}': f'{mes}_{sufijo}'
+    for mes in MESES
+    for prefijo, sufijo in (('EJE', 'eje'), ('PROG', 'prog'))
+}
+
+CEPLAN_COLUMNAS_REQUERIDAS = (
+    ['codigo_sub_producto', 'subproducto'] + list(CEPLAN_COLUMNAS_MENSUALES)
+)
+
+# Columnas de ceplans que una importación actualiza en registros existentes
+CEPLAN_COLUMNAS_ACTUALIZABLES = (
+    ['subproducto'] + list(CEPLAN_COLUMNAS_MENSUALES.values()) + ['content_hash']
+)
+
+# Columnas numéricas de los archivos PPR (meta anual y programación mensual)
+PPR_COLUMNAS_NUMERICAS = ['meta_programada_anual'] + [f'{mes}_prog' for mes in MESES]
+
+# Columnas requeridas en los archivos PPR
+PPR_COLUMNAS_REQUERIDAS = (
+    ['codigo', 'nombre', 'descripcion', 'unidad_medida'] + PPR_COLUMNAS_NUMERICAS
+)
+
+# Tipos de dato de las columnas al leer archivos CSV/Parquet
+CEPLAN_TIPOS_COLUMNAS = {
+    'codigo_sub_producto': str, 'subproducto': str,
+    **{columna: 'float64' for columna in CEPLAN_COLUMNAS_MENSUALES}
+}
+PPR_TIPOS_COLUMNAS = {
+    'codigo': str, 'nombre': str, 'descripcion': str, 'unidad_medida': str,
+    **{columna: 'float64' for columna in PPR_COLUMNAS_NUMERICAS}
+}
+
+# Extensiones reconocidas además de Excel
+FORMATOS_CSV = ('.csv',)
+FORMATOS_PARQUET = ('.parquet', '.pq')
+
+# Filas por bloque en el modo de importación por streaming
+IMPORT_CHUNK_SIZE = 5000
+
+# Errores por fila que se conservan en el resultado de una importación
+MAX_ERRORES_REPORTE = 100
+
+# Reporte de errores por fila: [{'fila', 'campo', 'valor', 'motivo'}]
+ErroresFila = List[Dict[str, Any]]
+
+# Función de avance: (procesados, ignorados, errores por fila acumulados)
+ProgresoImportacion = Callable[[int, int, ErroresFila], None]
+
+# Resultado de escribir un bloque: (procesados, ignorados, sin cambios, errores)
+ResultadoBloque = Tuple[int, int, int, ErroresFila]
+
+# Filas normalizadas de un bloque: (filas, procesados, ignorados, errores)
+FilasPreparadas = Tuple[List[Dict[str, Any]], int, int, ErroresFila]
+
+
+def calcular_hash_archivo(file_path: str) -> str:
+    """
+    Calcula el SHA-256 de un archivo leyéndolo por bloques
+    
+    Args:
+        file_path: Ruta del archivo
+    
+    Returns:
+        str: Hash hexadecimal del contenido
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b''):
+            sha256.update(bloque)
+    return sha256.hexdigest()
+
+
+def _hash_filas(datos: pd.DataFrame) -> pd.Series:
+    """
+    Calcula la huella de contenido de cada fila de un DataFrame
+    
+    Args:
+        datos: Filas normalizadas
+    
+    Returns:
+        pd.Series: Huella hexadecimal de 16 caracteres por fila
+    """
+    return pd.util.hash_pandas_object(datos, index=False).map('{:016x}'.format)
+
+
+def _filtrar_filas_modificadas(db: Session, columna_codigo, columna_hash,
+                               filas: List[Dict[str, Any]],
+                               *filtros) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Descarta las filas cuya huella coincide con la almacenada en la base
+    
+    Args:
+        db: Sesión de base de datos
+        columna_codigo: Columna del modelo que identifica la fila
+        columna_hash: Columna del modelo con la huella almacenada
+        filas: Filas normalizadas con la clave content_hash
+        *filtros: Condiciones adicionales para la consulta (p. ej. año)
+    
+    Returns:
+        Tuple con las filas nuevas o modificadas y la cantidad de filas sin cambios
+    """
+    codigos = [fila[columna_codigo.key] for fila in filas]
+    existentes = {}
+    for inicio in range(0, len(codigos), 1000):
+        existentes.update(
+            db.query(columna_codigo, columna_hash)
+            .filter(columna_codigo.in_(codigos[inicio:inicio + 1000]), *filtros)
+            .all()
+        )
+    
+    modificadas = [
+        fila for fila in filas
+        if existentes.get(fila[columna_codigo.key]) != fila['content_hash']
+    ]
+    return modificadas, len(filas) - len(modificadas)
+
+
+def _buscar_importacion_previa(db: Session, tipo: str, ano_ejecucion: int,
+                               file_hash: str) -> Optional[DBImportJournal]:
+    """
+    Busca la última importación completada si corresponde al mismo archivo
+    
+    Solo se compara con la importación completada más reciente del año: si
+    después se importó otro archivo, volver a importar el anterior debe
+    restaurar sus valores.
+    
+    Args:
+        db: Sesión de base de datos
+        tipo: Tipo de importación (ceplan, ppr)
+        ano_ejecucion: Año de ejecución
+        file_hash: Hash del archivo
+    
+    Returns:
+        Registro del diario de importaciones o None
+    """
+    ultima = db.query(DBImportJournal).filter(
+        DBImportJournal.tipo == tipo,
+        DBImportJournal.ano_ejecucion == ano_ejecucion,
+        DBImportJournal.estado == "completado"
+    ).order_by(DBImportJournal.id.desc()).first()
+    if ultima is not None and ultima.file_hash == file_hash:
+        return ultima
+    return None
+
+
+def _buscar_punto_control(db: Session, tipo: str, ano_ejecucion: int,
+                          file_hash: str) -> Optional[DBImportJournal]:
+    """
+    Busca una importación interrumpida del mismo archivo para el mismo año
+    
+    Args:
+        db: Sesión de base de datos
+        tipo: Tipo de importación (ceplan, ppr)
+        ano_ejecucion: Año de ejecución
+        file_hash: Hash del archivo
+    
+    Returns:
+        Registro del diario con el último punto de control o None
+    """
+    return db.query(DBImportJournal).filter(
+        DBImportJournal.tipo == tipo,
+        DBImportJournal.ano_ejecucion == ano_ejecucion,
+        DBImportJournal.file_hash == file_hash,
+        DBImportJournal.estado == "en_proceso"
+    ).order_by(DBImportJournal.id.desc()).first()
+
+
+def _importar_archivo(db: Session, tipo: str, file_path: str, ano_ejecucion: int,
+                      columnas_requeridas: List[str], tipos_columnas: Dict[str, Any],
+                      escribir_bloque: Callable[[pd.DataFrame, Any], ResultadoBloque],
+                      crear_staging: Optional[Callable[[Session], Any]],
+                      chunk_size: Optional[int],
+                      progress_callback: Optional[ProgresoImportacion], force: bool,
+                      commit_every: Optional[int]) -> Dict[str, Any]:
+    """
+    Recorre un archivo de importación por bloques y registra el resultado en el diario
+    
+    Con ``commit_every`` cada bloque de ese tamaño se confirma en su propia
+    transacción junto con un punto de control (hash del archivo y última
+    fila confirmada). Si la importación se interrumpe, volver a importar el
+    mismo archivo continúa desde el punto de control.
+    
+    Args:
+        db: Sesión de base de datos
+        tipo: Tipo de importación (ceplan, ppr)
+        file_path: Ruta del archivo
+        ano_ejecucion: Año de ejecución
+        columnas_requeridas: Columnas que debe tener el archivo
+        tipos_columnas: Columnas esperadas y su tipo de dato
+        escribir_bloque: Función que escribe un bloque (DataFrame, staging) y
+            devuelve los registros procesados, ignorados y sin cambios y los
+            errores por fila del bloque
+        crear_staging: Función que crea la tabla de staging o None
+        chunk_size: Filas por bloque; None para leer el archivo completo
+        progress_callback: Función llamada después de cada bloque con los
+            totales acumulados de registros procesados e ignorados y los
+            errores por fila acumulados (hasta MAX_ERRORES_REPORTE)
+        force: Si es True, no se omiten archivos ya importados
+        commit_every: Filas por transacción; None para confirmar al final
+    
+    Returns:
+        Dict con los totales de la importación
+    """
+    # Omitir archivos idénticos a la última importación completada
+    file_hash = calcular_hash_archivo(file_path)
+    previa = _buscar_importacion_previa(db, tipo, ano_ejecucion, file_hash)
+    if previa and not force:
+        log_info(
+            f"Archivo {tipo.upper()} sin cambios desde la importación {previa.id}, "
+            "se omite"
+        )
+        return {
+            "success": True,
+            "processed": previa.processed,
+            "ignored": previa.ignored,
+            "unchanged": previa.processed,
+            "errors": [],
+            "skipped": True
+        }
+    
+    diario = None
+    fila_inicio = 0
+    if commit_every:
+        chunk_size = commit_every
+        diario = _buscar_punto_control(db, tipo, ano_ejecucion, file_hash)
+        if diario is not None:
+            fila_inicio = diario.last_row
+            log_info(
+                f"Reanudando importación {tipo.upper()} {diario.id} "
+                f"desde la fila {fila_inicio}"
+            )
+    
+    totales = {
+        "processed": diario.processed if diario is not None else 0,
+        "ignored": diario.ignored if diario is not None else 0,
+        "unchanged": diario.unchanged if diario is not None else 0,
+        "errors": []
+    }
+    
+    bloques = _leer_bloques(file_path, chunk_size, tipos_columnas)
+    for numero_bloque, df in enumerate(bloques):
+        # Verificar columnas requeridas
+        if numero_bloque == 0:
+            missing_columns = [
+                col for col in columnas_requeridas if col not in df.columns
+            ]
+            if missing_columns:
+                return {
+                    "success": False, "error": f"Columnas faltantes: {missing_columns}"
+                }
+            if commit_every and diario is None:
+                diario = DBImportJournal(
+                    tipo=tipo, ano_ejecucion=ano_ejecucion, file_hash=file_hash,
+                    estado="en_proceso", last_row=0, processed=0, ignored=0,
+                    unchanged=0
+                )
+                db.add(diario)
+                db.commit()
+        
+        # Saltar las filas confirmadas antes de la interrupción
+        if fila_inicio:
+            df = df[df.index >= fila_inicio]
+            if df.empty:
+                continue
+        
+        # La tabla de staging vive por bloque: confirmar devuelve la conexión al pool
+        staging = crear_staging(db) if crear_staging else None
+        procesados, ignorados, sin_cambios, errores = escribir_bloque(df, staging)
+        if staging is not None:
+            eliminar_tabla_staging(db, staging)
+        
+        totales["processed"] += procesados
+        totales["ignored"] += ignorados
+        totales["unchanged"] += sin_cambios
+        totales["errors"].extend(errores[:MAX_ERRORES_REPORTE - len(totales["errors"])])
+        
+        if diario is not None:
+            diario.last_row = int(df.index[-1]) + 1 if len(df) else diario.last_row
+            diario.processed = totales["processed"]
+            diario.ignored = totales["ignored"]
+            diario.unchanged = totales["unchanged"]
+            db.commit()
+            incrementar_version_datos()
+        
+        if progress_callback:
+            errores_acumulados = list(totales["errors"])
+            progress_callback(
+                totales["processed"], totales["ignored"], errores_acumulados
+            )
+    
+    if diario is None:
+        diario = DBImportJournal(
+            tipo=tipo, ano_ejecucion=ano_ejecucion, file_hash=file_hash
+        )
+        db.add(diario)
+    diario.estado = "completado"
+    diario.processed = totales["processed"]
+    diario.ignored = totales["ignored"]
+    diario.unchanged = totales["unchanged"]
+    
+    # Confirmar cambios en la base de datos
+    db.commit()
+    incrementar_version_datos()
+    
+    return {"success": True, **totales, "skipped": False}
+
+
+def _preparar_datos_ceplan(df: pd.DataFrame, ano_ejecucion: int) -> FilasPreparadas:
     """
-    Carga datos de CEPLAN desde un archivo Excel
+    Normaliza y valida un DataFrame CEPLAN con operaciones por columna
+    
+    Args:
+        df: DataFrame leído del archivo con las columnas requeridas
+        ano_ejecucion: Año de ejecución
+    
+    Returns:
+        Tuple con las filas listas para la base de datos, la cantidad de
+        registros procesados, la cantidad de registros ignorados y el
+        reporte de errores de las filas ignoradas
+    """
+    # Validar códigos de subproducto en una sola operación
+    codigos = df['codigo_sub_producto'].astype(str).str.strip()
+    validos, motivos = validate_codigo_sub_producto_series(codigos)
+    
+    registros_ignorados = int((~validos).sum())
+    errores = []
+    if registros_ignorados:
+        errores = generar_reporte_errores(
+            codigos, validos, motivos, 'codigo_sub_producto'
+        )
+        log_info(
+            f"Códigos de subproducto no válidos en {registros_ignorados} filas: "
+            f"{errores[:20]}"
+        )
+    
+    df = df[validos]
+    
+    # Convertir columnas mensuales a float, reemplazando vacíos por 0.0
+    datos = df[list(CEPLAN_COLUMNAS_MENSUALES)].apply(pd.to_numeric)
+    datos = datos.fillna(0.0).astype(float)
+    datos = datos.rename(columns=CEPLAN_COLUMNAS_MENSUALES)
+    datos.insert(0, 'codigo_sub_producto', codigos[validos])
+    subproductos = df['subproducto'].astype(object)
+    datos.insert(1, 'subproducto', subproductos.where(df['subproducto'].notna(), None))
+    datos.insert(2, 'ano_ejecucion', ano_ejecucion)
+    
+    registros_procesados = len(datos)
+    
+    # Si un código se repite en el archivo prevalece la última fila
+    datos = datos.drop_duplicates(subset='codigo_sub_producto', keep='last')
+    datos['content_hash'] = _hash_filas(datos)
+    
+    return datos.to_dict('records'), registros_procesados, registros_ignorados, errores
+
+
+def leer_excel_por_bloques(
+        file_path: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lee la primera hoja de un archivo Excel en bloques de filas
+    
+    Usa openpyxl en modo de solo lectura, por lo que solo se mantiene en
+    memoria el bloque actual sin importar el tamaño del archivo. Siempre
+    se genera al menos un bloque (posiblemente vacío) con los encabezados.
     
     Args:
         file_path: Ruta del archivo Excel
+        chunk_size: Cantidad de filas por bloque
+    
+    Returns:
+        Iterador de DataFrames cuyo índice es el número de fila de datos
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        filas = workbook.active.iter_rows(values_only=True)
+        encabezado = next(filas, None) or ()
+        columnas = [
+            str(col).strip() if col is not None else f'Unnamed: {i}'
+            for i, col in enumerate(encabezado)
+        ]
+        
+        inicio = 0
+        bloque = []
+        generado = False
+        for fila in filas:
+            # Ignorar filas completamente vacías, igual que pd.read_excel
+            if all(valor is None for valor in fila):
+                continue
+            faltantes = (None,) * (len(columnas) - len(fila))
+            bloque.append(tuple(fila[:len(columnas)]) + faltantes)
+            if len(bloque) == chunk_size:
+                indice = range(inicio, inicio + len(bloque))
+                yield pd.DataFrame(bloque, columns=columnas, index=indice)
+                generado = True
+                inicio += len(bloque)
+                bloque = []
+        
+        if bloque or not generado:
+            indice = range(inicio, inicio + len(bloque))
+            yield pd.DataFrame(bloque, columns=columnas, index=indice)
+    finally:
+        workbook.close()
+
+
+def detectar_formato(file_path: str) -> str:
+    """
+    Detecta el formato de un archivo de importación por su extensión
+    
+    Args:
+        file_path: Ruta del archivo
+    
+    Returns:
+        str: 'csv', 'parquet' o 'excel'
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in FORMATOS_CSV:
+        return 'csv'
+    if extension in FORMATOS_PARQUET:
+        return 'parquet'
+    return 'excel'
+
+
+def _leer_csv_por_bloques(
+        file_path: str, chunk_size: Optional[int],
+        tipos: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo CSV cargando solo las columnas conocidas y con tipos fijos
+    
+    Args:
+        file_path: Ruta del archivo CSV
+        chunk_size: Filas por bloque; None para leer el archivo completo
+        tipos: Columnas esperadas y su tipo de dato
+    
+    Returns:
+        Iterador de DataFrames
+    """
+    encabezado = pd.read_csv(file_path, nrows=0).columns
+    usecols = [columna for columna in tipos if columna in encabezado]
+    dtype = {columna: tipos[columna] for columna in usecols}
+    
+    if not chunk_size:
+        yield pd.read_csv(file_path, usecols=usecols, dtype=dtype)
+        return
+    
+    generado = False
+    with pd.read_csv(file_path, usecols=usecols, dtype=dtype,
+                     chunksize=chunk_size) as lector:
+        for bloque in lector:
+            generado = True
+            yield bloque
+    if not generado:
+        yield pd.DataFrame(columns=usecols)
+
+
+def _leer_parquet_por_bloques(
+        file_path: str, chunk_size: Optional[int],
+        tipos: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo Parquet cargando solo las columnas conocidas
+    
+    Args:
+        file_path: Ruta del archivo Parquet
+        chunk_size: Filas por bloque; None para leer el archivo completo
+        tipos: Columnas esperadas y su tipo de dato
+    
+    Returns:
+        Iterador de DataFrames
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(
+            "Se requiere el paquete pyarrow para importar archivos Parquet"
+        )
+    
+    archivo = pq.ParquetFile(file_path)
+    columnas = [columna for columna in tipos if columna in archivo.schema_arrow.names]
+    
+    if not chunk_size:
+        yield archivo.read(columns=columnas).to_pandas()
+        return
+    
+    inicio = 0
+    for lote in archivo.iter_batches(batch_size=chunk_size, columns=columnas):
+        bloque = lote.to_pandas()
+        bloque.index = range(inicio, inicio + len(bloque))
+        inicio += len(bloque)
+        yield bloque
+    if inicio == 0:
+        yield pd.DataFrame(columns=columnas)
+
+
+def _leer_bloques(
+        file_path: str, chunk_size: Optional[int],
+        tipos: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo completo o por bloques según su formato y el modo de importación
+    
+    Args:
+        file_path: Ruta del archivo (Excel, CSV o Parquet)
+        chunk_size: Filas por bloque; None para leer el archivo completo
+        tipos: Columnas esperadas y su tipo de dato (usado en CSV y Parquet)
+    
+    Returns:
+        Iterador de DataFrames
+    """
+    formato = detectar_formato(file_path)
+    if formato == 'csv':
+        yield from _leer_csv_por_bloques(file_path, chunk_size, tipos)
+    elif formato == 'parquet':
+        yield from _leer_parquet_por_bloques(file_path, chunk_size, tipos)
+    elif chunk_size:
+        yield from leer_excel_por_bloques(file_path, chunk_size)
+    else:
+        yield pd.read_excel(file_path)
+
+
+def _columnas_staging(tabla, nombres: List[str]) -> List[Column]:
+    """
+    Copia la definición de columnas de una tabla para una tabla de staging
+    
+    Args:
+        tabla: Tabla de origen
+        nombres: Nombres de las columnas a copiar
+    
+    Returns:
+        Lista de columnas sin restricciones
+    """
+    return [Column(nombre, tabla.c[nombre].type) for nombre in nombres]
+
+
+def _crear_staging_ceplan(db: Session):
+    """
+    Crea la tabla temporal de staging para importaciones CEPLAN
+    
+    Args:
+        db: Sesión de base de datos
+    
+    Returns:
+        Table: Tabla temporal creada
+    """
+    columnas = ['codigo_sub_producto', 'ano_ejecucion'] + CEPLAN_COLUMNAS_ACTUALIZABLES
+    return crear_tabla_staging(
+        db, 'tmp_import_ceplans', _columnas_staging(DBCEPLAN.__table__, columnas)
+    )
+
+
+def _merge_ceplan_staging(db: Session, staging, filas: List[Dict[str, Any]]) -> None:
+    """
+    Carga un bloque en staging y lo concilia con ceplans en una sola sentencia
+    
+    Args:
+        db: Sesión de base de datos
+        staging: Tabla temporal de staging CEPLAN
+        filas: Filas normalizadas del bloque
+    """
+    cargar_tabla_staging(db, staging, filas)
+    
+    ahora = datetime.utcnow()
+    columnas = list(staging.c.keys())
+    upsert_from_select(
+        db,
+        DBCEPLAN.__table__,
+        columnas + ['created_at', 'updated_at'],
+        select(*staging.c, literal(ahora), literal(ahora)),
+        key_columns=['codigo_sub_producto', 'ano_ejecucion'],
+        update_columns=CEPLAN_COLUMNAS_ACTUALIZABLES
+    )
+
+
+def cargar_datos_ceplan_desde_excel(
+        file_path: str, ano_ejecucion: int, db: Session,
+        chunk_size: Optional[int] = None, use_staging: bool = False,
+        progress_callback: Optional[ProgresoImportacion] = None,
+        force: bool = False, commit_every: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Carga datos de CEPLAN desde un archivo Excel, CSV o Parquet
+    
+    La validación y conversión de datos se realiza por columnas y la
+    escritura como un upsert masivo sobre la clave (codigo_sub_producto,
+    ano_ejecucion), sin consultas ni objetos ORM por fila.
+    
+    La importación es incremental: un archivo idéntico al de la última
+    importación del mismo año se omite, y de un archivo modificado solo se
+    escriben las filas cuya huella de contenido cambió.
+    
+    Args:
+        file_path: Ruta del archivo; el formato se detecta por la extensión
         ano_ejecucion: Año de ejecución
         db: Sesión de base de datos
+        chunk_size: Si se indica, el archivo se lee y procesa en bloques de
+            este tamaño (modo streaming con memoria acotada)
+        use_staging: Si es True, cada bloque se carga en una tabla temporal
+            y se concilia con ceplans mediante INSERT ... SELECT
+        progress_callback: Función llamada después de cada bloque con los
+            totales acumulados de registros procesados e ignorados y los
+            errores por fila acumulados ({'fila', 'campo', 'valor', 'motivo'})
+        force: Si es True, se escriben todas las filas aunque no hayan cambiado
+        commit_every: Si se indica, se confirma una transacción cada este
+            número de filas con un punto de control para reanudar la importación
     
     Returns:
         Dict con resultados de la operación
@@ -26,114 +641,56 @@ def cargar_datos_ceplan_desde_excel(file_path: str, ano_ejecucion: int, db: Sess
         if not validate_year(ano_ejecucion):
             return {"success": False, "error": "Año de ejecución no válido"}
         
-        # Leer archivo Excel
-        df = pd.read_excel(file_path)
-        
-        # Verificar columnas requeridas
-        required_columns = [
-            'codigo_sub_producto', 'subproducto', 
-            'EJE_ENE', 'PROG_ENE', 'EJE_FEB', 'PROG_FEB',
-            'EJE_MAR', 'PROG_MAR', 'EJE_ABR', 'PROG_ABR',
-            'EJE_MAY', 'PROG_MAY', 'EJE_JUN', 'PROG_JUN',
-            'EJE_JUL', 'PROG_JUL', 'EJE_AGO', 'PROG_AGO',
-            'EJE_SEP', 'PROG_SEP', 'EJE_OCT', 'PROG_OCT',
-            'EJE_NOV', 'PROG_NOV', 'EJE_DIC', 'PROG_DIC'
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            return {"success": False, "error": f"Columnas faltantes: {missing_columns}"}
-        
-        registros_procesados = 0
-        registros_ignorados = 0
-        
-        for index, row in df.iterrows():
-            # Validar código de subproducto
-            codigo_sub_producto = str(row['codigo_sub_producto']).strip()
-            if not validate_codigo_sub_producto(codigo_sub_producto):
-                log_info(f"Código de subproducto no válido: {codigo_sub_producto} en fila {index}")
-                registros_ignorados += 1
-                continue
+        def escribir_bloque(df: pd.DataFrame, staging) -> ResultadoBloque:
+            filas, procesados, ignorados, errores = _preparar_datos_ceplan(
+                df, ano_ejecucion
+            )
             
-            # Verificar si ya existe un registro con el mismo código y año
-            existing_record = db.query(DBCEPLAN).filter(
-                DBCEPLAN.codigo_sub_producto == codigo_sub_producto,
-                DBCEPLAN.ano_ejecucion == ano_ejecucion
-            ).first()
+            sin_cambios = 0
+            if not force:
+                filas, sin_cambios = _filtrar_filas_modificadas(
+                    db, DBCEPLAN.codigo_sub_producto, DBCEPLAN.content_hash, filas,
+                    DBCEPLAN.ano_ejecucion == ano_ejecucion
+                )
             
-            if existing_record:
-                # Actualizar registro existente
-                existing_record.subproducto = row['subproducto']
-                existing_record.ene_eje = float(row['EJE_ENE']) if pd.notna(row['EJE_ENE']) else 0.0
-                existing_record.ene_prog = float(row['PROG_ENE']) if pd.notna(row['PROG_ENE']) else 0.0
-                existing_record.feb_eje = float(row['EJE_FEB']) if pd.notna(row['EJE_FEB']) else 0.0
-                existing_record.feb_prog = float(row['PROG_FEB']) if pd.notna(row['PROG_FEB']) else 0.0
-                existing_record.mar_eje = float(row['EJE_MAR']) if pd.notna(row['EJE_MAR']) else 0.0
-                existing_record.mar_prog = float(row['PROG_MAR']) if pd.notna(row['PROG_MAR']) else 0.0
-                existing_record.abr_eje = float(row['EJE_ABR']) if pd.notna(row['EJE_ABR']) else 0.0
-                existing_record.abr_prog = float(row['PROG_ABR']) if pd.notna(row['PROG_ABR']) else 0.0
-                existing_record.may_eje = float(row['EJE_MAY']) if pd.notna(row['EJE_MAY']) else 0.0
-                existing_record.may_prog = float(row['PROG_MAY']) if pd.notna(row['PROG_MAY']) else 0.0
-                existing_record.jun_eje = float(row['EJE_JUN']) if pd.notna(row['EJE_JUN']) else 0.0
-                existing_record.jun_prog = float(row['PROG_JUN']) if pd.notna(row['PROG_JUN']) else 0.0
-                existing_record.jul_eje = float(row['EJE_JUL']) if pd.notna(row['EJE_JUL']) else 0.0
-                existing_record.jul_prog = float(row['PROG_JUL']) if pd.notna(row['PROG_JUL']) else 0.0
-                existing_record.ago_eje = float(row['EJE_AGO']) if pd.notna(row['EJE_AGO']) else 0.0
-                existing_record.ago_prog = float(row['PROG_AGO']) if pd.notna(row['PROG_AGO']) else 0.0
-                existing_record.sep_eje = float(row['EJE_SEP']) if pd.notna(row['EJE_SEP']) else 0.0
-                existing_record.sep_prog = float(row['PROG_SEP']) if pd.notna(row['PROG_SEP']) else 0.0
-                existing_record.oct_eje = float(row['EJE_OCT']) if pd.notna(row['EJE_OCT']) else 0.0
-                existing_record.oct_prog = float(row['PROG_OCT']) if pd.notna(row['PROG_OCT']) else 0.0
-                existing_record.nov_eje = float(row['EJE_NOV']) if pd.notna(row['EJE_NOV']) else 0.0
-                existing_record.nov_prog = float(row['PROG_NOV']) if pd.notna(row['PROG_NOV']) else 0.0
-                existing_record.dic_eje = float(row['EJE_DIC']) if pd.notna(row['EJE_DIC']) else 0.0
-                existing_record.dic_prog = float(row['PROG_DIC']) if pd.notna(row['PROG_DIC']) else 0.0
+            if staging is not None:
+                _merge_ceplan_staging(db, staging, filas)
             else:
-                # Crear nuevo registro
-                nuevo_registro = DBCEPLAN(
-                    codigo_sub_producto=codigo_sub_producto,
-                    subproducto=row['subproducto'],
-                    ano_ejecucion=ano_ejecucion,
-                    ene_eje=float(row['EJE_ENE']) if pd.notna(row['EJE_ENE']) else 0.0,
-                    ene_prog=float(row['PROG_ENE']) if pd.notna(row['PROG_ENE']) else 0.0,
-                    feb_eje=float(row['EJE_FEB']) if pd.notna(row['EJE_FEB']) else 0.0,
-                    feb_prog=float(row['PROG_FEB']) if pd.notna(row['PROG_FEB']) else 0.0,
-                    mar_eje=float(row['EJE_MAR']) if pd.notna(row['EJE_MAR']) else 0.0,
-                    mar_prog=float(row['PROG_MAR']) if pd.notna(row['PROG_MAR']) else 0.0,
-                    abr_eje=float(row['EJE_ABR']) if pd.notna(row['EJE_ABR']) else 0.0,
-                    abr_prog=float(row['PROG_ABR']) if pd.notna(row['PROG_ABR']) else 0.0,
-                    may_eje=float(row['EJE_MAY']) if pd.notna(row['EJE_MAY']) else 0.0,
-                    may_prog=float(row['PROG_MAY']) if pd.notna(row['PROG_MAY']) else 0.0,
-                    jun_eje=float(row['EJE_JUN']) if pd.notna(row['EJE_JUN']) else 0.0,
-                    jun_prog=float(row['PROG_JUN']) if pd.notna(row['PROG_JUN']) else 0.0,
-                    jul_eje=float(row['EJE_JUL']) if pd.notna(row['EJE_JUL']) else 0.0,
-                    jul_prog=float(row['PROG_JUL']) if pd.notna(row['PROG_JUL']) else 0.0,
-                    ago_eje=float(row['EJE_AGO']) if pd.notna(row['EJE_AGO']) else 0.0,
-                    ago_prog=float(row['PROG_AGO']) if pd.notna(row['PROG_AGO']) else 0.0,
-                    sep_eje=float(row['EJE_SEP']) if pd.notna(row['EJE_SEP']) else 0.0,
-                    sep_prog=float(row['PROG_SEP']) if pd.notna(row['PROG_SEP']) else 0.0,
-                    oct_eje=float(row['EJE_OCT']) if pd.notna(row['EJE_OCT']) else 0.0,
-                    oct_prog=float(row['PROG_OCT']) if pd.notna(row['PROG_OCT']) else 0.0,
-                    nov_eje=float(row['EJE_NOV']) if pd.notna(row['EJE_NOV']) else 0.0,
-                    nov_prog=float(row['PROG_NOV']) if pd.notna(row['PROG_NOV']) else 0.0,
-                    dic_eje=float(row['EJE_DIC']) if pd.notna(row['EJE_DIC']) else 0.0,
-                    dic_prog=float(row['PROG_DIC']) if pd.notna(row['PROG_DIC']) else 0.0
+                upsert_rows(
+                    db,
+                    DBCEPLAN.__table__,
+                    filas,
+                    key_columns=['codigo_sub_producto', 'ano_ejecucion'],
+                    update_columns=CEPLAN_COLUMNAS_ACTUALIZABLES
                 )
-                db.add(nuevo_registro)
-            
-            registros_procesados += 1
+            return procesados, ignorados, sin_cambios, errores
         
-        # Confirmar cambios en la base de datos
-        db.commit()
+        resultado = _importar_archivo(
+            db, "ceplan", file_path, ano_ejecucion,
+            CEPLAN_COLUMNAS_REQUERIDAS, CEPLAN_TIPOS_COLUMNAS,
+            escribir_bloque, _crear_staging_ceplan if use_staging else None,
+            chunk_size, progress_callback, force, commit_every
+        )
+        if not resultado["success"]:
+            return resultado
         
-        log_info(f"Archivo CEPLAN procesado. Procesados: {registros_procesados}, Ignorados: {registros_ignorados}")
+        if resultado["skipped"]:
+            resultado["message"] = (
+                "Archivo sin cambios respecto a una importación anterior. "
+                "No se realizaron cambios."
+            )
+            return resultado
         
-        return {
-            "success": True,
-            "message": f"Archivo procesado exitosamente. {registros_procesados} registros procesados, {registros_ignorados} ignorados.",
-            "processed": registros_procesados,
-            "ignored": registros_ignorados
-        }
+        log_info(
+            f"Archivo CEPLAN procesado. Procesados: {resultado['processed']}, "
+            f"Ignorados: {resultado['ignored']}, Sin cambios: {resultado['unchanged']}"
+        )
+        
+        resultado["message"] = (
+            f"Archivo procesado exitosamente. {resultado['processed']} registros "
+            f"procesados, {resultado['ignored']} ignorados."
+        )
+        return resultado
     
     except Exception as e:
         log_error(e, "cargar_datos_ceplan_desde_excel")
@@ -141,15 +698,291 @@ def cargar_datos_ceplan_desde_excel(file_path: str, ano_ejecucion: int, db: Sess
         return {"success": False, "error": str(e)}
 
 
-def cargar_datos_ppr_desde_excel(file_path: str, ano_ejecucion: int, responsable_planificacion_id: int, db: Session) -> Dict[str, Any]:
+def _preparar_datos_ppr(df: pd.DataFrame, ano_ejecucion: int) -> FilasPreparadas:
     """
-    Carga datos de PPR desde un archivo Excel
+    Normaliza y valida un DataFrame PPR con operaciones por columna
     
     Args:
-        file_path: Ruta del archivo Excel
+        df: DataFrame leído del archivo con las columnas requeridas
+        ano_ejecucion: Año de ejecución de la importación
+    
+    Returns:
+        Tuple con las filas normalizadas (datos del PPR y de su meta), la
+        cantidad de registros procesados, la cantidad de registros
+        ignorados y el reporte de errores de las filas ignoradas
+    """
+    codigos = df['codigo'].astype(str).str.strip()
+    validos, motivos = validate_codigo_ppr_series(codigos)
+    
+    registros_ignorados = int((~validos).sum())
+    errores = []
+    if registros_ignorados:
+        errores = generar_reporte_errores(codigos, validos, motivos, 'codigo')
+        log_info(
+            f"Códigos de PPR no válidos en {registros_ignorados} filas: {errores[:20]}"
+        )
+    
+    df = df[validos]
+    
+    datos = df[PPR_COLUMNAS_NUMERICAS].apply(pd.to_numeric).fillna(0.0).astype(float)
+    textos = ['codigo', 'nombre', 'descripcion', 'unidad_medida']
+    for posicion, columna in enumerate(textos):
+        if columna == 'codigo':
+            valores = codigos[validos]
+        else:
+            valores = df[columna].astype(object)
+        datos.insert(posicion, columna, valores.where(valores.notna(), None))
+    
+    registros_procesados = len(datos)
+    datos = datos.drop_duplicates(subset='codigo', keep='last')
+    # El PPR guarda una sola huella: incluir el año hace que las mismas filas
+    # importadas para otro año se escriban y creen la meta de ese año
+    datos['content_hash'] = _hash_filas(datos.assign(ano_ejecucion=ano_ejecucion))
+    
+    return datos.to_dict('records'), registros_procesados, registros_ignorados, errores
+
+
+def _crear_staging_ppr(db: Session):
+    """
+    Crea la tabla temporal de staging para importaciones PPR
+    
+    Args:
+        db: Sesión de base de datos
+    
+    Returns:
+        Table: Tabla temporal creada
+    """
+    columnas = (
+        _columnas_staging(
+            DBPPR.__table__,
+            ['codigo', 'nombre', 'descripcion', 'unidad_medida', 'content_hash']
+        )
+        + _columnas_staging(DBPPRMeta.__table__, PPR_COLUMNAS_NUMERICAS)
+    )
+    return crear_tabla_staging(db, 'tmp_import_pprs', columnas)
+
+
+def _merge_ppr_staging(db: Session, staging, filas: List[Dict[str, Any]],
+                       ano_ejecucion: int, responsable_planificacion_id: int) -> None:
+    """
+    Carga un bloque en staging y lo concilia con pprs y ppr_metas
+    
+    Se hace upsert de los PPR y se crean las metas del año de los PPR que
+    aún no la tienen con un INSERT ... SELECT, de modo que el costo es un
+    puñado de sentencias por bloque sin importar su tamaño.
+    
+    Args:
+        db: Sesión de base de datos
+        staging: Tabla temporal de staging PPR
+        filas: Filas normalizadas del bloque
+        ano_ejecucion: Año de ejecución
+        responsable_planificacion_id: ID del responsable de planificación
+    """
+    cargar_tabla_staging(db, staging, filas)
+    
+    pprs = DBPPR.__table__
+    metas = DBPPRMeta.__table__
+    ahora = datetime.utcnow()
+    
+    # Crear o actualizar los PPR (el responsable no se modifica en existentes)
+    upsert_from_select(
+        db,
+        pprs,
+        ['codigo', 'nombre', 'descripcion', 'unidad_medida', 'content_hash',
+         'responsable_planificacion_id', 'estado', 'ano_ejecucion', 'created_at',
+         'updated_at'],
+        select(
+            staging.c.codigo, staging.c.nombre, staging.c.descripcion,
+            staging.c.unidad_medida, staging.c.content_hash,
+            literal(responsable_planificacion_id), literal('activo'),
+            literal(ano_ejecucion), literal(ahora), literal(ahora)
+        ),
+        key_columns=['codigo'],
+        update_columns=['nombre', 'descripcion', 'unidad_medida', 'content_hash']
+    )
+    
+    # Crear las metas del año de los PPR nuevos y de los existentes que aún
+    # no la tienen (el mismo archivo importado para otro año)
+    db.execute(
+        metas.insert().from_select(
+            ['ppr_id', 'ano_ejecucion', 'descripcion'] + PPR_COLUMNAS_NUMERICAS
+            + ['created_at', 'updated_at'],
+            select(
+                pprs.c.id, literal(ano_ejecucion),
+                literal('Meta anual para ') + staging.c.nombre,
+                *[staging.c[columna] for columna in PPR_COLUMNAS_NUMERICAS],
+                literal(ahora), literal(ahora)
+            )
+            .select_from(
+                staging.join(pprs, pprs.c.codigo == staging.c.codigo).outerjoin(
+                    metas, and_(metas.c.ppr_id == pprs.c.id,
+                                metas.c.ano_ejecucion == ano_ejecucion)
+                )
+            )
+            .where(metas.c.id.is_(None))
+        )
+    )
+
+
+def _escribir_filas_ppr(filas: List[Dict[str, Any]], ano_ejecucion: int,
+                        responsable_planificacion_id: int, db: Session) -> None:
+    """
+    Escribe filas PPR normalizadas con sentencias masivas
+    
+    Los PPR existentes se identifican con una consulta por lote de códigos;
+    los nuevos se insertan en una sola sentencia multi-fila y los existentes
+    se actualizan con un único executemany. Luego se resuelven los IDs por
+    código y se insertan juntas las metas del año de los PPR que no la tienen.
+    
+    Args:
+        filas: Filas normalizadas (datos del PPR y de su meta)
+        ano_ejecucion: Año de ejecución
+        responsable_planificacion_id: ID del responsable de planificación
+        db: Sesión de base de datos
+    """
+    if not filas:
+        return
+    
+    pprs = DBPPR.__table__
+    metas = DBPPRMeta.__table__
+    ahora = datetime.utcnow()
+    
+    existentes = _ids_ppr_por_codigo(db, [fila['codigo'] for fila in filas])
+    nuevas = [fila for fila in filas if fila['codigo'] not in existentes]
+    actualizadas = [fila for fila in filas if fila['codigo'] in existentes]
+    
+    if nuevas:
+        # Crear los PPR nuevos en una sola sentencia por lote
+        for lote in iterar_lotes(nuevas):
+            db.execute(pprs.insert(), [
+                {
+                    'codigo': fila['codigo'],
+                    'nombre': fila['nombre'],
+                    'descripcion': fila['descripcion'],
+                    'unidad_medida': fila['unidad_medida'],
+                    'responsable_planificacion_id': responsable_planificacion_id,
+                    'estado': "activo",
+                    'ano_ejecucion': ano_ejecucion,
+                    'content_hash': fila['content_hash'],
+                    'created_at': ahora,
+                    'updated_at': ahora
+                }
+                for fila in lote
+            ])
+    
+    if actualizadas:
+        # Actualizar los PPR existentes (el responsable de planificación no se modifica)
+        actualizar = pprs.update().where(pprs.c.id == bindparam('b_id')).values(
+            nombre=bindparam('b_nombre'),
+            descripcion=bindparam('b_descripcion'),
+            unidad_medida=bindparam('b_unidad_medida'),
+            content_hash=bindparam('b_content_hash'),
+            updated_at=ahora
+        )
+        for lote in iterar_lotes(actualizadas):
+            db.execute(actualizar, [
+                {
+                    'b_id': existentes[fila['codigo']],
+                    'b_nombre': fila['nombre'],
+                    'b_descripcion': fila['descripcion'],
+                    'b_unidad_medida': fila['unidad_medida'],
+                    'b_content_hash': fila['content_hash']
+                }
+                for fila in lote
+            ])
+    
+    # Crear las metas del año de los PPR nuevos y de los existentes que aún no
+    # la tienen (el mismo archivo importado para otro año)
+    ids = _ids_ppr_por_codigo(db, [fila['codigo'] for fila in filas])
+    con_meta = _ids_ppr_con_meta(db, list(ids.values()), ano_ejecucion)
+    sin_meta = [fila for fila in filas if ids[fila['codigo']] not in con_meta]
+    for lote in iterar_lotes(sin_meta):
+        db.execute(metas.insert(), [
+            {
+                'ppr_id': ids[fila['codigo']],
+                'ano_ejecucion': ano_ejecucion,
+                'descripcion': f"Meta anual para {fila['nombre']}",
+                **{columna: fila[columna] for columna in PPR_COLUMNAS_NUMERICAS},
+                'created_at': ahora,
+                'updated_at': ahora
+            }
+            for fila in lote
+        ])
+
+
+def _ids_ppr_por_codigo(db: Session, codigos: List[str]) -> Dict[str, int]:
+    """
+    Obtiene los IDs de los PPR existentes para una lista de códigos
+    
+    Args:
+        db: Sesión de base de datos
+        codigos: Códigos de PPR a buscar
+    
+    Returns:
+        Dict[str, int]: Código -> ID de los PPR encontrados
+    """
+    ids = {}
+    for inicio in range(0, len(codigos), 1000):
+        ids.update(
+            (codigo, ppr_id) for ppr_id, codigo in
+            db.query(DBPPR.id, DBPPR.codigo)
+            .filter(DBPPR.codigo.in_(codigos[inicio:inicio + 1000]))
+            .all()
+        )
+    return ids
+
+
+def _ids_ppr_con_meta(db: Session, ppr_ids: List[int], ano_ejecucion: int) -> Set[int]:
+    """
+    Obtiene los IDs de los PPR que ya tienen meta para un año
+    
+    Args:
+        db: Sesión de base de datos
+        ppr_ids: IDs de PPR a consultar
+        ano_ejecucion: Año de ejecución
+    
+    Returns:
+        Set[int]: IDs de los PPR con meta en ese año
+    """
+    ids = set()
+    for inicio in range(0, len(ppr_ids), 1000):
+        ids.update(
+            ppr_id for ppr_id, in
+            db.query(DBPPRMeta.ppr_id)
+            .filter(DBPPRMeta.ppr_id.in_(ppr_ids[inicio:inicio + 1000]),
+                    DBPPRMeta.ano_ejecucion == ano_ejecucion)
+            .all()
+        )
+    return ids
+
+
+def cargar_datos_ppr_desde_excel(
+        file_path: str, ano_ejecucion: int, responsable_planificacion_id: int,
+        db: Session, chunk_size: Optional[int] = None, use_staging: bool = False,
+        progress_callback: Optional[ProgresoImportacion] = None,
+        force: bool = False, commit_every: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Carga datos de PPR desde un archivo Excel, CSV o Parquet
+    
+    La importación es incremental: un archivo idéntico al de la última
+    importación del mismo año se omite, y de un archivo modificado solo se
+    escriben las filas cuya huella de contenido cambió.
+    
+    Args:
+        file_path: Ruta del archivo; el formato se detecta por la extensión
         ano_ejecucion: Año de ejecución
         responsable_planificacion_id: ID del responsable de planificación
         db: Sesión de base de datos
+        chunk_size: Si se indica, el archivo se lee y procesa en bloques de
+            este tamaño (modo streaming con memoria acotada)
+        use_staging: Si es True, cada bloque se carga en una tabla temporal
+            y se concilia con pprs y ppr_metas mediante sentencias masivas
+        progress_callback: Función llamada después de cada bloque con los
+            totales acumulados de registros procesados e ignorados y los
+            errores por fila acumulados ({'fila', 'campo', 'valor', 'motivo'})
+        force: Si es True, se escriben todas las filas aunque no hayan cambiado
+        commit_every: Si se indica, se confirma una transacción cada este
+            número de filas con un punto de control para reanudar la importación
     
     Returns:
         Dict con resultados de la operación
@@ -159,95 +992,57 @@ def cargar_datos_ppr_desde_excel(file_path: str, ano_ejecucion: int, responsable
         if not validate_year(ano_ejecucion):
             return {"success": False, "error": "Año de ejecución no válido"}
         
-        # Leer archivo Excel
-        df = pd.read_excel(file_path)
-        
-        # Verificar columnas requeridas para PPR
-        required_columns = [
-            'codigo', 'nombre', 'descripcion', 'unidad_medida',
-            'meta_programada_anual',
-            'ene_prog', 'feb_prog', 'mar_prog', 'abr_prog',
-            'may_prog', 'jun_prog', 'jul_prog', 'ago_prog',
-            'sep_prog', 'oct_prog', 'nov_prog', 'dic_prog'
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            return {"success": False, "error": f"Columnas faltantes: {missing_columns}"}
-        
-        registros_procesados = 0
-        registros_ignorados = 0
-        
-        for index, row in df.iterrows():
-            # Validar código de PPR
-            codigo = str(row['codigo']).strip()
-            if not validate_codigo_ppr(codigo):
-                log_info(f"Código de PPR no válido: {codigo} en fila {index}")
-                registros_ignorados += 1
-                continue
+        def escribir_bloque(df: pd.DataFrame, staging) -> ResultadoBloque:
+            filas, procesados, ignorados, errores = _preparar_datos_ppr(
+                df, ano_ejecucion
+            )
             
-            # Verificar si ya existe un PPR con el mismo código y año
-            existing_ppr = db.query(DBPPR).filter(
-                DBPPR.codigo == codigo,
-                DBPPR.ano_ejecucion == ano_ejecucion
-            ).first()
+            sin_cambios = 0
+            if not force:
+                filas, sin_cambios = _filtrar_filas_modificadas(
+                    db, DBPPR.codigo, DBPPR.content_hash, filas
+                )
             
-            if existing_ppr:
-                # Actualizar PPR existente
-                existing_ppr.nombre = row['nombre']
-                existing_ppr.descripcion = row['descripcion']
-                existing_ppr.unidad_medida = row['unidad_medida']
-                # Nota: no actualizamos el responsable de planificación desde el archivo
-            else:
-                # Crear nuevo PPR
-                nuevo_ppr = DBPPR(
-                    codigo=codigo,
-                    nombre=row['nombre'],
-                    descripcion=row['descripcion'],
-                    unidad_medida=row['unidad_medida'],
-                    responsable_planificacion_id=responsable_planificacion_id,
-                    responsable_ppr_id=None,  # Se asignará después
-                    estado="activo",
-                    ano_ejecucion=ano_ejecucion
+            if staging is not None:
+                _merge_ppr_staging(
+                    db, staging, filas, ano_ejecucion, responsable_planificacion_id
                 )
-                db.add(nuevo_ppr)
-                db.flush()  # Para obtener el ID del nuevo PPR
-                
-                # Crear meta asociada al PPR
-                from app.database.models import PPRMeta as DBPPRMeta
-                nueva_meta = DBPPRMeta(
-                    ppr_id=nuevo_ppr.id,
-                    ano_ejecucion=ano_ejecucion,
-                    descripcion=f"Meta anual para {row['nombre']}",
-                    meta_programada_anual=float(row['meta_programada_anual']) if pd.notna(row['meta_programada_anual']) else 0.0,
-                    ene_prog=float(row['ene_prog']) if pd.notna(row['ene_prog']) else 0.0,
-                    feb_prog=float(row['feb_prog']) if pd.notna(row['feb_prog']) else 0.0,
-                    mar_prog=float(row['mar_prog']) if pd.notna(row['mar_prog']) else 0.0,
-                    abr_prog=float(row['abr_prog']) if pd.notna(row['abr_prog']) else 0.0,
-                    may_prog=float(row['may_prog']) if pd.notna(row['may_prog']) else 0.0,
-                    jun_prog=float(row['jun_prog']) if pd.notna(row['jun_prog']) else 0.0,
-                    jul_prog=float(row['jul_prog']) if pd.notna(row['jul_prog']) else 0.0,
-                    ago_prog=float(row['ago_prog']) if pd.notna(row['ago_prog']) else 0.0,
-                    sep_prog=float(row['sep_prog']) if pd.notna(row['sep_prog']) else 0.0,
-                    oct_prog=float(row['oct_prog']) if pd.notna(row['oct_prog']) else 0.0,
-                    nov_prog=float(row['nov_prog']) if pd.notna(row['nov_prog']) else 0.0,
-                    dic_prog=float(row['dic_prog']) if pd.notna(row['dic_prog']) else 0.0
+            else:
+                _escribir_filas_ppr(
+                    filas, ano_ejecucion, responsable_planificacion_id, db
                 )
-                db.add(nueva_meta)
             
-            registros_procesados += 1
+            # Mantener el resumen de progreso en la misma transacción
+            ppr_ids = _ids_ppr_por_codigo(db, [fila['codigo'] for fila in filas])
+            actualizar_resumen_progreso(db, list(ppr_ids.values()), ano_ejecucion)
+            return procesados, ignorados, sin_cambios, errores
         
-        # Confirmar cambios en la base de datos
-        db.commit()
+        resultado = _importar_archivo(
+            db, "ppr", file_path, ano_ejecucion,
+            PPR_COLUMNAS_REQUERIDAS, PPR_TIPOS_COLUMNAS,
+            escribir_bloque, _crear_staging_ppr if use_staging else None,
+            chunk_size, progress_callback, force, commit_every
+        )
+        if not resultado["success"]:
+            return resultado
         
-        log_info(f"Archivo PPR procesado. Procesados: {registros_procesados}, Ignorados: {registros_ignorados}")
+        if resultado["skipped"]:
+            resultado["message"] = (
+                "Archivo PPR sin cambios respecto a una importación anterior. "
+                "No se realizaron cambios."
+            )
+            return resultado
         
-        return {
-            "success": True,
-            "message": f"Archivo PPR procesado exitosamente. {registros_procesados} registros procesados, {registros_ignorados} ignorados.",
-            "processed": registros_procesados,
-            "ignored": registros_ignorados
-        }
+        log_info(
+            f"Archivo PPR procesado. Procesados: {resultado['processed']}, "
+            f"Ignorados: {resultado['ignored']}, Sin cambios: {resultado['unchanged']}"
+        )
+        
+        resultado["message"] = (
+            f"Archivo PPR procesado exitosamente. {resultado['processed']} registros "
+            f"procesados, {resultado['ignored']} ignorados."
+        )
+        return resultado
     
     except Exception as e:
         log_error(e, "cargar_datos_ppr_desde_excel")
@@ -255,10 +1050,90 @@ def cargar_datos_ppr_desde_excel(file_path: str, ano_ejecucion: int, responsable
         return {"success": False, "error": str(e)}
 
 
+def _matriz_mensual(ids: np.ndarray, filas_ids: np.ndarray,
+                    valores: np.ndarray) -> np.ndarray:
+    """
+    Suma filas de valores mensuales en una matriz alineada con una lista de IDs
+    
+    Args:
+        ids: IDs que definen el orden de las filas del resultado
+        filas_ids: ID de cada fila de valores
+        valores: Matriz (n, 12) con los valores mensuales
+    
+    Returns:
+        np.ndarray: Matriz (len(ids), 12) con la suma por ID
+    """
+    matriz = np.zeros((len(ids), 12))
+    posiciones = pd.Index(ids).get_indexer(filas_ids)
+    validas = posiciones >= 0
+    np.add.at(matriz, posiciones[validas], valores[validas])
+    return matriz
+
+
+def _matrices_ppr(db: Session, ano_ejecucion: int, ppr_ids: np.ndarray,
+                  filtrar_ids: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Carga lo programado (metas) y ejecutado (avances mensuales) de varios PPR
+    
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución
+        ppr_ids: IDs de PPR que definen el orden de las filas
+        filtrar_ids: Si es True, las consultas se limitan a ``ppr_ids``
+    
+    Returns:
+        Tuple con las matrices (len(ppr_ids), 12) de programado y ejecutado
+    """
+    columnas_prog = [f'{mes}_prog' for mes in MESES]
+    
+    filtros_metas = [DBPPRMeta.ano_ejecucion == ano_ejecucion]
+    filtros_avances = [
+        DBPPRAvance.ano_ejecucion == ano_ejecucion,
+        DBPPRAvance.acumulado_anual.isnot(True)
+    ]
+    if filtrar_ids:
+        filtros_metas.append(DBPPRMeta.ppr_id.in_(ppr_ids.tolist()))
+        filtros_avances.append(DBPPRAvance.ppr_id.in_(ppr_ids.tolist()))
+    
+    metas = pd.DataFrame(
+        db.query(DBPPRMeta.ppr_id, *[getattr(DBPPRMeta, col) for col in columnas_prog])
+        .filter(*filtros_metas)
+        .all(),
+        columns=['ppr_id'] + columnas_prog
+    )
+    programado = _matriz_mensual(
+        ppr_ids, metas['ppr_id'].to_numpy(),
+        metas[columnas_prog].to_numpy(dtype=float, na_value=0.0)
+    )
+    
+    # Los avances registrados antes de validar el mes pueden estar en mayúsculas
+    mes = func.lower(DBPPRAvance.mes)
+    avances = pd.DataFrame(
+        db.query(DBPPRAvance.ppr_id, mes, func.sum(DBPPRAvance.valor_ejecutado))
+        .filter(*filtros_avances)
+        .group_by(DBPPRAvance.ppr_id, mes)
+        .all(),
+        columns=['ppr_id', 'mes', 'valor']
+    )
+    meses_avance = pd.Index(MESES).get_indexer(avances['mes'])
+    validos = meses_avance >= 0
+    valores = np.zeros((len(avances), 12))
+    valor = avances['valor'].to_numpy(dtype=float, na_value=0.0)
+    valores[np.flatnonzero(validos), meses_avance[validos]] = valor[validos]
+    ejecutado = _matriz_mensual(ppr_ids, avances['ppr_id'].to_numpy(), valores)
+    
+    return programado, ejecutado
+
+
 def comparar_datos_ceplan_ppr(ano_ejecucion: int, db: Session) -> Dict[str, Any]:
     """
     Compara datos de CEPLAN y PPR para un año específico
     
+    Ambos lados se cargan como matrices (registros x 12 meses) y se
+    relacionan mediante la tabla ppr_ceplan_map; un PPR asociado a varios
+    subproductos se compara contra la suma de ellos. La varianza es
+    PPR - CEPLAN para lo programado y lo ejecutado.
+    
     Args:
         ano_ejecucion: Año de ejecución
         db: Sesión de base de datos
@@ -267,38 +1142,88 @@ def comparar_datos_ceplan_ppr(ano_ejecucion: int, db: Session) -> Dict[str, Any]
         Dict con resultados de la comparación
     """
     try:
-        # Obtener datos CEPLAN
-        ceplan_data = db.query(DBCEPLAN).filter(
-            DBCEPLAN.ano_ejecucion == ano_ejecucion
-        ).all()
+        # Lado CEPLAN: (subproductos x 12) programado y ejecutado
+        ceplan = obtener_snapshot_ceplan(db, ano_ejecucion)
+        ceplan_prog = ceplan.programado
+        ceplan_eje = ceplan.ejecutado
+        
+        # Lado PPR: programado desde las metas y ejecutado desde los avances mensuales
+        pprs = pd.DataFrame(
+            db.query(DBPPR.id, DBPPR.codigo, DBPPR.nombre)
+            .filter(DBPPR.ano_ejecucion == ano_ejecucion)
+            .all(),
+            columns=['id', 'codigo', 'nombre']
+        )
+        ppr_ids = pprs['id'].to_numpy()
         
-        # Convertir a diccionario para búsqueda rápida
-        ceplan_dict = {item.codigo_sub_producto: item for item in ceplan_data}
+        ppr_prog, ppr_eje = _matrices_ppr(db, ano_ejecucion, ppr_ids)
         
-        # Obtener PPRs para el año
-        ppr_data = db.query(DBPPR).filter(
-            DBPPR.ano_ejecucion == ano_ejecucion
-        ).all()
+        # Relacionar ambos lados a través de la tabla de mapeo
+        mapeo = pd.DataFrame(
+            db.query(DBPPRCeplanMap.ppr_codigo, DBPPRCeplanMap.codigo_sub_producto)
+            .join(DBPPR, DBPPR.codigo == DBPPRCeplanMap.ppr_codigo)
+            .filter(DBPPR.ano_ejecucion == ano_ejecucion)
+            .all(),
+            columns=['ppr_codigo', 'codigo_sub_producto']
+        )
+        pos_ppr = pd.Index(pprs['codigo']).get_indexer(mapeo['ppr_codigo'])
+        pos_ceplan = ceplan.posiciones(mapeo['codigo_sub_producto'])
+        pares = (pos_ppr >= 0) & (pos_ceplan >= 0)
+        pos_ppr, pos_ceplan = pos_ppr[pares], pos_ceplan[pares]
+        
+        ceplan_prog_ppr = np.zeros_like(ppr_prog)
+        ceplan_eje_ppr = np.zeros_like(ppr_eje)
+        np.add.at(ceplan_prog_ppr, pos_ppr, ceplan_prog[pos_ceplan])
+        np.add.at(ceplan_eje_ppr, pos_ppr, ceplan_eje[pos_ceplan])
+        
+        # Matriz de varianzas (PPRs x 12 meses x [programado, ejecutado])
+        varianza = np.stack(
+            [ppr_prog - ceplan_prog_ppr, ppr_eje - ceplan_eje_ppr], axis=2
+        )
+        
+        subproductos_por_ppr: Dict[int, List[str]] = {}
+        codigos_mapeados = mapeo['codigo_sub_producto'].to_numpy()[pares]
+        for posicion, codigo in zip(pos_ppr, codigos_mapeados):
+            subproductos_por_ppr.setdefault(int(posicion), []).append(codigo)
         
         comparaciones = []
+        for posicion in sorted(subproductos_por_ppr):
+            comparaciones.append({
+                "ppr_id": int(ppr_ids[posicion]),
+                "codigo": pprs['codigo'].iat[posicion],
+                "nombre": pprs['nombre'].iat[posicion],
+                "codigos_sub_producto": subproductos_por_ppr[posicion],
+                "programado": {
+                    "ppr": ppr_prog[posicion].tolist(),
+                    "ceplan": ceplan_prog_ppr[posicion].tolist(),
+                    "variacion": varianza[posicion, :, 0].tolist()
+                },
+                "ejecutado": {
+                    "ppr": ppr_eje[posicion].tolist(),
+                    "ceplan": ceplan_eje_ppr[posicion].tolist(),
+                    "variacion": varianza[posicion, :, 1].tolist()
+                },
+                "variacion_total_programado": float(varianza[posicion, :, 0].sum()),
+                "variacion_total_ejecutado": float(varianza[posicion, :, 1].sum())
+            })
         
-        for ppr in ppr_data:
-            # Intentar encontrar correspondencia en CEPLAN
-            # Esto dependerá de la lógica de negocio específica
-            # Por ahora, simplemente se puede hacer una coincidencia aproximada
-            
-            # En una implementación real, aquí se haría la lógica de correlación
-            # entre PPR y CEPLAN basada en criterios específicos del negocio
-            pass
+        ceplan_asociados = np.zeros(len(ceplan), dtype=bool)
+        ceplan_asociados[pos_ceplan] = True
         
         log_info(f"Comparación CEPLAN-PPR realizada para el año {ano_ejecucion}")
         
         return {
             "success": True,
             "ano_ejecucion": ano_ejecucion,
-            "ceplan_count": len(ceplan_data),
-            "ppr_count": len(ppr_data),
-            "message": f"Comparación realizada para {len(ppr_data)} PPRs y {len(ceplan_data)} CEPLANs"
+            "ceplan_count": len(ceplan),
+            "ppr_count": len(pprs),
+            "ppr_sin_mapeo": len(pprs) - len(comparaciones),
+            "ceplan_sin_mapeo": int((~ceplan_asociados).sum()),
+            "meses": MESES,
+            "comparaciones": comparaciones,
+            "message": (
+                f"Comparación realizada para {len(pprs)} PPRs y {len(ceplan)} CEPLANs"
+            )
         }
     
     except Exception as e:
@@ -408,6 +1333,255 @@ def calcular_avance_anual(datos_mensuales: Dict[str, Dict[str, float]]) -> Dict[
     }
 
 
+def _redondear_matriz(valores: np.ndarray, decimales: int = 2) -> np.ndarray:
+    """
+    Redondea un arreglo con el mismo resultado que round() de Python
+    
+    np.round escala por 10**decimales antes de redondear, lo que puede
+    decidir distinto los valores cercanos a la mitad; esos pocos valores se
+    redondean con round().
+    
+    Args:
+        valores: Arreglo de valores
+        decimales: Cantidad de decimales
+    
+    Returns:
+        np.ndarray: Arreglo redondeado
+    """
+    redondeado = np.round(valores, decimales)
+    escalado = valores * 10 ** decimales
+    cerca_de_la_mitad = np.abs(escalado - np.floor(escalado) - 0.5) < 1e-6
+    dudosos = np.isfinite(escalado) & cerca_de_la_mitad
+    if dudosos.any():
+        redondeado[dudosos] = [
+            round(float(valor), decimales) for valor in valores[dudosos]
+        ]
+    return redondeado
+
+
+def calcular_porcentaje_matriz(actual: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """
+    Versión por arreglos de calcular_porcentaje
+    
+    Args:
+        actual: Valores actuales
+        total: Valores totales (misma forma que actual)
+    
+    Returns:
+        np.ndarray: Porcentajes; 0.0 donde el total es 0
+    """
+    actual = np.asarray(actual, dtype=float)
+    total = np.asarray(total, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        porcentaje = _redondear_matriz(
+            np.where(total == 0, 0.0, (actual / total) * 100)
+        )
+    return porcentaje
+
+
+def calcular_avance_mensual_matriz(ejecutado: np.ndarray,
+                                   programado: np.ndarray) -> np.ndarray:
+    """
+    Versión por arreglos de calcular_avance_mensual
+    
+    Args:
+        ejecutado: Valores ejecutados
+        programado: Valores programados (misma forma que ejecutado)
+    
+    Returns:
+        np.ndarray: Porcentajes de avance; donde no hay programado, 0.0 si
+        tampoco hay ejecutado y 100.0 en caso contrario
+    """
+    ejecutado = np.asarray(ejecutado, dtype=float)
+    programado = np.asarray(programado, dtype=float)
+    avance = calcular_porcentaje_matriz(ejecutado, programado)
+    sin_programado = programado == 0
+    avance[sin_programado] = np.where(ejecutado[sin_programado] == 0, 0.0, 100.0)
+    return avance
+
+
+def calcular_avance_anual_matriz(
+        ejecutado: np.ndarray, programado: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Versión por arreglos de calcular_avance_anual
+    
+    Args:
+        ejecutado: Matriz (n, 12) de valores ejecutados
+        programado: Matriz (n, 12) de valores programados
+    
+    Returns:
+        Dict[str, np.ndarray]: 'ejecutado', 'programado' y 'porcentaje' por fila
+    """
+    # cumsum suma en orden, igual que sum() sobre los meses
+    total_ejecutado = np.cumsum(np.asarray(ejecutado, dtype=float), axis=1)[:, -1]
+    total_programado = np.cumsum(np.asarray(programado, dtype=float), axis=1)[:, -1]
+    porcentaje = np.where(
+        total_programado > 0,
+        calcular_porcentaje_matriz(total_ejecutado, total_programado),
+        0.0
+    )
+    
+    return {
+        'ejecutado': total_ejecutado,
+        'programado': total_programado,
+        'porcentaje': porcentaje
+    }
+
+
+def calcular_avance_matriz(
+        ejecutado: np.ndarray, programado: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calcula en una sola llamada el avance mensual, acumulado y anual de varios PPR
+    
+    Args:
+        ejecutado: Matriz (n, 12) de valores ejecutados
+        programado: Matriz (n, 12) de valores programados
+    
+    Returns:
+        Dict[str, np.ndarray]: 'mensual' y 'acumulado' (n, 12) con los
+        porcentajes de avance, 'ejecutado_acumulado' y 'programado_acumulado'
+        (n, 12) y 'anual' con el resultado de calcular_avance_anual_matriz
+    """
+    ejecutado = np.asarray(ejecutado, dtype=float).reshape(-1, 12)
+    programado = np.asarray(programado, dtype=float).reshape(-1, 12)
+    ejecutado_acumulado = np.cumsum(ejecutado, axis=1)
+    programado_acumulado = np.cumsum(programado, axis=1)
+    
+    return {
+        'mensual': calcular_avance_mensual_matriz(ejecutado, programado),
+        'acumulado': calcular_avance_mensual_matriz(
+            ejecutado_acumulado, programado_acumulado
+        ),
+        'ejecutado_acumulado': ejecutado_acumulado,
+        'programado_acumulado': programado_acumulado,
+        'anual': calcular_avance_anual_matriz(ejecutado, programado)
+    }
+
+
+def actualizar_resumen_progreso(db: Session, ppr_ids: List[int],
+                                ano_ejecucion: int) -> None:
+    """
+    Recalcula las filas de ppr_progress_summary de los PPR indicados
+    
+    Solo se leen las metas y avances de esos PPR en el año, y las 12 filas
+    mensuales de cada uno se escriben con un upsert masivo. No confirma la
+    transacción: debe llamarse junto con la escritura que modifica los datos.
+    
+    Args:
+        db: Sesión de base de datos
+        ppr_ids: IDs de los PPR modificados
+        ano_ejecucion: Año de ejecución
+    """
+    ids = sorted(set(ppr_ids))
+    for lote in iterar_lotes(ids):
+        lote_ids = np.array(lote)
+        programado, ejecutado = _matrices_ppr(
+            db, ano_ejecucion, lote_ids, filtrar_ids=True
+        )
+        avance = calcular_avance_matriz(ejecutado, programado)
+        programado_acumulado = avance['programado_acumulado']
+        ejecutado_acumulado = avance['ejecutado_acumulado']
+        
+        filas = []
+        for i, ppr_id in enumerate(lote):
+            for j, mes in enumerate(MESES):
+                filas.append({
+                    'ppr_id': ppr_id,
+                    'ano_ejecucion': ano_ejecucion,
+                    'mes': mes,
+                    'mes_numero': j + 1,
+                    'programado': float(programado[i, j]),
+                    'ejecutado': float(ejecutado[i, j]),
+                    'programado_acumulado': float(programado_acumulado[i, j]),
+                    'ejecutado_acumulado': float(ejecutado_acumulado[i, j]),
+                    'porcentaje': float(avance['mensual'][i, j]),
+                    'porcentaje_acumulado': float(avance['acumulado'][i, j])
+                })
+        
+        upsert_rows(
+            db,
+            DBPPRProgressSummary.__table__,
+            filas,
+            key_columns=['ppr_id', 'ano_ejecucion', 'mes'],
+            update_columns=['programado', 'ejecutado', 'programado_acumulado',
+                            'ejecutado_acumulado', 'porcentaje', 'porcentaje_acumulado']
+        )
+
+
+def reconstruir_resumen_progreso(db: Session,
+                                 ano_ejecucion: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Reconstruye ppr_progress_summary a partir de ppr_metas y ppr_avances
+    
+    Se usa para poblar la tabla en bases de datos con metas y avances
+    anteriores a ella, o para corregirla si se modificaron datos sin pasar
+    por la API. Las filas del alcance se eliminan y se recalculan en la
+    misma transacción, que no se confirma aquí.
+    
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año a reconstruir; None para todos los años
+    
+    Returns:
+        Dict con los años reconstruidos, la cantidad de PPR y de filas escritas
+    """
+    metas = db.query(DBPPRMeta.ppr_id, DBPPRMeta.ano_ejecucion)
+    avances = db.query(DBPPRAvance.ppr_id, DBPPRAvance.ano_ejecucion)
+    resumen = db.query(DBPPRProgressSummary)
+    if ano_ejecucion is not None:
+        metas = metas.filter(DBPPRMeta.ano_ejecucion == ano_ejecucion)
+        avances = avances.filter(DBPPRAvance.ano_ejecucion == ano_ejecucion)
+        resumen = resumen.filter(DBPPRProgressSummary.ano_ejecucion == ano_ejecucion)
+    
+    pprs_por_ano: Dict[int, List[int]] = {}
+    for ppr_id, ano in metas.union(avances).all():
+        pprs_por_ano.setdefault(ano, []).append(ppr_id)
+    
+    resumen.delete(synchronize_session=False)
+    for ano, ppr_ids in sorted(pprs_por_ano.items()):
+        actualizar_resumen_progreso(db, ppr_ids, ano)
+    
+    cantidad_pprs = sum(len(ppr_ids) for ppr_ids in pprs_por_ano.values())
+    return {
+        "ano_ejecucion": ano_ejecucion,
+        "anos": sorted(pprs_por_ano),
+        "pprs": cantidad_pprs,
+        "filas": cantidad_pprs * len(MESES)
+    }
+
+
+def inicializar_resumen_progreso(db: Session) -> Optional[Dict[str, Any]]:
+    """
+    Puebla ppr_progress_summary si está vacía y existen metas o avances
+    
+    Pensada para el arranque de la aplicación: en una base de datos creada
+    antes de la tabla de resumen, las lecturas de avance, el tablero, la
+    exportación y el cierre de año no devolverían datos de los PPR
+    existentes. Confirma la transacción si reconstruye.
+    
+    Args:
+        db: Sesión de base de datos
+    
+    Returns:
+        Resultado de reconstruir_resumen_progreso, o None si no hizo falta
+    """
+    if db.query(DBPPRProgressSummary.id).first() is not None:
+        return None
+    sin_datos = (db.query(DBPPRMeta.id).first() is None
+                 and db.query(DBPPRAvance.id).first() is None)
+    if sin_datos:
+        return None
+    
+    resultado = reconstruir_resumen_progreso(db)
+    db.commit()
+    incrementar_version_datos()
+    log_info(
+        f"Resumen de avance poblado: {resultado['pprs']} PPR "
+        f"en los años {resultado['anos']}"
+    )
+    return resultado
+
+
 def formatear_datos_para_grafico(datos: List[Dict[str, Any]], campo_x: str, campo_y: str) -> Dict[str, List]:
     """
     Formatea datos para ser usados en gráficos
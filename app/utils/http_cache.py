@@ -0,0 +1,132 @@
+"""
+Peticiones condicionales (ETag / Last-Modified) para Monitor PPR v2
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Sequence
+from fastapi import Request, Response, status
+from sqlalchemy import func, true
+from sqlalchemy.orm import Query, Session
+
+
+def agregado_validacion(query: Query, modelo_db: Any) -> Query:
+    """
+    Convierte una consulta en el agregado max(updated_at), count(*) de sus filas
+
+    Args:
+        query: Consulta con los filtros de la lectura (sin orden ni límite)
+        modelo_db: Modelo SQLAlchemy con columna updated_at
+
+    Returns:
+        Query: Consulta de una fila con el máximo updated_at y la cantidad de filas
+    """
+    return query.with_entities(
+        func.max(modelo_db.updated_at).label('maximo'),
+        func.count().label('cantidad')
+    ).order_by(None)
+
+
+def _etag_coincide(if_none_match: str, etag: str) -> bool:
+    """
+    Compara un ETag con la cabecera If-None-Match (comparación débil)
+
+    Args:
+        if_none_match: Valor de la cabecera If-None-Match
+        etag: ETag actual
+
+    Returns:
+        bool: True si alguno de los ETag del cliente coincide
+    """
+    if if_none_match.strip() == '*':
+        return True
+    actual = etag[2:] if etag.startswith('W/') else etag
+    for candidato in if_none_match.split(','):
+        candidato = candidato.strip()
+        if (candidato[2:] if candidato.startswith('W/') else candidato) == actual:
+            return True
+    return False
+
+
+def _no_modificado_desde(if_modified_since: str, ultima_modificacion: datetime) -> bool:
+    """
+    Evalúa la cabecera If-Modified-Since
+
+    Args:
+        if_modified_since: Valor de la cabecera If-Modified-Since
+        ultima_modificacion: Última modificación de los datos (UTC)
+
+    Returns:
+        bool: True si los datos no cambiaron desde la fecha del cliente
+    """
+    try:
+        fecha_cliente = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if fecha_cliente.tzinfo is None:
+        fecha_cliente = fecha_cliente.replace(tzinfo=timezone.utc)
+    # La cabecera HTTP solo tiene precisión de segundos
+    return ultima_modificacion.replace(microsecond=0) <= fecha_cliente
+
+
+def respuesta_condicional(request: Request, response: Response, db: Session,
+                          agregados: Sequence[Query],
+                          variante: Any = None) -> Optional[Response]:
+    """
+    Resuelve una petición condicional a partir de los agregados de sus tablas
+
+    Todos los agregados se evalúan en una sola consulta. El ETag combina el
+    máximo updated_at y la cantidad de filas de cada agregado con la
+    variante de la representación (parámetros de la petición y formato
+    negociado en Accept), de modo que cualquier alta, baja o modificación
+    lo cambia.
+
+    Args:
+        request: Petición recibida
+        response: Respuesta de la petición, donde se agregan las cabeceras
+        db: Sesión de base de datos
+        agregados: Consultas devueltas por agregado_validacion
+        variante: Valor que distingue representaciones del mismo recurso
+
+    Returns:
+        Response 304 si el cliente ya tiene la versión vigente, None en caso
+        contrario (la lectura debe continuar normalmente)
+    """
+    subconsultas = [agregado.subquery() for agregado in agregados]
+    consulta = db.query(
+        *[col for sub in subconsultas for col in (sub.c.maximo, sub.c.cantidad)]
+    )
+    # Cada agregado devuelve una sola fila: se combinan con un producto cruzado
+    # explícito
+    consulta = consulta.select_from(subconsultas[0])
+    for sub in subconsultas[1:]:
+        consulta = consulta.join(sub, true())
+    fila = consulta.one()
+
+    maximos = [valor for valor in fila[0::2] if valor is not None]
+    firma = '|'.join(
+        [f"{maximo.isoformat() if maximo else ''}:{cantidad}"
+         for maximo, cantidad in zip(fila[0::2], fila[1::2])]
+        + [str(variante or ''), request.headers.get("accept", "")]
+    )
+    etag = f'W/"{hashlib.sha1(firma.encode("utf-8")).hexdigest()[:20]}"'
+    ultima_modificacion = max(maximos).replace(tzinfo=timezone.utc) if maximos else None
+
+    cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+    if ultima_modificacion:
+        cabeceras["Last-Modified"] = format_datetime(ultima_modificacion, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        no_modificado = _etag_coincide(if_none_match, etag)
+    elif if_modified_since and ultima_modificacion:
+        no_modificado = _no_modificado_desde(if_modified_since, ultima_modificacion)
+    else:
+        no_modificado = False
+
+    if no_modificado:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+
+    response.headers.update(cabeceras)
+    return None
@@ -0,0 +1,240 @@
+"""
+Ejecución de importaciones en segundo plano para Monitor PPR v2
+"""
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+from app.database.session import SessionLocal
+from app.database.models import ImportJob as DBImportJob
+from app.utils.cache import (
+    incrementar_version_datos, obtener_version_datos, usar_version_compartida
+)
+from app.utils.helpers import (
+    cargar_datos_ceplan_desde_excel, cargar_datos_ppr_desde_excel, ErroresFila,
+    IMPORT_CHUNK_SIZE, MAX_ERRORES_REPORTE
+)
+from app.utils.logger import log_error, log_info
+
+# Cantidad de procesos dedicados a importaciones
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+
+# Estados de un trabajo que no terminó
+ESTADOS_SIN_TERMINAR = ("pendiente", "en_proceso")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Obtiene (creándolo si es necesario) el pool de procesos de importación
+
+    Se usa el contexto "spawn" para que cada proceso cree su propio motor de
+    base de datos en lugar de heredar conexiones del proceso de la API. Los
+    procesos comparten la versión de datos con la API: cada bloque que una
+    importación confirma invalida las cachés sin esperar a que termine.
+
+    Returns:
+        ProcessPoolExecutor: Pool de procesos compartido
+    """
+    global _executor
+    if _executor is None:
+        contexto = multiprocessing.get_context("spawn")
+        version = contexto.Value('q', obtener_version_datos() + 1)
+        usar_version_compartida(version)
+        _executor = ProcessPoolExecutor(
+            max_workers=IMPORT_WORKERS,
+            mp_context=contexto,
+            initializer=usar_version_compartida,
+            initargs=(version,)
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """
+    Detiene el pool de procesos de importación esperando los trabajos en curso
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _actualizar_job(job_id: int, **valores) -> None:
+    """
+    Actualiza el estado de un trabajo en su propia transacción
+
+    Args:
+        job_id: ID del trabajo
+        **valores: Columnas a actualizar
+    """
+    db = SessionLocal()
+    try:
+        db.query(DBImportJob).filter(DBImportJob.id == job_id).update(
+            valores, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _eliminar_archivo(file_path: str) -> None:
+    """
+    Elimina el archivo subido de un trabajo que llegó a un estado final
+
+    Args:
+        file_path: Ruta del archivo en disco
+    """
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log_error(e, f"_eliminar_archivo - {file_path}")
+
+
+def ejecutar_importacion(job_id: int) -> None:
+    """
+    Ejecuta un trabajo de importación (se corre dentro del pool de procesos)
+
+    El avance y los errores por fila se registran en la tabla import_jobs
+    después de cada bloque, en una sesión independiente de la que realiza
+    la importación. Cada bloque se confirma por separado, así que volver a
+    ejecutar el trabajo (o subir el mismo archivo) tras una caída continúa
+    desde el último punto de control. Al terminar, con éxito o con error,
+    se elimina el archivo subido.
+
+    Args:
+        job_id: ID del trabajo a ejecutar
+    """
+    db = SessionLocal()
+    file_path = None
+    try:
+        job = db.query(DBImportJob).filter(DBImportJob.id == job_id).first()
+        if not job:
+            log_info(f"Trabajo de importación no encontrado: {job_id}")
+            return
+
+        file_path = job.file_path
+        _actualizar_job(job_id, estado="en_proceso",
+                        started_at=job.started_at or datetime.utcnow())
+
+        # Un trabajo reanudado conserva los errores de los bloques ya confirmados
+        errores_previos = list(job.row_errors or [])
+
+        def acumular_errores(errores: ErroresFila) -> ErroresFila:
+            return (errores_previos + errores)[:MAX_ERRORES_REPORTE]
+
+        def reportar_avance(procesados: int, ignorados: int,
+                            errores: ErroresFila) -> None:
+            _actualizar_job(
+                job_id, processed=procesados, ignored=ignorados,
+                row_errors=acumular_errores(errores)
+            )
+
+        if job.tipo == "ceplan":
+            resultado = cargar_datos_ceplan_desde_excel(
+                job.file_path, job.ano_ejecucion, db,
+                commit_every=IMPORT_CHUNK_SIZE, progress_callback=reportar_avance
+            )
+        else:
+            resultado = cargar_datos_ppr_desde_excel(
+                job.file_path, job.ano_ejecucion, job.user_id, db,
+                commit_every=IMPORT_CHUNK_SIZE, progress_callback=reportar_avance
+            )
+
+        if resultado.get("success"):
+            _actualizar_job(
+                job_id,
+                estado="completado",
+                processed=resultado["processed"],
+                ignored=resultado["ignored"],
+                row_errors=acumular_errores(resultado["errors"]),
+                message=resultado.get("message"),
+                finished_at=datetime.utcnow()
+            )
+        else:
+            _actualizar_job(job_id, estado="error", error=resultado.get("error"),
+                            finished_at=datetime.utcnow())
+
+        log_info(
+            f"Trabajo de importación {job_id} finalizado: {resultado.get('success')}"
+        )
+        _eliminar_archivo(file_path)
+
+    except Exception as e:
+        log_error(e, f"ejecutar_importacion - Job ID: {job_id}")
+        _actualizar_job(job_id, estado="error", error=str(e),
+                        finished_at=datetime.utcnow())
+        if file_path:
+            _eliminar_archivo(file_path)
+    finally:
+        db.close()
+
+
+def enviar_importacion(job_id: int) -> Future:
+    """
+    Encola un trabajo de importación en el pool de procesos
+
+    Args:
+        job_id: ID del trabajo
+
+    Returns:
+        Future: Resultado futuro de la ejecución
+    """
+    def al_finalizar(resultado: Future) -> None:
+        # Por si el proceso terminó entre una confirmación y su incremento de versión
+        incrementar_version_datos()
+        # Errores del propio pool (p. ej. un proceso terminado abruptamente)
+        if not resultado.cancelled() and resultado.exception():
+            log_error(resultado.exception(), f"enviar_importacion - Job ID: {job_id}")
+
+    future = get_executor().submit(ejecutar_importacion, job_id)
+    future.add_done_callback(al_finalizar)
+    return future
+
+
+def recuperar_importaciones() -> int:
+    """
+    Retoma los trabajos que quedaron sin terminar al detenerse el servidor
+
+    Se llama al iniciar la aplicación. Los trabajos pendientes o en proceso
+    cuyo archivo sigue en disco se vuelven a encolar y continúan desde su
+    último punto de control; los que ya no tienen archivo se marcan con
+    error. Supone un único proceso de API: con varios, otro proceso podría
+    estar ejecutando esos trabajos.
+
+    Returns:
+        int: Cantidad de trabajos encolados nuevamente
+    """
+    db = SessionLocal()
+    try:
+        trabajos = db.query(DBImportJob).filter(
+            DBImportJob.estado.in_(ESTADOS_SIN_TERMINAR)
+        ).order_by(DBImportJob.id).all()
+
+        reencolados = []
+        for job in trabajos:
+            if os.path.exists(job.file_path):
+                job.estado = "pendiente"
+                reencolados.append(job.id)
+            else:
+                job.estado = "error"
+                job.error = (
+                    "Importación interrumpida por un reinicio del servidor; "
+                    "el archivo subido ya no existe"
+                )
+                job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+    for job_id in reencolados:
+        enviar_importacion(job_id)
+    if trabajos:
+        log_info(
+            f"Trabajos de importación retomados: {len(reencolados)} de {len(trabajos)}"
+        )
+    return len(reencolados)
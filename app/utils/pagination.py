@@ -0,0 +1,98 @@
+"""
+Paginación por cursor (keyset) para Monitor PPR v2
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+# Cabecera con el cursor de la página siguiente
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """
+    Codifica los valores de la clave de orden de una fila como cursor opaco
+
+    Args:
+        valores: Valores de las columnas de orden de la última fila
+
+    Returns:
+        str: Cursor en base64 apto para URL
+    """
+    datos = json.dumps(list(valores), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(datos).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor: str, cantidad: int) -> List[Any]:
+    """
+    Decodifica un cursor generado por codificar_cursor
+
+    Args:
+        cursor: Cursor recibido en el parámetro after
+        cantidad: Número de columnas de la clave de orden
+
+    Returns:
+        Lista con los valores de la clave de orden
+
+    Raises:
+        HTTPException: Si el cursor no es válido
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError):
+        valores = None
+    if not isinstance(valores, list) or len(valores) != cantidad:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor no válido"
+        )
+    return valores
+
+
+def paginar(query: Query, columnas: Sequence[Any], response: Response, skip: int = 0,
+            limit: int = 100, after: Optional[str] = None) -> List[Any]:
+    """
+    Aplica un orden estable y pagina por cursor o, sin cursor, por desplazamiento
+
+    Con cursor, la consulta continúa después de la última fila de la página
+    anterior comparando la clave de orden, de modo que cualquier página
+    cuesta lo mismo que la primera si existe un índice sobre las columnas.
+    El cursor de la página siguiente se envía en la cabecera X-Next-Cursor
+    cuando la página está completa.
+
+    Args:
+        query: Consulta ORM sin orden ni límite
+        columnas: Columnas de la clave de orden (únicas en conjunto)
+        response: Respuesta donde se agrega la cabecera del cursor
+        skip: Filas a omitir (solo sin cursor)
+        limit: Tamaño de página
+        after: Cursor de la página anterior
+
+    Returns:
+        Lista de objetos de la página
+    """
+    query = query.order_by(*columnas)
+
+    if after:
+        valores = decodificar_cursor(after, len(columnas))
+        # (a, b) > (x, y) expandido a a > x OR (a = x AND b > y) para usar el
+        # índice en cualquier motor
+        query = query.filter(or_(*[
+            and_(*[columnas[j] == valores[j] for j in range(i)],
+                 columnas[i] > valores[i])
+            for i in range(len(columnas))
+        ]))
+    elif skip:
+        query = query.offset(skip)
+
+    filas = query.limit(limit).all()
+    if filas and len(filas) == limit:
+        ultima = filas[-1]
+        response.headers[CURSOR_HEADER] = codificar_cursor(
+            [getattr(ultima, columna.key) for columna in columnas]
+        )
+    return filas
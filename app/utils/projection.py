@@ -0,0 +1,177 @@
+"""
+Proyección de columnas (fields) y relaciones incluidas (include) para las
+lecturas de Monitor PPR v2
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import func
+from app.database.models import CEPLAN as DBCEPLAN
+from app.utils.serialization import prefiere_msgpack, respuesta_serializada
+from app.utils.validators import MESES_VALIDOS
+
+# Campos calculados en SQL disponibles en la proyección de CEPLAN
+CEPLAN_CAMPOS_CALCULADOS = {
+    'total_programado': sum(
+        func.coalesce(getattr(DBCEPLAN, f'{mes}_prog'), 0) for mes in MESES_VALIDOS
+    ),
+    'total_ejecutado': sum(
+        func.coalesce(getattr(DBCEPLAN, f'{mes}_eje'), 0) for mes in MESES_VALIDOS
+    )
+}
+
+
+def parsear_campos(fields: Optional[str], modelo: Type[BaseModel],
+                   calculados: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+    """
+    Valida la lista de campos solicitados en el parámetro fields
+
+    Solo se aceptan campos del modelo de respuesta (y los calculados), de
+    modo que la proyección nunca expone columnas internas. "*" selecciona
+    todos los campos del modelo.
+
+    Args:
+        fields: Campos separados por coma, p. ej.
+            "codigo_sub_producto,subproducto", o "*"
+        modelo: Modelo pydantic de la respuesta completa
+        calculados: Campos calculados adicionales permitidos
+
+    Returns:
+        Lista de campos sin duplicados, o None si no se pidió proyección
+
+    Raises:
+        HTTPException: Si algún campo no existe
+    """
+    if not fields:
+        return None
+    if fields.strip() == '*':
+        return list(modelo.model_fields)
+
+    campos = list(dict.fromkeys(
+        campo.strip() for campo in fields.split(',') if campo.strip()
+    ))
+    permitidos = set(modelo.model_fields) | set(calculados or {})
+    invalidos = [campo for campo in campos if campo not in permitidos]
+    if not campos or invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos no válidos: {', '.join(invalidos) or fields}"
+        )
+    return campos
+
+
+def parsear_incluidos(include: Optional[str], permitidos: Sequence[str]) -> List[str]:
+    """
+    Valida la lista de relaciones solicitadas en el parámetro include
+
+    Args:
+        include: Relaciones separadas por coma, p. ej. "metas,avances"
+        permitidos: Relaciones disponibles
+
+    Returns:
+        Lista de relaciones sin duplicados (vacía si no se pidió ninguna)
+
+    Raises:
+        HTTPException: Si alguna relación no existe
+    """
+    if not include:
+        return []
+
+    incluidos = list(dict.fromkeys(
+        nombre.strip() for nombre in include.split(',') if nombre.strip()
+    ))
+    invalidos = [nombre for nombre in incluidos if nombre not in permitidos]
+    if invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Relaciones no válidas: {', '.join(invalidos)}. "
+                f"Disponibles: {', '.join(permitidos)}"
+            )
+        )
+    return incluidos
+
+
+def columnas_proyeccion(modelo_db: Any, campos: Sequence[str],
+                        claves: Sequence[Any] = (),
+                        calculados: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    Obtiene las columnas a seleccionar para una proyección
+
+    Args:
+        modelo_db: Modelo SQLAlchemy consultado
+        campos: Campos solicitados
+        claves: Columnas que deben seleccionarse aunque no se pidan (orden, cursor)
+        calculados: Expresiones SQL de los campos calculados
+
+    Returns:
+        Lista de columnas y expresiones etiquetadas
+    """
+    calculados = calculados or {}
+    columnas = [
+        calculados[campo].label(campo) if campo in calculados
+        else getattr(modelo_db, campo)
+        for campo in campos
+    ]
+    columnas += [columna for columna in claves if columna.key not in campos]
+    return columnas
+
+
+def campos_solicitados(
+        request: Request, fields: Optional[str], modelo: Type[BaseModel],
+        calculados: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+    """
+    Obtiene los campos de la proyección de una lectura
+
+    Un cliente que pide MessagePack sin indicar fields recibe todos los
+    campos por la vía rápida, ya que el modelo pydantic solo produce JSON.
+
+    Args:
+        request: Petición recibida
+        fields: Valor del parámetro fields
+        modelo: Modelo pydantic de la respuesta completa
+        calculados: Campos calculados adicionales permitidos
+
+    Returns:
+        Lista de campos, o None para la respuesta completa con el modelo
+    """
+    if not fields and prefiere_msgpack(request):
+        fields = '*'
+    return parsear_campos(fields, modelo, calculados)
+
+
+def fila_a_dict(fila: Any, campos: Sequence[str]) -> Dict[str, Any]:
+    """
+    Convierte una fila de columnas en un diccionario con los campos solicitados
+
+    Las columnas de columnas_proyeccion llegan en el orden de los campos,
+    seguidas de las claves agregadas, por lo que basta con emparejarlas.
+
+    Args:
+        fila: Fila devuelta por una consulta de columnas
+        campos: Campos solicitados
+
+    Returns:
+        Dict campo -> valor
+    """
+    return dict(zip(campos, fila))
+
+
+def respuesta_proyectada(contenido: Any, response: Optional[Response] = None,
+                         request: Optional[Request] = None) -> Response:
+    """
+    Construye la respuesta de una proyección sin pasar por el modelo pydantic
+
+    Args:
+        contenido: Dict o lista de dicts
+        response: Respuesta de la petición cuyas cabeceras se conservan (p. ej.
+            X-Next-Cursor)
+        request: Petición recibida, para negociar formato y compresión
+
+    Returns:
+        Response: Respuesta con el contenido proyectado (ver app.utils.serialization)
+    """
+    cabeceras = None
+    if response is not None:
+        cabeceras = {k: v for k, v in response.headers.items() if k != 'content-length'}
+    return respuesta_serializada(request, contenido, cabeceras)
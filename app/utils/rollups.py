@@ -0,0 +1,193 @@
+"""
+Rollups anuales congelados y tendencias multianuales para Monitor PPR v2
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session
+from app.database.bulk import iterar_lotes
+from app.database.models import (
+    PPR as DBPPR, PPRProgressSummary as DBPPRProgressSummary,
+    AnnualRollup as DBAnnualRollup, ClosedYear as DBClosedYear
+)
+from app.utils.snapshots import obtener_snapshot_ceplan
+
+TIPOS_ROLLUP = ("ppr", "ceplan")
+
+# Orden de las series en la matriz de curvas (codigo, año, mes, serie)
+SERIES_ROLLUP = (
+    "programado", "ejecutado", "programado_acumulado", "ejecutado_acumulado"
+)
+
+
+def obtener_anos_cerrados(db: Session) -> List[int]:
+    """
+    Obtiene los años cerrados
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        Lista de años cerrados en orden ascendente
+    """
+    consulta = db.query(DBClosedYear.ano_ejecucion).order_by(DBClosedYear.ano_ejecucion)
+    return [ano for (ano,) in consulta.all()]
+
+
+def cerrar_ano(db: Session, ano_ejecucion: int,
+               user_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Congela los rollups mensuales de PPR y CEPLAN de un año y lo marca como cerrado
+
+    Los PPR se copian desde ppr_progress_summary con un INSERT ... SELECT y
+    los subproductos CEPLAN desde la instantánea del año. No confirma la
+    transacción.
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año a cerrar
+        user_id: Usuario que cierra el año
+
+    Returns:
+        Dict con la cantidad de filas congeladas por tipo
+    """
+    rollups = DBAnnualRollup.__table__
+    resumen = DBPPRProgressSummary
+    ahora = datetime.utcnow()
+
+    # Rollups que pudieran quedar de un cierre anterior revertido
+    db.execute(rollups.delete().where(rollups.c.ano_ejecucion == ano_ejecucion))
+
+    resultado_ppr = db.execute(rollups.insert().from_select(
+        ['tipo', 'codigo', 'ano_ejecucion', 'mes_numero', 'programado', 'ejecutado',
+         'programado_acumulado', 'ejecutado_acumulado', 'created_at', 'updated_at'],
+        select(
+            literal("ppr"), DBPPR.codigo, resumen.ano_ejecucion, resumen.mes_numero,
+            resumen.programado, resumen.ejecutado, resumen.programado_acumulado,
+            resumen.ejecutado_acumulado, literal(ahora), literal(ahora)
+        )
+        .join(DBPPR, DBPPR.id == resumen.ppr_id)
+        .where(resumen.ano_ejecucion == ano_ejecucion)
+    ))
+
+    ceplan = obtener_snapshot_ceplan(db, ano_ejecucion)
+    acumulado = np.cumsum(ceplan.valores, axis=1)
+    filas_ceplan = [
+        {
+            'tipo': "ceplan",
+            'codigo': codigo,
+            'ano_ejecucion': ano_ejecucion,
+            'mes_numero': mes + 1,
+            'programado': float(ceplan.programado[i, mes]),
+            'ejecutado': float(ceplan.ejecutado[i, mes]),
+            'programado_acumulado': float(acumulado[i, mes, 0]),
+            'ejecutado_acumulado': float(acumulado[i, mes, 1]),
+            'created_at': ahora,
+            'updated_at': ahora
+        }
+        for i, codigo in enumerate(ceplan.codigos)
+        for mes in range(12)
+    ]
+    for lote in iterar_lotes(filas_ceplan):
+        db.execute(rollups.insert(), lote)
+
+    db.add(DBClosedYear(ano_ejecucion=ano_ejecucion, closed_by_id=user_id))
+
+    return {
+        "ano_ejecucion": ano_ejecucion,
+        "filas_ppr": resultado_ppr.rowcount,
+        "filas_ceplan": len(filas_ceplan)
+    }
+
+
+def obtener_tendencias(db: Session, tipo: str, codigos: List[str], ano_desde: int,
+                       ano_hasta: int) -> Dict[str, Any]:
+    """
+    Obtiene las curvas mensuales de varios códigos para un rango de años
+
+    Los años cerrados se leen de annual_rollups en una sola consulta por
+    índice; los años abiertos se completan con datos vigentes
+    (ppr_progress_summary o la instantánea CEPLAN).
+
+    Args:
+        db: Sesión de base de datos
+        tipo: ppr o ceplan
+        codigos: Códigos de PPR o de subproducto
+        ano_desde: Primer año del rango
+        ano_hasta: Último año del rango
+
+    Returns:
+        Dict con una curva por código y año
+    """
+    anos = list(range(ano_desde, ano_hasta + 1))
+    cerrados = set(obtener_anos_cerrados(db)) & set(anos)
+    abiertos = [ano for ano in anos if ano not in cerrados]
+    pos_codigo = {codigo: i for i, codigo in enumerate(codigos)}
+    pos_ano = {ano: j for j, ano in enumerate(anos)}
+
+    curvas = np.zeros((len(codigos), len(anos), 12, len(SERIES_ROLLUP)))
+    con_datos = np.zeros((len(codigos), len(anos)), dtype=bool)
+
+    def acumular(filas) -> None:
+        for codigo, ano, mes_numero, *valores in filas:
+            i, j = pos_codigo[codigo], pos_ano[ano]
+            curvas[i, j, mes_numero - 1] = valores
+            con_datos[i, j] = True
+
+    if cerrados:
+        acumular(
+            db.query(DBAnnualRollup.codigo, DBAnnualRollup.ano_ejecucion,
+                     DBAnnualRollup.mes_numero,
+                     *[getattr(DBAnnualRollup, serie) for serie in SERIES_ROLLUP])
+            .filter(
+                DBAnnualRollup.tipo == tipo,
+                DBAnnualRollup.codigo.in_(codigos),
+                DBAnnualRollup.ano_ejecucion.in_(sorted(cerrados))
+            )
+            .all()
+        )
+
+    if abiertos and tipo == "ppr":
+        resumen = DBPPRProgressSummary
+        acumular(
+            db.query(DBPPR.codigo, resumen.ano_ejecucion, resumen.mes_numero,
+                     *[getattr(resumen, serie) for serie in SERIES_ROLLUP])
+            .join(DBPPR, DBPPR.id == resumen.ppr_id)
+            .filter(DBPPR.codigo.in_(codigos), resumen.ano_ejecucion.in_(abiertos))
+            .all()
+        )
+    elif abiertos:
+        for ano in abiertos:
+            ceplan = obtener_snapshot_ceplan(db, ano)
+            posiciones = ceplan.posiciones(codigos)
+            encontrados = np.flatnonzero(posiciones >= 0)
+            valores = ceplan.valores[posiciones[encontrados]]
+            j = pos_ano[ano]
+            curvas[encontrados, j, :, 0:2] = valores
+            curvas[encontrados, j, :, 2:4] = np.cumsum(valores, axis=1)
+            con_datos[encontrados, j] = True
+
+    resultado = []
+    for i, codigo in enumerate(codigos):
+        for j, ano in enumerate(anos):
+            if not con_datos[i, j]:
+                continue
+            curva = {
+                serie: curvas[i, j, :, k].tolist()
+                for k, serie in enumerate(SERIES_ROLLUP)
+            }
+            resultado.append({
+                "codigo": codigo,
+                "ano_ejecucion": ano,
+                "cerrado": ano in cerrados,
+                **curva
+            })
+
+    return {
+        "tipo": tipo,
+        "ano_desde": ano_desde,
+        "ano_hasta": ano_hasta,
+        "anos_cerrados": sorted(cerrados),
+        "curvas": resultado
+    }
@@ -0,0 +1,356 @@
+"""
+Búsqueda de texto sobre PPR y CEPLAN para Monitor PPR v2
+"""
+import bisect
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import literal
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+from app.database.models import PPR as DBPPR, CEPLAN as DBCEPLAN
+from app.utils.cache import CacheVersionada
+
+TIPOS_BUSQUEDA = ("ppr", "ceplan")
+
+# Puntaje fijo de las coincidencias por prefijo de código (van primero)
+PUNTAJE_CODIGO = 1000.0
+# Peso de un término que coincide solo como prefijo de una palabra
+PESO_PREFIJO = 0.5
+# Largo mínimo de un término de búsqueda
+LARGO_MINIMO_TERMINO = 2
+
+# Marcas diacríticas combinables que quedan al descomponer (NFKD) letras acentuadas
+_MARCAS_DIACRITICAS = re.compile('[\u0300-\u036f]')
+
+_cache_indices = CacheVersionada("indice_busqueda")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """
+    Pasa un texto a minúsculas y le quita los acentos
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        str: Texto normalizado
+    """
+    texto = (texto or '').lower()
+    if texto.isascii():
+        return texto
+    return _MARCAS_DIACRITICAS.sub('', unicodedata.normalize('NFKD', texto))
+
+
+def terminos(texto: Optional[str]) -> List[str]:
+    """
+    Divide un texto en términos normalizados
+
+    Args:
+        texto: Texto a dividir
+
+    Returns:
+        Lista de términos de al menos LARGO_MINIMO_TERMINO caracteres
+    """
+    return [
+        t for t in re.findall(r'\w+', normalizar(texto))
+        if len(t) >= LARGO_MINIMO_TERMINO
+    ]
+
+
+def _escapar_like(valor: str) -> str:
+    """
+    Escapa los comodines de LIKE
+
+    Args:
+        valor: Texto literal
+
+    Returns:
+        str: Texto apto para un patrón LIKE con escape "\\"
+    """
+    return valor.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class IndiceTexto:
+    """
+    Índice invertido en memoria de un tipo de registro (PPR o CEPLAN)
+
+    Se usa cuando la base de datos no tiene índices FULLTEXT (SQLite). Los
+    términos se guardan ordenados para resolver prefijos con búsqueda
+    binaria, y las filas de cada término se concatenan en ese mismo orden,
+    de modo que todas las palabras con un prefijo ocupan un tramo contiguo.
+    Se construye con tuplas (id, codigo, nombre, ano_ejecucion, *textos).
+
+    Attributes:
+        ids: Id de cada fila
+        codigos: Código de cada fila
+        nombres: Nombre de cada fila
+        anos: Año de ejecución de cada fila
+        vocabulario: Términos ordenados
+        publicaciones: Filas de todos los términos, concatenadas en orden de
+            vocabulario
+        inicios: Posición en publicaciones donde empieza cada término (n + 1)
+        idf: Peso de cada término del vocabulario
+        codigos_ordenados: Códigos normalizados ordenados
+        filas_codigo: Fila de cada código de codigos_ordenados
+    """
+
+    __slots__ = ("ids", "codigos", "nombres", "anos", "vocabulario", "publicaciones",
+                 "inicios", "idf", "codigos_ordenados", "filas_codigo")
+
+    def __init__(self, filas: List[Any]):
+        self.ids = np.array([fila[0] for fila in filas], dtype=np.int64)
+        self.codigos = [fila[1] for fila in filas]
+        self.nombres = [fila[2] for fila in filas]
+        self.anos = np.array([fila[3] for fila in filas], dtype=np.int64)
+
+        por_termino: Dict[str, List[int]] = {}
+        for posicion, fila in enumerate(filas):
+            texto = ' '.join(filter(None, (fila[2],) + tuple(fila[4:])))
+            for termino in set(terminos(texto)):
+                por_termino.setdefault(termino, []).append(posicion)
+
+        self.vocabulario = sorted(por_termino)
+        cantidades = np.array(
+            [len(por_termino[t]) for t in self.vocabulario], dtype=np.int64
+        )
+        self.inicios = np.concatenate(([0], np.cumsum(cantidades)))
+        self.publicaciones = np.fromiter(
+            (posicion for t in self.vocabulario for posicion in por_termino[t]),
+            dtype=np.int64, count=int(self.inicios[-1])
+        )
+        self.idf = np.log1p(max(len(filas), 1) / np.maximum(cantidades, 1))
+
+        pares = sorted(
+            (normalizar(codigo), posicion)
+            for posicion, codigo in enumerate(self.codigos)
+        )
+        self.codigos_ordenados = [codigo for codigo, _ in pares]
+        self.filas_codigo = np.array(
+            [posicion for _, posicion in pares], dtype=np.int64
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def buscar_texto(self, consulta: List[str]) -> np.ndarray:
+        """
+        Calcula el puntaje de cada fila para los términos de la consulta
+
+        Todos los términos deben coincidir, como palabra completa o como
+        prefijo de una palabra (con menor peso).
+
+        Args:
+            consulta: Términos normalizados
+
+        Returns:
+            np.ndarray: Puntaje por fila (0 si no coincide)
+        """
+        puntaje = np.zeros(len(self))
+        coincidencias = np.zeros(len(self), dtype=np.int64)
+        for termino in consulta:
+            inicio = bisect.bisect_left(self.vocabulario, termino)
+            fin = bisect.bisect_left(self.vocabulario, termino + '\uffff')
+            pesos = self.idf[inicio:fin] * PESO_PREFIJO
+            if inicio < fin and self.vocabulario[inicio] == termino:
+                pesos[0] = self.idf[inicio]
+            filas = self.publicaciones[self.inicios[inicio]:self.inicios[fin]]
+            mejor = np.zeros(len(self))
+            por_fila = np.repeat(pesos, np.diff(self.inicios[inicio:fin + 1]))
+            np.maximum.at(mejor, filas, por_fila)
+            puntaje += mejor
+            coincidencias += mejor > 0
+        puntaje[coincidencias < len(consulta)] = 0.0
+        return puntaje
+
+    def buscar_codigo(self, prefijo: str) -> np.ndarray:
+        """
+        Obtiene las filas cuyo código empieza con el prefijo
+
+        Args:
+            prefijo: Prefijo normalizado
+
+        Returns:
+            np.ndarray: Filas en orden de código
+        """
+        inicio = bisect.bisect_left(self.codigos_ordenados, prefijo)
+        fin = bisect.bisect_left(self.codigos_ordenados, prefijo + '\uffff')
+        return self.filas_codigo[inicio:fin]
+
+
+def _construir_indice(db: Session, tipo: str) -> IndiceTexto:
+    """
+    Carga los textos de un tipo de registro y construye su índice
+
+    Args:
+        db: Sesión de base de datos
+        tipo: ppr o ceplan
+
+    Returns:
+        IndiceTexto: Índice del tipo
+    """
+    if tipo == "ppr":
+        consulta = db.query(
+            DBPPR.id, DBPPR.codigo, DBPPR.nombre, DBPPR.ano_ejecucion, DBPPR.descripcion
+        )
+    else:
+        consulta = db.query(
+            DBCEPLAN.id, DBCEPLAN.codigo_sub_producto, DBCEPLAN.subproducto,
+            DBCEPLAN.ano_ejecucion
+        )
+    return IndiceTexto([tuple(fila) for fila in consulta.all()])
+
+
+def _buscar_en_memoria(
+        db: Session, tipo: str, consulta: List[str], prefijo: str,
+        ano_ejecucion: Optional[int], limite: int) -> List[Dict[str, Any]]:
+    """
+    Busca en el índice en memoria del tipo (se reconstruye con cada escritura)
+
+    Args:
+        db: Sesión de base de datos
+        tipo: ppr o ceplan
+        consulta: Términos normalizados
+        prefijo: Prefijo de código normalizado
+        ano_ejecucion: Año de ejecución (opcional)
+        limite: Cantidad máxima de resultados
+
+    Returns:
+        Lista de resultados ordenados por puntaje
+    """
+    indice = _cache_indices.obtener(tipo, lambda: _construir_indice(db, tipo))
+    puntaje = indice.buscar_texto(consulta) if consulta else np.zeros(len(indice))
+    if prefijo:
+        puntaje[indice.buscar_codigo(prefijo)] += PUNTAJE_CODIGO
+    if ano_ejecucion:
+        puntaje[indice.anos != ano_ejecucion] = 0.0
+
+    candidatos = np.flatnonzero(puntaje > 0)
+    if len(candidatos) > limite:
+        mejores = np.argpartition(-puntaje[candidatos], limite - 1)[:limite]
+        candidatos = candidatos[mejores]
+    candidatos = candidatos[np.lexsort((indice.ids[candidatos], -puntaje[candidatos]))]
+
+    return [
+        {
+            "tipo": tipo,
+            "id": int(indice.ids[fila]),
+            "codigo": indice.codigos[fila],
+            "nombre": indice.nombres[fila],
+            "ano_ejecucion": int(indice.anos[fila]),
+            "coincidencia": "codigo" if puntaje[fila] >= PUNTAJE_CODIGO else "texto",
+            "puntaje": round(float(puntaje[fila]), 4)
+        }
+        for fila in candidatos.tolist()
+    ]
+
+
+def _buscar_fulltext(db: Session, tipo: str, consulta: List[str], prefijo: str,
+                     ano_ejecucion: Optional[int], limite: int) -> List[Dict[str, Any]]:
+    """
+    Busca con los índices FULLTEXT de MariaDB/MySQL y LIKE por prefijo de código
+
+    Args:
+        db: Sesión de base de datos
+        tipo: ppr o ceplan
+        consulta: Términos normalizados
+        prefijo: Prefijo de código
+        ano_ejecucion: Año de ejecución (opcional)
+        limite: Cantidad máxima de resultados
+
+    Returns:
+        Lista de resultados ordenados por puntaje
+    """
+    if tipo == "ppr":
+        modelo, codigo, nombre = DBPPR, DBPPR.codigo, DBPPR.nombre
+        textos = (DBPPR.nombre, DBPPR.descripcion)
+    else:
+        modelo, codigo = DBCEPLAN, DBCEPLAN.codigo_sub_producto
+        nombre = DBCEPLAN.subproducto
+        textos = (DBCEPLAN.subproducto,)
+
+    resultados: Dict[int, Dict[str, Any]] = {}
+
+    def agregar(filas, coincidencia: str) -> None:
+        for fila in filas:
+            actual = resultados.get(fila.id)
+            puntaje = float(fila.puntaje or 0.0)
+            if coincidencia == "codigo":
+                puntaje += PUNTAJE_CODIGO
+            if actual is None or puntaje > actual["puntaje"]:
+                resultados[fila.id] = {
+                    "tipo": tipo,
+                    "id": fila.id,
+                    "codigo": fila.codigo,
+                    "nombre": fila.nombre,
+                    "ano_ejecucion": fila.ano_ejecucion,
+                    "coincidencia": coincidencia,
+                    "puntaje": round(puntaje, 4)
+                }
+
+    if prefijo:
+        query = db.query(
+            modelo.id, codigo.label("codigo"), nombre.label("nombre"),
+            modelo.ano_ejecucion, literal(0.0).label("puntaje")
+        ).filter(codigo.like(f"{_escapar_like(prefijo)}%", escape='\\'))
+        if ano_ejecucion:
+            query = query.filter(modelo.ano_ejecucion == ano_ejecucion)
+        agregar(query.order_by(codigo).limit(limite).all(), "codigo")
+
+    if consulta:
+        # Modo booleano: todos los términos obligatorios y con comodín de prefijo
+        booleana = ' '.join(f'+{t}*' for t in consulta)
+        relevancia = match(*textos, against=booleana).in_boolean_mode()
+        query = db.query(
+            modelo.id, codigo.label("codigo"), nombre.label("nombre"),
+            modelo.ano_ejecucion, relevancia.label("puntaje")
+        ).filter(relevancia > 0)
+        if ano_ejecucion:
+            query = query.filter(modelo.ano_ejecucion == ano_ejecucion)
+        agregar(query.order_by(relevancia.desc()).limit(limite).all(), "texto")
+
+    return sorted(resultados.values(), key=lambda r: (-r["puntaje"], r["id"]))[:limite]
+
+
+def buscar(db: Session, q: str, tipo: Optional[str] = None,
+           ano_ejecucion: Optional[int] = None, limite: int = 20) -> Dict[str, Any]:
+    """
+    Busca PPR y subproductos CEPLAN por texto y por prefijo de código
+
+    En MariaDB/MySQL usa los índices FULLTEXT de nombre/descripcion y
+    subproducto; en otros motores (SQLite) usa un índice invertido en
+    memoria que se reconstruye cuando cambia la versión de datos. Las
+    coincidencias por prefijo de código (autocompletado) van primero.
+
+    Args:
+        db: Sesión de base de datos
+        q: Texto a buscar
+        tipo: ppr o ceplan (ambos si es None)
+        ano_ejecucion: Año de ejecución (opcional)
+        limite: Cantidad máxima de resultados por tipo
+
+    Returns:
+        Dict con los resultados ordenados por puntaje
+    """
+    consulta = list(dict.fromkeys(terminos(q)))
+    # Solo un texto sin espacios puede ser el comienzo de un código
+    prefijo = q.strip() if len(q.split()) == 1 else ''
+    tipos = [tipo] if tipo else list(TIPOS_BUSQUEDA)
+
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        buscar_tipo = _buscar_fulltext
+    else:
+        buscar_tipo = _buscar_en_memoria
+        prefijo = normalizar(prefijo)
+    resultados = [
+        r for t in tipos
+        for r in buscar_tipo(db, t, consulta, prefijo, ano_ejecucion, limite)
+    ]
+
+    resultados.sort(key=lambda r: -r["puntaje"])
+    return {
+        "q": q,
+        "total": len(resultados),
+        "resultados": resultados
+    }
@@ -0,0 +1,146 @@
+"""
+Serialización rápida de respuestas (orjson, MessagePack, gzip/brotli) para
+Monitor PPR v2
+"""
+import gzip
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional: se usa json de la biblioteca estándar
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Dependencia opcional: sin ella solo se ofrece JSON
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional: sin ella solo se comprime con gzip
+    brotli = None
+
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPES_MSGPACK = ("application/msgpack", "application/x-msgpack")
+
+# Las respuestas más pequeñas se envían sin comprimir
+TAMANO_MINIMO_COMPRESION = 1024
+NIVEL_GZIP = 5
+NIVEL_BROTLI = 4
+
+
+def _valor_serializable(valor: Any) -> Any:
+    """
+    Convierte los tipos no soportados por el serializador (fechas)
+
+    Args:
+        valor: Valor no serializable de forma nativa
+
+    Returns:
+        Representación ISO 8601 de la fecha
+
+    Raises:
+        TypeError: Si el tipo no es soportado
+    """
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def prefiere_msgpack(request: Request) -> bool:
+    """
+    Indica si el cliente pidió MessagePack en la cabecera Accept y está disponible
+
+    Args:
+        request: Petición recibida
+
+    Returns:
+        bool: True si la respuesta debe enviarse en MessagePack
+    """
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MEDIA_TYPES_MSGPACK)
+
+
+def _codificar(contenido: Any, en_msgpack: bool) -> bytes:
+    """
+    Codifica el contenido en MessagePack o JSON
+
+    Args:
+        contenido: Dicts, listas y valores simples
+        en_msgpack: True para MessagePack
+
+    Returns:
+        bytes: Contenido codificado
+    """
+    if en_msgpack:
+        return msgpack.packb(contenido, default=_valor_serializable, use_bin_type=True)
+    if orjson is not None:
+        # orjson serializa las fechas sin zona horaria igual que pydantic
+        return orjson.dumps(contenido, default=_valor_serializable)
+    return json.dumps(
+        contenido, default=_valor_serializable, ensure_ascii=False,
+        separators=(',', ':')
+    ).encode('utf-8')
+
+
+def _comprimir(request: Request, cuerpo: bytes) -> tuple:
+    """
+    Comprime el cuerpo según la cabecera Accept-Encoding
+
+    Args:
+        request: Petición recibida
+        cuerpo: Cuerpo sin comprimir
+
+    Returns:
+        Tuple (cuerpo, codificación) con codificación None si no se comprimió
+    """
+    if len(cuerpo) < TAMANO_MINIMO_COMPRESION:
+        return cuerpo, None
+    aceptadas = {
+        codificacion.split(';')[0].strip().lower()
+        for codificacion in request.headers.get("accept-encoding", "").split(',')
+    }
+    if brotli is not None and "br" in aceptadas:
+        return brotli.compress(cuerpo, quality=NIVEL_BROTLI), "br"
+    if "gzip" in aceptadas:
+        return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP), "gzip"
+    return cuerpo, None
+
+
+def respuesta_serializada(request: Optional[Request], contenido: Any,
+                          cabeceras: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Construye una respuesta sin pasar por la validación de pydantic
+
+    Usa orjson (o json si no está instalado), MessagePack si el cliente lo
+    pide en Accept, y gzip/brotli según Accept-Encoding.
+
+    Args:
+        request: Petición recibida (None para JSON sin comprimir)
+        contenido: Dicts, listas y valores simples con los mismos nombres de campo
+            del esquema
+        cabeceras: Cabeceras adicionales de la respuesta
+
+    Returns:
+        Response: Respuesta codificada
+    """
+    en_msgpack = request is not None and prefiere_msgpack(request)
+    cuerpo = _codificar(contenido, en_msgpack)
+
+    cabeceras = dict(cabeceras or {})
+    if request is not None:
+        cuerpo, codificacion = _comprimir(request, cuerpo)
+        if codificacion:
+            cabeceras["Content-Encoding"] = codificacion
+        cabeceras["Vary"] = "Accept, Accept-Encoding"
+
+    return Response(
+        content=cuerpo,
+        media_type=MEDIA_TYPES_MSGPACK[0] if en_msgpack else MEDIA_TYPE_JSON,
+        headers=cabeceras
+    )
@@ -0,0 +1,133 @@
+"""
+Instantáneas columnares de datos por año para Monitor PPR v2
+"""
+from typing import Iterable
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from app.database.models import CEPLAN as DBCEPLAN
+from app.utils.cache import CacheVersionada
+from app.utils.validators import MESES_VALIDOS
+
+# Posiciones del último eje de CeplanSnapshot.valores
+PROGRAMADO = 0
+EJECUTADO = 1
+
+# Columnas en el orden (mes, [programado, ejecutado]) de la matriz de valores
+CEPLAN_COLUMNAS_SNAPSHOT = [
+    columna for mes in MESES_VALIDOS for columna in (f'{mes}_prog', f'{mes}_eje')
+]
+
+_cache_ceplan = CacheVersionada("ceplan_snapshot")
+
+
+class CeplanSnapshot:
+    """
+    Datos mensuales CEPLAN de un año en arreglos NumPy
+
+    Attributes:
+        ano_ejecucion: Año de los datos
+        codigos: Códigos de subproducto (n,), ordenados
+        subproductos: Nombres de subproducto (n,)
+        valores: Matriz (n, 12, 2) con programado y ejecutado por mes
+        indice: Índice código -> fila
+    """
+
+    __slots__ = ("ano_ejecucion", "codigos", "subproductos", "valores", "indice")
+
+    def __init__(self, ano_ejecucion: int, codigos: np.ndarray,
+                 subproductos: np.ndarray, valores: np.ndarray):
+        self.ano_ejecucion = ano_ejecucion
+        self.codigos = codigos
+        self.subproductos = subproductos
+        self.valores = valores
+        self.indice = pd.Index(codigos)
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    @property
+    def programado(self) -> np.ndarray:
+        """Matriz (n, 12) de valores programados"""
+        return self.valores[:, :, PROGRAMADO]
+
+    @property
+    def ejecutado(self) -> np.ndarray:
+        """Matriz (n, 12) de valores ejecutados"""
+        return self.valores[:, :, EJECUTADO]
+
+    def posiciones(self, codigos: Iterable[str]) -> np.ndarray:
+        """
+        Obtiene las filas de varios códigos de subproducto
+
+        Args:
+            codigos: Códigos de subproducto
+
+        Returns:
+            np.ndarray: Fila de cada código, -1 si no existe
+        """
+        return self.indice.get_indexer(list(codigos))
+
+    def fila(self, codigo: str) -> int:
+        """
+        Obtiene la fila de un código de subproducto
+
+        Args:
+            codigo: Código de subproducto
+
+        Returns:
+            int: Fila del código, -1 si no existe
+        """
+        return int(self.posiciones([codigo])[0])
+
+
+def construir_snapshot_ceplan(db: Session, ano_ejecucion: int) -> CeplanSnapshot:
+    """
+    Carga los datos CEPLAN de un año con una sola consulta por columnas
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución
+
+    Returns:
+        CeplanSnapshot: Instantánea del año
+    """
+    filas = (
+        db.query(
+            DBCEPLAN.codigo_sub_producto,
+            DBCEPLAN.subproducto,
+            *[getattr(DBCEPLAN, columna) for columna in CEPLAN_COLUMNAS_SNAPSHOT]
+        )
+        .filter(DBCEPLAN.ano_ejecucion == ano_ejecucion)
+        .order_by(DBCEPLAN.codigo_sub_producto)
+        .all()
+    )
+
+    codigos = np.array([fila[0] for fila in filas], dtype=object)
+    subproductos = np.array([fila[1] for fila in filas], dtype=object)
+    valores = np.array([fila[2:] for fila in filas], dtype=float)
+    valores = valores.reshape(len(filas), 12, 2)
+    # Columnas nulas en la base se tratan como 0, igual que los valores por defecto
+    np.nan_to_num(valores, copy=False)
+    # La instantánea se comparte entre peticiones a través de la caché
+    valores.flags.writeable = False
+
+    return CeplanSnapshot(ano_ejecucion, codigos, subproductos, valores)
+
+
+def obtener_snapshot_ceplan(db: Session, ano_ejecucion: int) -> CeplanSnapshot:
+    """
+    Obtiene la instantánea CEPLAN de un año desde la caché o la base de datos
+
+    La caché se invalida con cualquier escritura (ver app.utils.cache).
+
+    Args:
+        db: Sesión de base de datos
+        ano_ejecucion: Año de ejecución
+
+    Returns:
+        CeplanSnapshot: Instantánea del año (no debe modificarse)
+    """
+    return _cache_ceplan.obtener(
+        ano_ejecucion, lambda: construir_snapshot_ceplan(db, ano_ejecucion)
+    )
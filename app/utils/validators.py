@@ -1,8 +1,33 @@
 """
 Validadores para Monitor PPR v2
 """
-from typing import Any
+from typing import Any, Dict, List, Tuple, Union
 import re
+import numpy as np
+import pandas as pd
+
+# Patrones precompilados (se usan tanto en validaciones escalares como por columna)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Puede ajustarse según el formato real de los códigos PPR
+# Ejemplo: entre 10 y 20 caracteres alfanuméricos mayúsculas
+CODIGO_PPR_PATTERN = re.compile(r'^[A-Z0-9]{10,20}$')
+CODIGO_SUB_PRODUCTO_PATTERN = re.compile(r'^\d{7}$')  # 7 dígitos numéricos
+
+MESES_VALIDOS = ('ene', 'feb', 'mar', 'abr', 'may', 'jun',
+                 'jul', 'ago', 'sep', 'oct', 'nov', 'dic')
+
+ANO_MINIMO = 2000
+ANO_ACTUAL = 2025  # Ajustar según sea necesario
+
+# Códigos de motivo devueltos por las validaciones por columna
+MOTIVO_VALIDO = ""
+MOTIVO_VACIO = "vacio"
+MOTIVO_FORMATO_INVALIDO = "formato_invalido"
+MOTIVO_NO_NUMERICO = "no_numerico"
+MOTIVO_FUERA_DE_RANGO = "fuera_de_rango"
+MOTIVO_MES_INVALIDO = "mes_invalido"
+
+ValoresColumna = Union[pd.Series, np.ndarray, List[Any]]
 
 
 def validate_email(email: str) -> bool:
@@ -15,8 +40,7 @@ def validate_email(email: str) -> bool:
     Returns:
         bool: True si el email es válido, False en caso contrario
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def validate_codigo_ppr(codigo: str) -> bool:
@@ -29,9 +53,7 @@ def validate_codigo_ppr(codigo: str) -> bool:
     Returns:
         bool: True si el código es válido, False en caso contrario
     """
-    # Puede ajustarse según el formato real de los códigos PPR
-    pattern = r'^[A-Z0-9]{10,20}$'  # Ejemplo: entre 10 y 20 caracteres alfanuméricos mayúsculas
-    return re.match(pattern, codigo) is not None
+    return CODIGO_PPR_PATTERN.match(codigo) is not None
 
 
 def validate_codigo_sub_producto(codigo: str) -> bool:
@@ -44,9 +66,7 @@ def validate_codigo_sub_producto(codigo: str) -> bool:
     Returns:
         bool: True si el código es válido, False en caso contrario
     """
-    # Debe tener 7 dígitos numéricos
-    pattern = r'^\d{7}$'
-    return re.match(pattern, codigo) is not None
+    return CODIGO_SUB_PRODUCTO_PATTERN.match(codigo) is not None
 
 
 def validate_percentage(value: float) -> bool:
@@ -72,8 +92,7 @@ def validate_year(year: int) -> bool:
     Returns:
         bool: True si el año es válido, False en caso contrario
     """
-    current_year = 2025  # Ajustar según sea necesario
-    return 2000 <= year <= current_year + 10
+    return ANO_MINIMO <= year <= ANO_ACTUAL + 10
 
 
 def validate_month(mes: str) -> bool:
@@ -86,9 +105,7 @@ def validate_month(mes: str) -> bool:
     Returns:
         bool: True si el mes es válido, False en caso contrario
     """
-    meses_validos = ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 
-                     'jul', 'ago', 'sep', 'oct', 'nov', 'dic']
-    return mes.lower() in meses_validos
+    return mes.lower() in MESES_VALIDOS
 
 
 def validate_positive_number(value: float) -> bool:
@@ -120,4 +137,147 @@ def validate_not_empty(value: Any) -> bool:
         return value.strip() != ""
     if isinstance(value, (list, dict)):
         return len(value) > 0
-    return True
\ No newline at end of file
+    return True
+
+
+def _como_series(valores: ValoresColumna) -> pd.Series:
+    """
+    Convierte una columna de valores en una Serie de pandas
+
+    Args:
+        valores: Serie, arreglo NumPy o lista de valores
+
+    Returns:
+        pd.Series: Serie con los mismos valores (y el mismo índice si ya era Serie)
+    """
+    if isinstance(valores, pd.Series):
+        return valores
+    return pd.Series(np.asarray(valores, dtype=object))
+
+
+def _validar_patron_series(valores: ValoresColumna,
+                           pattern: re.Pattern) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida una columna de textos contra un patrón precompilado
+
+    Args:
+        valores: Columna de valores
+        pattern: Patrón precompilado
+
+    Returns:
+        Tuple con la máscara booleana de válidos y el arreglo de motivos
+    """
+    serie = _como_series(valores)
+    vacios = serie.isna().to_numpy()
+    coincide = serie.astype(str).str.match(pattern).fillna(False).to_numpy(dtype=bool)
+    validos = coincide & ~vacios
+
+    motivos = np.full(len(serie), MOTIVO_VALIDO, dtype=object)
+    motivos[~validos] = MOTIVO_FORMATO_INVALIDO
+    motivos[vacios] = MOTIVO_VACIO
+    return validos, motivos
+
+
+def validate_codigo_ppr_series(
+        valores: ValoresColumna) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida una columna completa de códigos de PPR
+
+    Args:
+        valores: Serie, arreglo NumPy o lista de códigos
+
+    Returns:
+        Tuple con la máscara booleana de códigos válidos y el arreglo de
+        motivos por fila ("" si es válido, "vacio" o "formato_invalido")
+    """
+    return _validar_patron_series(valores, CODIGO_PPR_PATTERN)
+
+
+def validate_codigo_sub_producto_series(
+        valores: ValoresColumna) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida una columna completa de códigos de subproducto CEPLAN
+
+    Args:
+        valores: Serie, arreglo NumPy o lista de códigos
+
+    Returns:
+        Tuple con la máscara booleana de códigos válidos y el arreglo de
+        motivos por fila ("" si es válido, "vacio" o "formato_invalido")
+    """
+    return _validar_patron_series(valores, CODIGO_SUB_PRODUCTO_PATTERN)
+
+
+def validate_month_series(valores: ValoresColumna) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida una columna completa de meses (ene, feb, mar, etc.)
+
+    Args:
+        valores: Serie, arreglo NumPy o lista de meses
+
+    Returns:
+        Tuple con la máscara booleana de meses válidos y el arreglo de
+        motivos por fila ("" si es válido, "vacio" o "mes_invalido")
+    """
+    serie = _como_series(valores)
+    vacios = serie.isna().to_numpy()
+    en_meses = serie.astype(str).str.lower().isin(MESES_VALIDOS).to_numpy(dtype=bool)
+    validos = en_meses & ~vacios
+
+    motivos = np.full(len(serie), MOTIVO_VALIDO, dtype=object)
+    motivos[~validos] = MOTIVO_MES_INVALIDO
+    motivos[vacios] = MOTIVO_VACIO
+    return validos, motivos
+
+
+def validate_year_series(valores: ValoresColumna) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida una columna completa de años
+
+    Args:
+        valores: Serie, arreglo NumPy o lista de años
+
+    Returns:
+        Tuple con la máscara booleana de años válidos y el arreglo de
+        motivos por fila ("" si es válido, "vacio", "no_numerico" o
+        "fuera_de_rango")
+    """
+    serie = _como_series(valores)
+    vacios = serie.isna().to_numpy()
+    numeros = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+    no_numericos = np.isnan(numeros) & ~vacios
+    with np.errstate(invalid='ignore'):
+        en_rango = (numeros >= ANO_MINIMO) & (numeros <= ANO_ACTUAL + 10)
+
+    motivos = np.full(len(serie), MOTIVO_VALIDO, dtype=object)
+    motivos[~en_rango] = MOTIVO_FUERA_DE_RANGO
+    motivos[no_numericos] = MOTIVO_NO_NUMERICO
+    motivos[vacios] = MOTIVO_VACIO
+    return en_rango, motivos
+
+
+def generar_reporte_errores(valores: ValoresColumna, validos: np.ndarray,
+                            motivos: np.ndarray,
+                            campo: str = "") -> List[Dict[str, Any]]:
+    """
+    Genera un reporte de errores a partir del resultado de una validación por columna
+
+    Args:
+        valores: Columna validada
+        validos: Máscara booleana de valores válidos
+        motivos: Motivo por fila
+        campo: Nombre del campo validado
+
+    Returns:
+        Lista de diccionarios {'fila', 'campo', 'valor', 'motivo'} solo con las
+        filas inválidas
+    """
+    serie = _como_series(valores)
+    invalidos = np.flatnonzero(~validos)
+    filas = serie.index.to_numpy()[invalidos]
+    return [
+        {"fila": fila, "campo": campo, "valor": valor, "motivo": motivo}
+        for fila, valor, motivo in zip(
+            filas.tolist(), serie.iloc[invalidos].tolist(), motivos[invalidos].tolist()
+        )
+    ]
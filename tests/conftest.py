@@ -0,0 +1,141 @@
+"""
+Configuración común de las pruebas de Monitor PPR v2
+
+Las pruebas usan una base SQLite en memoria compartida por todas las
+sesiones de la prueba (StaticPool), de modo que la API, los generadores de
+exportación y los trabajos de importación ven los mismos datos.
+"""
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import models as db_models
+from app.database.session import Base, get_db
+from app.utils.auth import get_current_active_user_db
+from app.utils.cache import incrementar_version_datos
+from app.utils.helpers import CEPLAN_COLUMNAS_MENSUALES, MESES
+
+ANO = 2024
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    session.add(db_models.Role(id=1, name="admin"))
+    session.add(db_models.User(id=1, username="admin", email="admin@example.com",
+                               hashed_password="x", role_id=1))
+    session.commit()
+    # Las cachés de proceso son globales: cada prueba parte de una versión nueva
+    incrementar_version_datos()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(db, session_factory, monkeypatch):
+    from app.main import app
+    from app.utils import exports
+
+    def get_db_prueba():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(exports, "SessionLocal", session_factory)
+    app.dependency_overrides[get_db] = get_db_prueba
+    app.dependency_overrides[get_current_active_user_db] = (
+        lambda: db.query(db_models.User).first()
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def filas_ceplan(cantidad, ejecutado=1.0, inicio=1):
+    """
+    Genera filas CEPLAN válidas con el mismo valor en todas las columnas mensuales
+    """
+    return [
+        {
+            "codigo_sub_producto": str(1000000 + numero),
+            "subproducto": f"Subproducto {numero}",
+            **{columna: ejecutado if columna.startswith("EJE") else 10.0
+               for columna in CEPLAN_COLUMNAS_MENSUALES}
+        }
+        for numero in range(inicio, inicio + cantidad)
+    ]
+
+
+def filas_ppr(cantidad, programado=10.0, inicio=1):
+    """
+    Genera filas PPR válidas con la misma meta en todos los meses
+    """
+    return [
+        {
+            "codigo": f"PPR{numero:08d}",
+            "nombre": f"Producto {numero}",
+            "descripcion": f"Descripción del producto {numero}",
+            "unidad_medida": "unidad",
+            "meta_programada_anual": programado * 12,
+            **{f"{mes}_prog": programado for mes in MESES}
+        }
+        for numero in range(inicio, inicio + cantidad)
+    ]
+
+
+def crear_ppr_legado(db, numero, programado=10.0, ejecutado=None):
+    """
+    Crea un PPR con meta y avances directamente en la base (sin la API)
+    """
+    ppr = db_models.PPR(
+        codigo=f"PPR{numero:08d}", nombre=f"Producto {numero}", unidad_medida="unidad",
+        responsable_planificacion_id=1, ano_ejecucion=ANO, estado="activo"
+    )
+    db.add(ppr)
+    db.flush()
+    db.add(db_models.PPRMeta(
+        ppr_id=ppr.id, ano_ejecucion=ANO, meta_programada_anual=programado * 12,
+        **{f"{mes}_prog": programado for mes in MESES}
+    ))
+    for mes, valor in (ejecutado or {}).items():
+        db.add(db_models.PPRAvance(ppr_id=ppr.id, ano_ejecucion=ANO, mes=mes,
+                                   valor_ejecutado=valor))
+    db.commit()
+    return ppr.id
+
+
+@pytest.fixture
+def escribir_archivo(tmp_path):
+    """
+    Escribe filas en un archivo de importación (xlsx, csv o parquet)
+    """
+    contador = {"n": 0}
+
+    def escribir(filas, formato="xlsx"):
+        contador["n"] += 1
+        ruta = tmp_path / f"archivo_{contador['n']}.{formato}"
+        df = pd.DataFrame(filas)
+        if formato == "xlsx":
+            df.to_excel(ruta, index=False)
+        elif formato == "csv":
+            df.to_csv(ruta, index=False)
+        else:
+            df.to_parquet(ruta, index=False)
+        return str(ruta)
+
+    return escribir
@@ -0,0 +1,86 @@
+"""
+Pruebas de la caché invalidada por versión de datos
+"""
+from datetime import datetime
+import pytest
+from app.api import dashboard
+from app.database import models as db_models
+from app.utils import cache, jobs
+from app.utils.cache import (
+    CacheVersionada, incrementar_version_datos, obtener_version_datos
+)
+from tests.conftest import ANO, crear_ppr_legado
+
+
+@pytest.fixture
+def pool_importacion(monkeypatch):
+    monkeypatch.setattr(cache, "_version_compartida", None)
+    monkeypatch.setattr(jobs, "IMPORT_WORKERS", 1)
+    yield jobs.get_executor()
+    jobs.shutdown_executor()
+
+
+def test_cache_se_invalida_con_cada_escritura():
+    calculos = []
+    cache_prueba = CacheVersionada("prueba")
+
+    def calcular():
+        calculos.append(1)
+        return len(calculos)
+
+    assert cache_prueba.obtener(2024, calcular) == 1
+    assert cache_prueba.obtener(2024, calcular) == 1
+    incrementar_version_datos()
+    assert cache_prueba.obtener(2024, calcular) == 2
+
+
+def test_escrituras_del_pool_de_importacion_invalidan_la_api(pool_importacion):
+    version_inicial = obtener_version_datos()
+
+    # El proceso de importación incrementa el contador compartido con la API
+    futuro = pool_importacion.submit(incrementar_version_datos)
+    version_en_proceso = futuro.result(timeout=60)
+
+    assert version_en_proceso == version_inicial + 1
+    assert obtener_version_datos() == version_en_proceso
+
+
+def test_resumen_del_dashboard_se_recalcula_despues_de_una_escritura(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 5.0})
+    client.post("/ppr/progress/rebuild")
+    url = f"/dashboard/summary?ano_ejecucion={ANO}"
+    assert client.get(url).json()["ejecutado"] == 5.0
+
+    # Un cambio que no pasa por la API no incrementa la versión de datos
+    db.query(db_models.PPRProgressSummary).update({"ejecutado": 0.0})
+    db.commit()
+    assert client.get(url).json()["ejecutado"] == 5.0
+
+    client.post(f"/ppr/{ppr_id}/avances", json={
+        "ppr_id": ppr_id, "ano_ejecucion": ANO, "mes": "feb", "valor_ejecutado": 3.0
+    })
+    resumen = client.get(url).json()
+
+    assert resumen["ejecutado"] == 8.0
+    assert resumen["version_datos"] == obtener_version_datos()
+
+
+def test_resumen_del_dashboard_se_recalcula_al_cambiar_de_mes(client, db, monkeypatch):
+    crear_ppr_legado(db, 1, ejecutado={"ene": 10.0})
+    client.post("/ppr/progress/rebuild")
+    url = f"/dashboard/summary?ano_ejecucion={ANO}"
+
+    class Reloj(datetime):
+        actual = datetime(ANO, 1, 15)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.actual
+
+    monkeypatch.setattr(dashboard, "datetime", Reloj)
+    assert client.get(url).json()["pprs_atrasados"] == 0
+
+    # En febrero lo programado acumulado (20) supera lo ejecutado (10)
+    Reloj.actual = datetime(ANO, 2, 1)
+
+    assert client.get(url).json()["pprs_atrasados"] == 1
@@ -1 +1,174 @@
- 
+"""
+Pruebas de la importación y lectura de datos CEPLAN
+"""
+from app.database import models as db_models
+from app.utils import helpers
+from app.utils.helpers import cargar_datos_ceplan_desde_excel
+from tests.conftest import ANO, crear_ppr_legado, filas_ceplan
+
+
+def _ene_eje(db, codigo="1000001"):
+    db.expire_all()
+    ceplan = db.query(db_models.CEPLAN).filter_by(
+        codigo_sub_producto=codigo, ano_ejecucion=ANO
+    ).one()
+    return ceplan.ene_eje
+
+
+def test_reimportar_archivo_anterior_restaura_sus_valores(db, escribir_archivo):
+    archivo_a = escribir_archivo(filas_ceplan(3, ejecutado=1.0))
+    archivo_b = escribir_archivo(filas_ceplan(3, ejecutado=99.0))
+
+    assert cargar_datos_ceplan_desde_excel(archivo_a, ANO, db)["skipped"] is False
+    assert cargar_datos_ceplan_desde_excel(archivo_b, ANO, db)["skipped"] is False
+    assert _ene_eje(db) == 99.0
+
+    resultado = cargar_datos_ceplan_desde_excel(archivo_a, ANO, db)
+
+    assert resultado["skipped"] is False
+    assert _ene_eje(db) == 1.0
+
+
+def test_reimportar_ultimo_archivo_se_omite(db, escribir_archivo):
+    archivo = escribir_archivo(filas_ceplan(3))
+
+    cargar_datos_ceplan_desde_excel(archivo, ANO, db)
+    resultado = cargar_datos_ceplan_desde_excel(archivo, ANO, db)
+
+    assert resultado["success"] is True
+    assert resultado["skipped"] is True
+
+
+def test_get_ceplan_inexistente_responde_404_antes_del_etag(client):
+    respuesta = client.get("/ceplan/999", headers={"If-None-Match": "*"})
+
+    assert respuesta.status_code == 404
+
+
+def test_importar_ceplan_convierte_columnas_e_ignora_codigos_invalidos(
+        db, escribir_archivo):
+    filas = filas_ceplan(3)
+    filas[0]["EJE_FEB"] = None
+    filas[1]["codigo_sub_producto"] = "123"
+    filas.append({**filas[2], "subproducto": "Repetido"})
+
+    resultado = cargar_datos_ceplan_desde_excel(escribir_archivo(filas), ANO, db)
+
+    assert (resultado["processed"], resultado["ignored"]) == (3, 1)
+    assert resultado["errors"] == [{
+        "fila": 1, "campo": "codigo_sub_producto", "valor": "123",
+        "motivo": "formato_invalido"
+    }]
+    ceplans = db.query(db_models.CEPLAN).order_by(db_models.CEPLAN.id).all()
+    assert [c.codigo_sub_producto for c in ceplans] == ["1000001", "1000003"]
+    assert (ceplans[0].ene_eje, ceplans[0].feb_eje, ceplans[0].ene_prog) == (
+        1.0, 0.0, 10.0
+    )
+    # Un código repetido en el archivo conserva la última fila
+    assert ceplans[1].subproducto == "Repetido"
+
+
+def test_reimportar_archivo_modificado_escribe_solo_filas_cambiadas(
+        db, escribir_archivo):
+    cargar_datos_ceplan_desde_excel(escribir_archivo(filas_ceplan(3)), ANO, db)
+    sin_cambios = db.query(db_models.CEPLAN).filter_by(codigo_sub_producto="1000001")
+    modificado_antes = sin_cambios.one().updated_at
+    filas = filas_ceplan(3)
+    filas[1]["EJE_ENE"] = 8.0
+
+    resultado = cargar_datos_ceplan_desde_excel(escribir_archivo(filas), ANO, db)
+
+    assert (resultado["processed"], resultado["unchanged"]) == (3, 2)
+    assert _ene_eje(db, "1000002") == 8.0
+    assert sin_cambios.one().updated_at == modificado_antes
+
+
+def test_reimportar_restaura_la_fila_editada_por_la_api(client, db, escribir_archivo):
+    cargar_datos_ceplan_desde_excel(escribir_archivo(filas_ceplan(2)), ANO, db)
+    ceplan_id = db.query(db_models.CEPLAN.id).filter_by(
+        codigo_sub_producto="1000001"
+    ).scalar()
+    client.put(f"/ceplan/{ceplan_id}", json={"ene_eje": 77.0})
+
+    # Otro archivo (no se omite completo) que conserva la fila original
+    resultado = cargar_datos_ceplan_desde_excel(
+        escribir_archivo(filas_ceplan(3)), ANO, db
+    )
+
+    assert (resultado["processed"], resultado["unchanged"]) == (3, 1)
+    assert _ene_eje(db) == 1.0
+
+
+def test_importacion_por_transacciones_continua_desde_el_punto_de_control(
+        db, escribir_archivo, monkeypatch):
+    archivo = escribir_archivo(filas_ceplan(5))
+    preparar = helpers._preparar_datos_ceplan
+
+    def preparar_con_falla(df, ano_ejecucion):
+        if df.index[0] == 2:
+            raise RuntimeError("conexión perdida")
+        return preparar(df, ano_ejecucion)
+
+    monkeypatch.setattr(helpers, "_preparar_datos_ceplan", preparar_con_falla)
+    resultado = cargar_datos_ceplan_desde_excel(archivo, ANO, db, commit_every=2)
+
+    assert resultado["success"] is False
+    # El primer bloque quedó confirmado junto con su punto de control
+    assert db.query(db_models.CEPLAN).count() == 2
+    diario = db.query(db_models.ImportJournal).one()
+    assert (diario.estado, diario.last_row, diario.processed) == ("en_proceso", 2, 2)
+
+    monkeypatch.setattr(helpers, "_preparar_datos_ceplan", preparar)
+    resultado = cargar_datos_ceplan_desde_excel(archivo, ANO, db, commit_every=2)
+
+    assert (resultado["success"], resultado["processed"]) == (True, 5)
+    assert db.query(db_models.CEPLAN).count() == 5
+    db.refresh(diario)
+    assert (diario.estado, diario.last_row) == ("completado", 5)
+
+
+def test_comparacion_suma_los_subproductos_asociados_a_cada_ppr(
+        client, db, escribir_archivo):
+    cargar_datos_ceplan_desde_excel(escribir_archivo(filas_ceplan(3)), ANO, db)
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 5.0})
+    crear_ppr_legado(db, 2)
+    mapeo = [{"ppr_codigo": "PPR00000001", "codigo_sub_producto": codigo}
+             for codigo in ("1000001", "1000002", "1000002", "9999999")]
+
+    respuesta = client.post("/ceplan/mapeo", json=mapeo)
+    assert respuesta.json()["total"] == 3
+
+    resultado = client.get(f"/ceplan/comparacion?ano_ejecucion={ANO}").json()
+
+    assert (resultado["ppr_sin_mapeo"], resultado["ceplan_sin_mapeo"]) == (1, 1)
+    comparacion, = resultado["comparaciones"]
+    assert comparacion["ppr_id"] == ppr_id
+    assert comparacion["codigos_sub_producto"] == ["1000001", "1000002"]
+    assert comparacion["programado"]["variacion"] == [10.0 - 20.0] * 12
+    assert comparacion["ejecutado"]["ceplan"][:2] == [2.0, 2.0]
+    assert comparacion["ejecutado"]["variacion"][:2] == [3.0, -2.0]
+    assert comparacion["variacion_total_ejecutado"] == 5.0 - 24.0
+
+
+def test_listado_ceplan_responde_304_hasta_que_cambian_los_datos(
+        client, db, escribir_archivo):
+    cargar_datos_ceplan_desde_excel(escribir_archivo(filas_ceplan(2)), ANO, db)
+    url = f"/ceplan/?ano_ejecucion={ANO}"
+    respuesta = client.get(url)
+    etag, modificado = respuesta.headers["ETag"], respuesta.headers["Last-Modified"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": modificado}).status_code == 304
+    # Otro año no cambia los datos de esta lectura
+    client.post("/ceplan/", json={
+        "codigo_sub_producto": "1000009", "subproducto": "Otro año",
+        "ano_ejecucion": ANO - 1
+    })
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # Una baja cambia la cantidad de filas, que también forma parte del ETag
+    client.delete(f"/ceplan/{respuesta.json()[0]['id']}")
+    respuesta = client.get(url, headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers["ETag"] != etag
+    assert len(respuesta.json()) == 1
@@ -0,0 +1,58 @@
+"""
+Pruebas de la exportación del reporte de progreso de PPR
+"""
+import csv
+import io
+from openpyxl import load_workbook
+from app.api import ppr as ppr_api
+from app.utils.exports import COLUMNAS_REPORTE_PPR
+from tests.conftest import ANO, crear_ppr_legado
+
+
+def _preparar(client, db, cantidad):
+    for numero in range(1, cantidad + 1):
+        crear_ppr_legado(db, numero, ejecutado={"ene": 5.0})
+    client.post("/ppr/progress/rebuild")
+
+
+def test_exportar_csv(client, db):
+    _preparar(client, db, 3)
+
+    respuesta = client.get(f"/ppr/export?formato=csv&ano_ejecucion={ANO}")
+
+    assert respuesta.status_code == 200
+    disposicion = respuesta.headers["content-disposition"]
+    assert 'filename="progreso_ppr_2024.csv"' in disposicion
+    filas = list(csv.DictReader(io.StringIO(respuesta.content.decode("utf-8-sig"))))
+    assert [fila["codigo"] for fila in filas] == [f"PPR{n:08d}" for n in (1, 2, 3)]
+    assert float(filas[0]["ene_porcentaje"]) == 50.0
+    assert float(filas[0]["total_ejecutado"]) == 5.0
+
+
+def test_exportar_xlsx(client, db):
+    _preparar(client, db, 2)
+
+    respuesta = client.get("/ppr/export?formato=xlsx")
+
+    assert respuesta.status_code == 200
+    hoja = load_workbook(io.BytesIO(respuesta.content), read_only=True).active
+    filas = list(hoja.values)
+    assert list(filas[0]) == COLUMNAS_REPORTE_PPR
+    assert [fila[0] for fila in filas[1:]] == ["PPR00000001", "PPR00000002"]
+
+
+def test_exportar_xlsx_grande_sugiere_csv(client, db, monkeypatch):
+    _preparar(client, db, 3)
+    monkeypatch.setattr(ppr_api, "EXPORT_XLSX_MAX_FILAS", 2)
+
+    respuesta = client.get("/ppr/export?formato=xlsx")
+
+    assert respuesta.status_code == 400
+    assert "formato=csv" in respuesta.json()["detail"]
+    # Con un filtro que deja el reporte bajo el límite se acepta
+    assert client.get("/ppr/export?formato=xlsx&estado=inactivo").status_code == 200
+    assert client.get("/ppr/export?formato=csv").status_code == 200
+
+
+def test_exportar_formato_no_valido(client):
+    assert client.get("/ppr/export?formato=pdf").status_code == 400
@@ -0,0 +1,52 @@
+"""
+Pruebas de los cálculos de avance por arreglos
+"""
+import numpy as np
+from app.utils.helpers import (
+    MESES, calcular_avance_anual, calcular_avance_anual_matriz,
+    calcular_avance_matriz, calcular_avance_mensual, calcular_avance_mensual_matriz,
+    calcular_porcentaje, calcular_porcentaje_matriz
+)
+
+
+def test_versiones_por_arreglos_coinciden_con_las_escalares():
+    generador = np.random.default_rng(7)
+    ejecutado = np.round(generador.uniform(0, 50, 2000), 3)
+    programado = np.round(generador.uniform(0, 50, 2000), 3)
+    programado[::10] = 0.0
+    ejecutado[::20] = 0.0
+    # Valores que quedan en la mitad de un centésimo; las funciones escalares
+    # reciben floats de Python, como los valores leídos de la base
+    ejecutado[:3], programado[:3] = [1.0, 0.125, 2.675], [8.0, 1.0, 100.0]
+
+    porcentajes = calcular_porcentaje_matriz(ejecutado, programado)
+    avances = calcular_avance_mensual_matriz(ejecutado, programado)
+
+    pares = list(zip(ejecutado.tolist(), programado.tolist()))
+    assert porcentajes.tolist() == [calcular_porcentaje(e, p) for e, p in pares]
+    assert avances.tolist() == [calcular_avance_mensual(e, p) for e, p in pares]
+
+
+def test_avance_anual_por_arreglos_coincide_con_el_escalar():
+    ejecutado = np.array([[1.5] * 12, [0.0] * 12, [3.0] + [0.0] * 11])
+    programado = np.array([[2.0] * 12, [0.0] * 12, [0.0] * 12])
+
+    anual = calcular_avance_anual_matriz(ejecutado, programado)
+
+    for fila in range(len(ejecutado)):
+        esperado = calcular_avance_anual({
+            mes: {"ejecutado": ejecutado[fila, i], "programado": programado[fila, i]}
+            for i, mes in enumerate(MESES)
+        })
+        assert anual["ejecutado"][fila] == esperado["ejecutado"]
+        assert anual["programado"][fila] == esperado["programado"]
+        assert anual["porcentaje"][fila] == esperado["porcentaje"]
+
+
+def test_avance_matriz_acumula_por_mes():
+    avance = calcular_avance_matriz([5.0] * 12, [10.0, 0.0] * 6)
+
+    assert avance["mensual"][0, :3].tolist() == [50.0, 100.0, 50.0]
+    assert avance["ejecutado_acumulado"][0, :3].tolist() == [5.0, 10.0, 15.0]
+    assert avance["acumulado"][0, :3].tolist() == [50.0, 100.0, 75.0]
+    assert avance["anual"]["porcentaje"].tolist() == [100.0]
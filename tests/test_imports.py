@@ -0,0 +1,132 @@
+"""
+Pruebas de los trabajos de importación en segundo plano
+"""
+import os
+import pytest
+from app.api import imports
+from app.database import models as db_models
+from app.utils import helpers, jobs
+from tests.conftest import ANO, filas_ceplan
+
+
+@pytest.fixture
+def jobs_sincronos(session_factory, tmp_path, monkeypatch):
+    """
+    Ejecuta los trabajos en el proceso de la prueba y registra cada actualización
+    """
+    actualizaciones = []
+    actualizar_job = jobs._actualizar_job
+
+    def registrar(job_id, **valores):
+        actualizaciones.append(valores)
+        actualizar_job(job_id, **valores)
+
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+    monkeypatch.setattr(jobs, "IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(jobs, "_actualizar_job", registrar)
+    monkeypatch.setattr(imports, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(imports, "enviar_importacion", jobs.ejecutar_importacion)
+    return actualizaciones
+
+
+def _subir(client, tipo, ruta):
+    with open(ruta, "rb") as archivo:
+        return client.post(
+            f"/imports/{tipo}", data={"ano_ejecucion": str(ANO)},
+            files={"file": (os.path.basename(ruta), archivo)}
+        )
+
+
+def test_importacion_reporta_errores_por_fila_durante_el_trabajo(
+        client, db, escribir_archivo, jobs_sincronos):
+    filas = filas_ceplan(4)
+    filas[1]["codigo_sub_producto"] = "12"
+    filas[3]["codigo_sub_producto"] = "abc"
+
+    respuesta = _subir(client, "ceplan", escribir_archivo(filas))
+
+    assert respuesta.status_code == 202
+    # Bloques de 2 filas: el primero ya informa el error de la fila 1
+    parciales = [
+        valores["row_errors"] for valores in jobs_sincronos if "processed" in valores
+    ]
+    assert [error["fila"] for error in parciales[0]] == [1]
+    assert [error["fila"] for error in parciales[-1]] == [1, 3]
+
+    job = client.get(f"/imports/{respuesta.json()['id']}").json()
+    assert job["estado"] == "completado"
+    assert (job["processed"], job["ignored"]) == (2, 2)
+    assert job["row_errors"][1] == {
+        "fila": 3, "campo": "codigo_sub_producto", "valor": "abc",
+        "motivo": "formato_invalido"
+    }
+    assert db.query(db_models.CEPLAN).count() == 2
+
+
+def test_importacion_elimina_el_archivo_al_terminar(client, db, escribir_archivo,
+                                                    jobs_sincronos):
+    completado = _subir(client, "ceplan", escribir_archivo(filas_ceplan(3)))
+    sin_columnas = escribir_archivo([{"codigo_sub_producto": "1000001"}])
+    con_error = _subir(client, "ceplan", sin_columnas)
+
+    for respuesta, estado in ((completado, "completado"), (con_error, "error")):
+        job = db.query(db_models.ImportJob).filter_by(id=respuesta.json()["id"]).one()
+        assert job.estado == estado
+        assert not os.path.exists(job.file_path)
+
+
+def _crear_job(db, ruta, estado="en_proceso"):
+    job = db_models.ImportJob(tipo="ceplan", estado=estado, file_name="archivo.xlsx",
+                              file_path=ruta, ano_ejecucion=ANO, user_id=1)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_recuperar_importaciones_reanuda_desde_el_punto_de_control(
+        db, escribir_archivo, jobs_sincronos, monkeypatch):
+    filas = filas_ceplan(6)
+    filas[0]["codigo_sub_producto"] = "x"
+    ruta = escribir_archivo(filas)
+    job_id = _crear_job(db, ruta, estado="pendiente")
+
+    # Simular la caída del proceso durante el segundo bloque
+    preparar = helpers._preparar_datos_ceplan
+    bloques = []
+
+    def preparar_con_caida(df, ano_ejecucion):
+        bloques.append(df.index.tolist())
+        if len(bloques) == 2:
+            raise SystemExit("proceso terminado")
+        return preparar(df, ano_ejecucion)
+
+    monkeypatch.setattr(helpers, "_preparar_datos_ceplan", preparar_con_caida)
+    with pytest.raises(SystemExit):
+        jobs.ejecutar_importacion(job_id)
+    job = db.query(db_models.ImportJob).filter_by(id=job_id).one()
+    assert job.estado == "en_proceso"
+
+    monkeypatch.setattr(jobs, "enviar_importacion", jobs.ejecutar_importacion)
+    assert jobs.recuperar_importaciones() == 1
+
+    db.expire_all()
+    job = db.query(db_models.ImportJob).filter_by(id=job_id).one()
+    assert job.estado == "completado"
+    assert (job.processed, job.ignored) == (5, 1)
+    assert [error["fila"] for error in job.row_errors] == [0]
+    # El primer bloque ya estaba confirmado y no se vuelve a procesar
+    assert bloques == [[0, 1], [2, 3], [2, 3], [4, 5]]
+    assert db.query(db_models.CEPLAN).count() == 5
+    assert not os.path.exists(ruta)
+
+
+def test_recuperar_importaciones_marca_error_si_falta_el_archivo(db, tmp_path,
+                                                                jobs_sincronos):
+    job_id = _crear_job(db, str(tmp_path / "no_existe.xlsx"))
+
+    assert jobs.recuperar_importaciones() == 0
+
+    job = db.query(db_models.ImportJob).filter_by(id=job_id).one()
+    assert job.estado == "error"
+    assert "ya no existe" in job.error
+    assert job.finished_at is not None
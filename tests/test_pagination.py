@@ -0,0 +1,66 @@
+"""
+Pruebas de la paginación por cursor de los listados
+"""
+from app.database import models as db_models
+from app.utils.pagination import CURSOR_HEADER, codificar_cursor
+from tests.conftest import ANO, crear_ppr_legado
+
+
+def _crear_ceplans(db):
+    for ano, codigo in ((ANO, "1000003"), (ANO - 1, "1000002"), (ANO, "1000001"),
+                        (ANO - 1, "1000004"), (ANO, "1000002")):
+        db.add(db_models.CEPLAN(codigo_sub_producto=codigo, ano_ejecucion=ano,
+                                subproducto=f"Sub {codigo}"))
+    db.commit()
+
+
+def _recorrer(client, url):
+    paginas = []
+    respuesta = client.get(url)
+    while True:
+        paginas.append(respuesta.json())
+        cursor = respuesta.headers.get(CURSOR_HEADER)
+        if cursor is None:
+            return paginas
+        respuesta = client.get(f"{url}&after={cursor}")
+
+
+def test_cursor_recorre_ceplan_en_orden_de_ano_y_codigo(client, db):
+    _crear_ceplans(db)
+
+    paginas = _recorrer(client, "/ceplan/?limit=2")
+
+    assert [[(c["ano_ejecucion"], c["codigo_sub_producto"]) for c in pagina]
+            for pagina in paginas] == [
+        [(ANO - 1, "1000002"), (ANO - 1, "1000004")],
+        [(ANO, "1000001"), (ANO, "1000002")],
+        [(ANO, "1000003")]
+    ]
+
+
+def test_cursor_respeta_el_filtro_y_la_pagina_completa_final(client, db):
+    _crear_ceplans(db)
+
+    paginas = _recorrer(client, f"/ceplan/?limit=3&ano_ejecucion={ANO}")
+
+    # La última página completa todavía envía cursor; la siguiente está vacía
+    assert [len(pagina) for pagina in paginas] == [3, 0]
+
+
+def test_cursor_de_pprs_coincide_con_skip(client, db):
+    for numero in range(1, 6):
+        crear_ppr_legado(db, numero)
+
+    por_cursor = [ppr["id"] for pagina in _recorrer(client, "/ppr/?limit=2")
+                  for ppr in pagina]
+    por_skip = [ppr["id"] for skip in (0, 2, 4)
+                for ppr in client.get(f"/ppr/?limit=2&skip={skip}").json()]
+
+    assert por_cursor == por_skip == sorted(por_cursor)
+
+
+def test_cursor_no_valido_responde_400(client):
+    for cursor in ("no-es-base64!", codificar_cursor([ANO])):
+        respuesta = client.get(f"/ceplan/?after={cursor}")
+        assert respuesta.status_code == 400
+        assert respuesta.json()["detail"] == "Cursor no válido"
@@ -1 +1,195 @@
- 
+"""
+Pruebas de los endpoints de PPR y del resumen de avance
+"""
+import pytest
+from app.database import models as db_models
+from app.utils.helpers import (
+    calcular_porcentaje, cargar_datos_ppr_desde_excel, inicializar_resumen_progreso
+)
+from tests.conftest import ANO, crear_ppr_legado, filas_ppr
+
+
+def test_reconstruir_resumen_puebla_pprs_existentes(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 5.0, "feb": 10.0})
+    assert client.get(f"/ppr/progress?ano_ejecucion={ANO}&hasta_mes=2").json() == []
+
+    respuesta = client.post(f"/ppr/progress/rebuild?ano_ejecucion={ANO}")
+
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {
+        "ano_ejecucion": ANO, "anos": [ANO], "pprs": 1, "filas": 12
+    }
+    progreso = client.get(f"/ppr/progress?ano_ejecucion={ANO}&hasta_mes=2").json()
+    assert progreso[0]["ppr_id"] == ppr_id
+    assert progreso[0]["ejecutado_acumulado"] == 15.0
+    assert progreso[0]["porcentaje_acumulado"] == 75.0
+
+
+def test_reconstruir_resumen_elimina_filas_obsoletas(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 5.0})
+    client.post("/ppr/progress/rebuild")
+    db.query(db_models.PPRAvance).delete()
+    db.query(db_models.PPRMeta).delete()
+    db.commit()
+
+    respuesta = client.post("/ppr/progress/rebuild")
+
+    assert respuesta.json()["pprs"] == 0
+    assert client.get(f"/ppr/{ppr_id}/progreso?ano_ejecucion={ANO}").json() == []
+
+
+def test_inicializar_resumen_solo_si_esta_vacio(db):
+    crear_ppr_legado(db, 1, ejecutado={"ene": 5.0})
+
+    assert inicializar_resumen_progreso(db)["pprs"] == 1
+    assert db.query(db_models.PPRProgressSummary).count() == 12
+    assert inicializar_resumen_progreso(db) is None
+
+
+def test_crear_avance_normaliza_el_mes(client, db):
+    ppr_id = crear_ppr_legado(db, 1)
+    avance = {"ppr_id": ppr_id, "ano_ejecucion": ANO, "valor_ejecutado": 4.0}
+
+    respuesta = client.post(f"/ppr/{ppr_id}/avances", json={**avance, "mes": "Enero"})
+    assert respuesta.status_code == 400
+
+    respuesta = client.post(f"/ppr/{ppr_id}/avances", json={**avance, "mes": "ENE"})
+    assert respuesta.status_code == 200
+    assert respuesta.json()["mes"] == "ene"
+    meses = client.get(f"/ppr/{ppr_id}/progreso?ano_ejecucion={ANO}").json()
+    assert meses[0]["ejecutado"] == 4.0
+
+
+def test_resumen_cuenta_avances_legados_en_mayusculas(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"Ene": 3.0, "ene": 2.0})
+
+    client.post("/ppr/progress/rebuild")
+
+    meses = client.get(f"/ppr/{ppr_id}/progreso?ano_ejecucion={ANO}").json()
+    assert meses[0]["ejecutado"] == 5.0
+
+
+def test_get_ppr_responde_304_con_etag_vigente(client, db):
+    ppr_id = crear_ppr_legado(db, 1)
+    url = f"/ppr/{ppr_id}?include=avances"
+    etag = client.get(url).headers["ETag"]
+
+    respuesta = client.get(url, headers={"If-None-Match": etag})
+    assert respuesta.status_code == 304
+    assert respuesta.headers["ETag"] == etag
+
+    # Otra variante de la representación no comparte el ETag
+    assert client.get(f"/ppr/{ppr_id}").headers["ETag"] != etag
+
+    client.post(f"/ppr/{ppr_id}/avances", json={
+        "ppr_id": ppr_id, "ano_ejecucion": ANO, "mes": "ene", "valor_ejecutado": 1.0
+    })
+    respuesta = client.get(url, headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()["avances"]) == 1
+
+
+def test_get_ppr_inexistente_responde_404_antes_del_etag(client, db):
+    respuesta = client.get("/ppr/999", headers={"If-None-Match": "*"})
+
+    assert respuesta.status_code == 404
+
+
+def test_progress_coincide_con_calcular_porcentaje_sin_programado_positivo(client, db):
+    negativo = crear_ppr_legado(db, 1, programado=-4.0, ejecutado={"ene": 3.0})
+    cero = crear_ppr_legado(db, 2, programado=0.0, ejecutado={"ene": 3.0})
+    client.post("/ppr/progress/rebuild")
+
+    progreso = client.get(f"/ppr/progress?ano_ejecucion={ANO}&hasta_mes=1").json()
+
+    for fila, ppr_id in zip(progreso, (negativo, cero)):
+        assert fila["ppr_id"] == ppr_id
+        assert fila["porcentaje"] == calcular_porcentaje(
+            fila["ejecutado"], fila["programado"]
+        )
+        mensual = client.get(f"/ppr/{ppr_id}/progreso?ano_ejecucion={ANO}").json()
+        assert fila["porcentaje_acumulado"] == mensual[0]["porcentaje_acumulado"]
+    assert [fila["porcentaje_acumulado"] for fila in progreso] == [-75.0, 100.0]
+
+
+def test_reimportar_ppr_actualiza_existentes_sin_duplicar_metas(db, escribir_archivo):
+    cargar_datos_ppr_desde_excel(escribir_archivo(filas_ppr(2)), ANO, 1, db)
+    db.add(db_models.User(id=2, username="otro", email="otro@example.com",
+                          hashed_password="x", role_id=1))
+    db.commit()
+    filas = filas_ppr(3)
+    filas[1]["nombre"] = "Producto renombrado"
+
+    resultado = cargar_datos_ppr_desde_excel(escribir_archivo(filas), ANO, 2, db)
+
+    assert resultado["processed"] == 3
+    db.expire_all()
+    pprs = db.query(db_models.PPR).order_by(db_models.PPR.codigo).all()
+    assert [ppr.nombre for ppr in pprs] == ["Producto 1", "Producto renombrado",
+                                            "Producto 3"]
+    # El responsable de planificación solo se asigna a los PPR nuevos
+    assert [ppr.responsable_planificacion_id for ppr in pprs] == [1, 1, 2]
+    assert db.query(db_models.PPRMeta).count() == 3
+
+
+def test_reimportar_ppr_restaura_el_editado_por_la_api(client, db, escribir_archivo):
+    cargar_datos_ppr_desde_excel(escribir_archivo(filas_ppr(2)), ANO, 1, db)
+    ppr_id = db.query(db_models.PPR.id).filter_by(codigo="PPR00000001").scalar()
+    client.put(f"/ppr/{ppr_id}", json={"nombre": "Editado"})
+
+    resultado = cargar_datos_ppr_desde_excel(escribir_archivo(filas_ppr(3)), ANO, 1, db)
+
+    assert (resultado["processed"], resultado["unchanged"]) == (3, 1)
+    db.expire_all()
+    assert db.query(db_models.PPR).filter_by(id=ppr_id).one().nombre == "Producto 1"
+
+
+@pytest.mark.parametrize("use_staging", [False, True])
+def test_importar_las_mismas_filas_para_otro_ano_crea_sus_metas(
+        db, escribir_archivo, use_staging):
+    filas = filas_ppr(2)
+    cargar_datos_ppr_desde_excel(escribir_archivo(filas), ANO, 1, db,
+                                 use_staging=use_staging)
+
+    resultado = cargar_datos_ppr_desde_excel(escribir_archivo(filas), ANO + 1, 1, db,
+                                             use_staging=use_staging)
+
+    assert (resultado["processed"], resultado["unchanged"]) == (2, 0)
+    metas = db.query(db_models.PPRMeta.ppr_id, db_models.PPRMeta.ano_ejecucion)
+    assert sorted(metas.all()) == [(1, ANO), (1, ANO + 1), (2, ANO), (2, ANO + 1)]
+    resumen = db.query(db_models.PPRProgressSummary).filter_by(
+        ano_ejecucion=ANO + 1, mes="ene"
+    )
+    assert [fila.programado for fila in resumen] == [10.0, 10.0]
+
+    # Volver a importar un año ya cargado no duplica sus metas
+    cargar_datos_ppr_desde_excel(escribir_archivo(filas_ppr(3)), ANO, 1, db,
+                                 use_staging=use_staging)
+    assert db.query(db_models.PPRMeta).filter_by(ano_ejecucion=ANO).count() == 3
+
+
+def test_anomalias_evalua_todas_las_reglas_sobre_la_matriz(client, db):
+    ppr_id = crear_ppr_legado(
+        db, 1, ejecutado={"ene": 10.0, "feb": 10.0, "mar": 0.0, "abr": 100.0}
+    )
+    crear_ppr_legado(db, 2, ejecutado={"ene": 10.0})
+    for mes, valor in (("feb", 20.0), ("abr", 15.0)):
+        db.add(db_models.PPRAvance(ppr_id=ppr_id, ano_ejecucion=ANO, mes=mes,
+                                   valor_ejecutado=valor, acumulado_anual=True))
+    db.commit()
+
+    resultado = client.get(f"/ppr/anomalias?ano_ejecucion={ANO}").json()
+
+    assert (resultado["pprs_analizados"], resultado["pprs_con_anomalias"]) == (2, 1)
+    assert [(a["mes"], a["tipo"], a["valor"], a["referencia"])
+            for a in resultado["anomalias"]] == [
+        ("mar", "desviacion_meta", 0.0, 10.0),
+        ("mar", "sin_ejecucion", 0.0, 10.0),
+        ("abr", "desviacion_meta", 100.0, 10.0),
+        ("abr", "salto", 100.0, 30.0),
+        ("abr", "acumulado_decreciente", 15.0, 20.0)
+    ]
+    assert resultado["totales"]["desviacion_programado"] == 0
+    assert client.get(
+        f"/ppr/anomalias?ano_ejecucion={ANO}&factor_salto=1"
+    ).status_code == 400
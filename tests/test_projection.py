@@ -0,0 +1,98 @@
+"""
+Pruebas de la proyección de campos (fields) y las relaciones incluidas (include)
+"""
+from app.database import models as db_models
+from app.utils.pagination import CURSOR_HEADER
+from tests.conftest import ANO, crear_ppr_legado
+
+
+def _crear_ceplans(db, cantidad):
+    for numero in range(1, cantidad + 1):
+        db.add(db_models.CEPLAN(
+            codigo_sub_producto=str(1000000 + numero), subproducto=f"Sub {numero}",
+            ano_ejecucion=ANO, ene_eje=float(numero), feb_eje=None, dic_eje=1.0
+        ))
+    db.commit()
+
+
+def test_fields_devuelve_solo_los_campos_pedidos_y_los_calculados(client, db):
+    _crear_ceplans(db, 3)
+
+    campos = "codigo_sub_producto,total_ejecutado,codigo_sub_producto"
+
+    respuesta = client.get(f"/ceplan/?limit=2&fields={campos}")
+
+    assert respuesta.json() == [
+        {"codigo_sub_producto": "1000001", "total_ejecutado": 2.0},
+        {"codigo_sub_producto": "1000002", "total_ejecutado": 3.0}
+    ]
+    # La clave del cursor se consulta aunque no se haya pedido
+    cursor = respuesta.headers[CURSOR_HEADER]
+    siguiente = client.get(f"/ceplan/?limit=2&fields=subproducto&after={cursor}")
+    assert siguiente.json() == [{"subproducto": "Sub 3"}]
+
+
+def test_fields_asterisco_coincide_con_la_respuesta_completa(client, db):
+    _crear_ceplans(db, 2)
+
+    completa = client.get("/ceplan/").json()
+    proyectada = client.get("/ceplan/?fields=*").json()
+
+    assert proyectada == completa
+
+
+def test_fields_no_expone_columnas_internas(client, db):
+    ppr_id = crear_ppr_legado(db, 1)
+
+    for url in ("/ceplan/?fields=content_hash", f"/ppr/{ppr_id}?fields=codigo,otro"):
+        respuesta = client.get(url)
+        assert respuesta.status_code == 400
+        assert respuesta.json()["detail"].startswith("Campos no válidos")
+
+    respuesta = client.get(f"/ppr/{ppr_id}?fields=codigo,estado")
+    assert respuesta.json() == {"codigo": "PPR00000001", "estado": "activo"}
+
+
+def _asignar_responsable(db, ppr_id):
+    ppr = db.query(db_models.PPR).filter_by(id=ppr_id).one()
+    ppr.responsables_ppr.append(db.query(db_models.User).filter_by(id=1).one())
+    db.commit()
+
+
+def test_include_agrega_las_relaciones_al_ppr(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 2.0, "feb": 3.0})
+    _asignar_responsable(db, ppr_id)
+
+    ppr = client.get(
+        f"/ppr/{ppr_id}?include=avances,responsables,avances&fields=codigo"
+    ).json()
+
+    assert list(ppr) == ["codigo", "avances", "responsables"]
+    assert [avance["mes"] for avance in ppr["avances"]] == ["ene", "feb"]
+    assert ppr["responsables"] == [
+        {"id": 1, "username": "admin", "full_name": None, "email": "admin@example.com"}
+    ]
+
+
+def test_include_en_el_listado_carga_cada_ppr_con_sus_metas(client, db):
+    for numero in range(1, 4):
+        crear_ppr_legado(db, numero, programado=float(numero))
+
+    pprs = client.get("/ppr/?include=metas&limit=2").json()
+
+    assert [ppr["codigo"] for ppr in pprs] == ["PPR00000001", "PPR00000002"]
+    assert [[meta["ene_prog"] for meta in ppr["metas"]] for ppr in pprs] == [
+        [1.0], [2.0]
+    ]
+    assert "avances" not in pprs[0]
+
+
+def test_include_no_valido_responde_400(client, db):
+    ppr_id = crear_ppr_legado(db, 1)
+
+    respuesta = client.get(f"/ppr/{ppr_id}?include=metas,hijos")
+
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"] == (
+        "Relaciones no válidas: hijos. Disponibles: metas, avances, responsables"
+    )
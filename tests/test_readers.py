@@ -0,0 +1,81 @@
+"""
+Pruebas de la lectura por bloques de los archivos de importación
+"""
+import pytest
+from app.database import models as db_models
+from app.utils.helpers import (
+    cargar_datos_ceplan_desde_excel, cargar_datos_ppr_desde_excel,
+    leer_excel_por_bloques
+)
+from tests.conftest import ANO, filas_ceplan, filas_ppr
+
+
+def test_leer_excel_por_bloques_numera_las_filas_del_archivo(escribir_archivo):
+    filas = filas_ceplan(5)
+    # Una fila vacía en el medio se ignora, igual que pd.read_excel
+    filas.insert(2, {})
+
+    bloques = list(leer_excel_por_bloques(escribir_archivo(filas), chunk_size=2))
+
+    assert [bloque.index.tolist() for bloque in bloques] == [[0, 1], [2, 3], [4]]
+    assert bloques[2]["codigo_sub_producto"].tolist() == ["1000005"]
+    assert list(bloques[0].columns) == list(filas[0])
+
+
+def test_leer_excel_por_bloques_sin_filas_devuelve_los_encabezados(escribir_archivo):
+    ruta = escribir_archivo([{"codigo_sub_producto": None, "subproducto": None}])
+
+    bloques = list(leer_excel_por_bloques(ruta, chunk_size=2))
+
+    assert len(bloques) == 1
+    assert bloques[0].empty
+    assert list(bloques[0].columns) == ["codigo_sub_producto", "subproducto"]
+
+
+def test_importar_ppr_por_bloques_crea_pprs_y_metas(db, escribir_archivo):
+    filas = filas_ppr(5)
+    filas[3]["codigo"] = "corto"
+    avances = []
+
+    resultado = cargar_datos_ppr_desde_excel(
+        escribir_archivo(filas), ANO, 1, db, chunk_size=2,
+        progress_callback=lambda procesados, ignorados, errores: avances.append(
+            (procesados, ignorados)
+        )
+    )
+
+    assert (resultado["processed"], resultado["ignored"]) == (4, 1)
+    assert avances == [(2, 0), (3, 1), (4, 1)]
+    pprs = db.query(db_models.PPR).order_by(db_models.PPR.codigo).all()
+    assert [ppr.codigo for ppr in pprs] == [
+        "PPR00000001", "PPR00000002", "PPR00000003", "PPR00000005"
+    ]
+    assert all(len(ppr.metas) == 1 and ppr.metas[0].ene_prog == 10.0 for ppr in pprs)
+    assert db.query(db_models.PPRProgressSummary).filter_by(mes="ene").count() == 4
+
+
+@pytest.mark.parametrize("formato", ["csv", "parquet"])
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_importar_ceplan_desde_csv_y_parquet(db, escribir_archivo, formato, chunk_size):
+    filas = filas_ceplan(3)
+    # Los tipos fijos conservan los ceros a la izquierda del código
+    filas[0]["codigo_sub_producto"] = "0000001"
+    filas[1]["columna_extra"] = "no se carga"
+
+    resultado = cargar_datos_ceplan_desde_excel(
+        escribir_archivo(filas, formato), ANO, db, chunk_size=chunk_size
+    )
+
+    assert (resultado["processed"], resultado["ignored"]) == (3, 0)
+    ceplans = db.query(db_models.CEPLAN).order_by(db_models.CEPLAN.id).all()
+    assert [c.codigo_sub_producto for c in ceplans] == ["0000001", "1000002", "1000003"]
+    assert all(c.ene_eje == 1.0 and c.dic_prog == 10.0 for c in ceplans)
+
+
+def test_importar_csv_sin_columnas_requeridas_falla(db, escribir_archivo):
+    ruta = escribir_archivo([{"codigo_sub_producto": "1000001"}], "csv")
+
+    resultado = cargar_datos_ceplan_desde_excel(ruta, ANO, db)
+
+    assert resultado["success"] is False
+    assert "subproducto" in resultado["error"]
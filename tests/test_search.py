@@ -0,0 +1,70 @@
+"""
+Pruebas de la búsqueda de texto sobre PPR y CEPLAN
+"""
+from app.database import models as db_models
+from tests.conftest import ANO, crear_ppr_legado
+
+
+def _crear_datos(db):
+    for numero, nombre, descripcion in (
+            (1, "Vacunación infantil", "Campaña de inmunización en colegios"),
+            (2, "Atención prenatal", "Controles de gestantes vacunadas"),
+            (3, "Vacunas para adultos", None)):
+        ppr_id = crear_ppr_legado(db, numero)
+        ppr = db.query(db_models.PPR).filter_by(id=ppr_id).one()
+        ppr.nombre, ppr.descripcion = nombre, descripcion
+    db.add(db_models.CEPLAN(codigo_sub_producto="3000001", ano_ejecucion=ANO,
+                            subproducto="Vacunación canina"))
+    db.add(db_models.CEPLAN(codigo_sub_producto="3000002", ano_ejecucion=ANO - 1,
+                            subproducto="Vacunación canina"))
+    db.commit()
+
+
+def _buscar(client, consulta):
+    return client.get(f"/search/?q={consulta}").json()
+
+
+def test_busca_sin_acentos_por_palabra_y_prefijo(client, db):
+    _crear_datos(db)
+
+    resultado = _buscar(client, "VACUNACION&tipo=ppr")
+
+    assert [r["codigo"] for r in resultado["resultados"]] == ["PPR00000001"]
+
+    # "vacun" es prefijo de vacunación, vacunadas y vacunas; todos los términos
+    # deben coincidir
+    codigos = {r["codigo"] for r in _buscar(client, "vacun&tipo=ppr")["resultados"]}
+    assert codigos == {"PPR00000001", "PPR00000002", "PPR00000003"}
+    assert _buscar(client, "vacun colegios")["total"] == 1
+
+
+def test_autocompleta_por_codigo_antes_que_por_texto(client, db):
+    _crear_datos(db)
+
+    resultados = _buscar(client, "ppr0000000")["resultados"]
+    assert [r["coincidencia"] for r in resultados] == ["codigo"] * 3
+    assert [r["codigo"] for r in resultados] == [
+        "PPR00000001", "PPR00000002", "PPR00000003"
+    ]
+
+    resultados = _buscar(client, f"3000&ano_ejecucion={ANO}")["resultados"]
+    assert [(r["tipo"], r["codigo"]) for r in resultados] == [("ceplan", "3000001")]
+
+
+def test_el_indice_se_reconstruye_despues_de_una_escritura(client, db):
+    _crear_datos(db)
+    assert _buscar(client, "odontologica")["total"] == 0
+
+    client.post("/ceplan/", json={
+        "codigo_sub_producto": "3000003", "subproducto": "Salud odontológica",
+        "ano_ejecucion": ANO
+    })
+
+    resultado, = _buscar(client, "odontologica")["resultados"]
+    assert (resultado["tipo"], resultado["nombre"]) == ("ceplan", "Salud odontológica")
+
+
+def test_busqueda_valida_los_parametros(client):
+    for consulta in ("v", "vacuna&tipo=otro", "vacuna&limit=0",
+                     "vacuna&ano_ejecucion=1"):
+        assert client.get(f"/search/?q={consulta}").status_code == 400
@@ -0,0 +1,83 @@
+"""
+Pruebas de la serialización rápida de respuestas
+"""
+import gzip
+import json
+from datetime import datetime
+import pytest
+from fastapi import Request
+from app.utils import serialization
+from app.utils.serialization import respuesta_serializada
+from tests.conftest import ANO
+
+CONTENIDO = [
+    {"id": numero, "nombre": f"Subproducto ñandú {numero}",
+     "updated_at": datetime(ANO, 1, 2, 3, 4, 5, 600000)}
+    for numero in range(50)
+]
+
+
+def _peticion(**cabeceras):
+    return Request({
+        "type": "http",
+        "headers": [(nombre.replace("_", "-").encode(), valor.encode())
+                    for nombre, valor in cabeceras.items()]
+    })
+
+
+@pytest.mark.parametrize("con_orjson", [True, False])
+def test_json_coincide_con_la_serializacion_estandar(monkeypatch, con_orjson):
+    if not con_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    respuesta = respuesta_serializada(None, CONTENIDO)
+
+    assert respuesta.media_type == "application/json"
+    assert json.loads(respuesta.body) == [
+        {**fila, "updated_at": "2024-01-02T03:04:05.600000"} for fila in CONTENIDO
+    ]
+
+
+def test_comprime_con_gzip_solo_las_respuestas_grandes():
+    grande = respuesta_serializada(_peticion(accept_encoding="br;q=1, gzip"), CONTENIDO)
+    pequena = respuesta_serializada(_peticion(accept_encoding="gzip"), CONTENIDO[:1])
+
+    assert grande.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(grande.body))[49]["id"] == 49
+    assert "Content-Encoding" not in pequena.headers
+    assert pequena.headers["Vary"] == "Accept, Accept-Encoding"
+
+
+def test_sin_msgpack_instalado_responde_json(monkeypatch):
+    monkeypatch.setattr(serialization, "msgpack", None)
+
+    peticion = _peticion(accept="application/msgpack")
+
+    respuesta = respuesta_serializada(peticion, CONTENIDO)
+
+    assert respuesta.media_type == "application/json"
+
+
+def test_msgpack_cuando_el_cliente_lo_pide():
+    msgpack = pytest.importorskip("msgpack")
+
+    peticion = _peticion(accept="application/msgpack")
+
+    respuesta = respuesta_serializada(peticion, CONTENIDO)
+
+    assert respuesta.media_type == "application/msgpack"
+    fila = msgpack.unpackb(respuesta.body)[0]
+    assert fila["updated_at"] == "2024-01-02T03:04:05.600000"
+
+
+def test_listado_por_la_via_rapida_con_gzip(client, db):
+    for numero in range(30):
+        client.post("/ceplan/", json={
+            "codigo_sub_producto": str(1000000 + numero), "subproducto": "Subproducto",
+            "ano_ejecucion": ANO
+        })
+
+    respuesta = client.get("/ceplan/?fields=*", headers={"Accept-Encoding": "gzip"})
+
+    assert respuesta.headers["Content-Encoding"] == "gzip"
+    assert respuesta.json() == client.get("/ceplan/").json()
@@ -0,0 +1,43 @@
+"""
+Pruebas de la instantánea columnar de CEPLAN
+"""
+import pytest
+from app.database import models as db_models
+from app.utils.cache import incrementar_version_datos
+from app.utils.snapshots import EJECUTADO, PROGRAMADO, obtener_snapshot_ceplan
+from tests.conftest import ANO
+
+
+def _crear_ceplan(db, codigo, ano=ANO, **valores):
+    db.add(db_models.CEPLAN(codigo_sub_producto=codigo, subproducto=f"Sub {codigo}",
+                            ano_ejecucion=ano, **valores))
+    db.commit()
+
+
+def test_snapshot_ordena_por_codigo_y_separa_programado_y_ejecutado(db):
+    _crear_ceplan(db, "1000002", ene_prog=4.0, dic_eje=2.0)
+    _crear_ceplan(db, "1000001", feb_prog=1.0, feb_eje=None)
+    _crear_ceplan(db, "1000003", ano=ANO - 1)
+
+    snapshot = obtener_snapshot_ceplan(db, ANO)
+
+    assert snapshot.codigos.tolist() == ["1000001", "1000002"]
+    assert snapshot.valores.shape == (2, 12, 2)
+    assert snapshot.valores[1, 0, PROGRAMADO] == 4.0
+    assert snapshot.ejecutado[1, 11] == 2.0
+    # Las columnas nulas se leen como 0
+    assert snapshot.valores[0, 1].tolist() == [1.0, 0.0]
+    assert snapshot.posiciones(["1000002", "9999999"]).tolist() == [1, -1]
+    with pytest.raises(ValueError):
+        snapshot.valores[0, 0, EJECUTADO] = 1.0
+
+
+def test_snapshot_se_reconstruye_al_cambiar_la_version_de_datos(db):
+    _crear_ceplan(db, "1000001")
+    snapshot = obtener_snapshot_ceplan(db, ANO)
+    _crear_ceplan(db, "1000002")
+
+    assert obtener_snapshot_ceplan(db, ANO) is snapshot
+
+    incrementar_version_datos()
+    assert len(obtener_snapshot_ceplan(db, ANO)) == 2
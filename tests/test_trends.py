@@ -0,0 +1,50 @@
+"""
+Pruebas de las tendencias multianuales y el cierre de años
+"""
+from tests.conftest import ANO, crear_ppr_legado
+
+
+def _tendencia(client, tipo, codigo, ano_desde=ANO, ano_hasta=ANO):
+    return client.get(
+        f"/trends/?tipo={tipo}&codigo={codigo}"
+        f"&ano_desde={ano_desde}&ano_hasta={ano_hasta}"
+    )
+
+
+def test_ano_cerrado_conserva_la_tendencia_congelada(client, db):
+    ppr_id = crear_ppr_legado(db, 1, ejecutado={"ene": 4.0, "feb": 6.0})
+    client.post("/ppr/progress/rebuild")
+
+    cierre = client.post(f"/trends/cierres/{ANO}")
+    assert cierre.json() == {"ano_ejecucion": ANO, "filas_ppr": 12, "filas_ceplan": 0}
+    assert client.post(f"/trends/cierres/{ANO}").status_code == 400
+
+    client.post(f"/ppr/{ppr_id}/avances", json={
+        "ppr_id": ppr_id, "ano_ejecucion": ANO, "mes": "mar", "valor_ejecutado": 9.0
+    })
+    tendencia = _tendencia(client, "ppr", "PPR00000001", ANO - 1, ANO).json()
+
+    assert tendencia["anos_cerrados"] == [ANO]
+    curva, = tendencia["curvas"]
+    assert (curva["ano_ejecucion"], curva["cerrado"]) == (ANO, True)
+    assert curva["ejecutado"][:3] == [4.0, 6.0, 0.0]
+    assert curva["ejecutado_acumulado"][:3] == [4.0, 10.0, 10.0]
+    assert curva["programado_acumulado"][-1] == 120.0
+
+
+def test_tendencia_ceplan_de_ano_abierto_usa_los_datos_vigentes(client, db):
+    client.post("/ceplan/", json={
+        "codigo_sub_producto": "1000001", "subproducto": "Subproducto",
+        "ano_ejecucion": ANO, "ene_prog": 5.0, "ene_eje": 2.0, "feb_eje": 1.0
+    })
+
+    curva, = _tendencia(client, "ceplan", "1000001").json()["curvas"]
+
+    assert curva["cerrado"] is False
+    assert curva["programado"][:2] == [5.0, 0.0]
+    assert curva["ejecutado_acumulado"][:3] == [2.0, 3.0, 3.0]
+
+
+def test_tendencia_valida_el_rango_de_anos(client):
+    assert _tendencia(client, "ppr", "PPR00000001", ANO, ANO - 1).status_code == 400
+    assert _tendencia(client, "otro", "PPR00000001").status_code == 400
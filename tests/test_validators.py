@@ -0,0 +1,51 @@
+"""
+Pruebas de las validaciones por columna
+"""
+import numpy as np
+import pandas as pd
+from app.utils.validators import (
+    generar_reporte_errores, validate_codigo_ppr, validate_codigo_sub_producto,
+    validate_codigo_ppr_series, validate_codigo_sub_producto_series,
+    validate_month, validate_month_series, validate_year, validate_year_series
+)
+
+
+def test_validaciones_por_columna_coinciden_con_las_escalares():
+    codigos_ppr = ["PPR00000001", "ppr00000001", "PPR1", "PPR0000000000000000001"]
+    codigos_ceplan = ["1000001", "100001", "10000011", "1a00001"]
+    meses = ["ene", "ENE", "enero", "dic"]
+    anos = [2024, 1999, 2035, 2036]
+
+    for series, escalar, valores in (
+            (validate_codigo_ppr_series, validate_codigo_ppr, codigos_ppr),
+            (validate_codigo_sub_producto_series, validate_codigo_sub_producto,
+             codigos_ceplan),
+            (validate_month_series, validate_month, meses),
+            (validate_year_series, validate_year, anos)):
+        validos, _ = series(valores)
+        assert validos.tolist() == [escalar(valor) for valor in valores]
+
+
+def test_validaciones_por_columna_informan_el_motivo():
+    _, motivos = validate_codigo_sub_producto_series(["1000001", None, "12"])
+    assert motivos.tolist() == ["", "vacio", "formato_invalido"]
+
+    _, motivos = validate_month_series(np.array(["feb", "febrero", None], dtype=object))
+    assert motivos.tolist() == ["", "mes_invalido", "vacio"]
+
+    _, motivos = validate_year_series(["2024", "dos mil", 1990, None])
+    assert motivos.tolist() == ["", "no_numerico", "fuera_de_rango", "vacio"]
+
+
+def test_reporte_de_errores_usa_el_indice_de_la_serie():
+    codigos = pd.Series(["1000001", "abc", "1000003", None], index=[10, 11, 12, 13],
+                        dtype=object)
+    validos, motivos = validate_codigo_sub_producto_series(codigos)
+
+    reporte = generar_reporte_errores(codigos, validos, motivos, "codigo_sub_producto")
+
+    assert reporte == [
+        {"fila": 11, "campo": "codigo_sub_producto", "valor": "abc",
+         "motivo": "formato_invalido"},
+        {"fila": 13, "campo": "codigo_sub_producto", "valor": None, "motivo": "vacio"}
+    ]